@@ -0,0 +1,6 @@
+"""
+Headless benchmarks for the game's hot paths.
+
+Run with ``python -m benchmarks`` (or ``hatch run bench:run``). See
+``benchmarks/__main__.py`` for saving and comparing against a baseline.
+"""
@@ -0,0 +1,60 @@
+"""
+Run the benchmark suite.
+
+    python -m benchmarks                         # print timings
+    python -m benchmarks --save                  # record a new baseline
+    python -m benchmarks --compare               # fail if slower than the baseline
+    python -m benchmarks -k frame --compare      # only benchmarks matching "frame"
+
+Baselines are machine specific, so they are kept out of version control.
+"""
+import argparse
+import os
+import sys
+
+# Importing the benchmark modules registers their benchmarks
+from benchmarks import bench_physics, bench_render, bench_frame, bench_import  # noqa: F401
+from benchmarks.harness import compare_results, load_results, run_benchmarks, save_results
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "results", "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Save results as a baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Compare against a baseline and exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a benchmark counts as regressed (default 0.25)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds per timing sample")
+    parser.add_argument("--output", metavar="PATH", help="Also write this run's results to PATH")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.compare) if args.compare else None
+    results = run_benchmarks(args.pattern, args.repeat, args.min_time)
+
+    if args.output:
+        save_results(results, args.output)
+    if args.save:
+        save_results(results, args.save)
+        print(f"Saved baseline to {args.save}")
+
+    if baseline is None:
+        return 0
+
+    lines, regressions = compare_results(baseline, results, args.tolerance)
+    print()
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}:", file=sys.stderr)
+        for name in regressions:
+            print(f"  {name}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Whole-frame benchmark driving the game loop one frame at a time.
+"""
+import pygame
+
+from benchmarks.bench_render import bin_labels
+from benchmarks.harness import benchmark
+from kitdys_dawg_pound.main import Game
+from kitdys_dawg_pound.ui.profiler import STAGES, FrameProfiler
+
+# A ball is dropped every this many frames, keeping several in flight
+DROP_INTERVAL = 15
+
+# Real time between frames at 60 fps, one physics step per substep
+FRAME_MS = 1000 / 60
+
+# Balls kept in flight on large boards, where each one takes thousands of frames to land
+LARGE_BOARD_BALLS = 8
+
+
+@benchmark("frame", rows=[6, 15], window=["800x600", "1200x900"])
+def frame(rows, window):
+    """Events, physics, drawing and presenting for one play-mode frame."""
+    game = Game()
+    game.screen = pygame.display.set_mode(tuple(int(size) for size in window.split("x")), pygame.RESIZABLE)
+    game.viewport.resize(game.screen.get_size(), game.game_surface)
+    game.set_board(rows, bin_labels(rows))
+    game.frame(FRAME_MS)
+
+    frame_count = 0
+
+    def run_frame():
+        nonlocal frame_count
+        if frame_count % DROP_INTERVAL == 0:
+            game.balls.spawn(game.layout.width // 2, 20)
+        frame_count += 1
+        game.frame(FRAME_MS)
+        game.end_frame()
+
+    return run_frame
+
+
+@benchmark("frame_large_board", rows=[15, 50, 100, 200])
+def frame_large_board(rows):
+    """One frame of a board bigger than the window, the camera following its lead ball."""
+    game = Game()
+    game.set_board(rows, bin_labels(rows))
+    game.frame(FRAME_MS)
+
+    def run_frame():
+        if game.balls.alive.sum() < LARGE_BOARD_BALLS:
+            game.balls.spawn(game.layout.width // 2, 20)
+        game.frame(FRAME_MS)
+        game.end_frame()
+
+    return run_frame
+
+
+@benchmark("profiler_frame", enabled=[False, True])
+def profiler_frame(enabled):
+    """Profiler calls made by one run_game frame, the cost of leaving them in."""
+    profiler = FrameProfiler(enabled=enabled)
+
+    def run_frame():
+        for stage in STAGES:
+            profiler.mark(stage)
+        profiler.end_frame()
+
+    return run_frame
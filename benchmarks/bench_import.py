@@ -0,0 +1,37 @@
+"""
+Cold-start import benchmarks.
+
+Each run starts a fresh interpreter, so the timing includes interpreter
+startup. The "none" case measures that startup alone for reference.
+"""
+import subprocess
+import sys
+
+from benchmarks.harness import benchmark
+
+# Modules a server worker or Lambda imports, which must not pull in pygame
+CORE_MODULES = {
+    "models": "kitdys_dawg_pound.models.ball_batch, kitdys_dawg_pound.models.plinko_bins",
+    "services": "kitdys_dawg_pound.services.drops, kitdys_dawg_pound.services.odds",
+    "app": "kitdys_dawg_pound.app",
+}
+CLIENT_MODULES = {
+    "client": "kitdys_dawg_pound.main",
+}
+
+
+def _import_command(modules):
+    return [sys.executable, "-c", f"import {modules}" if modules else "pass"]
+
+
+@benchmark("import", target=["none", *CORE_MODULES, *CLIENT_MODULES])
+def import_time(target):
+    modules = CORE_MODULES.get(target) or CLIENT_MODULES.get(target)
+
+    if target in CORE_MODULES:
+        check = f"import sys, {modules}; sys.exit('pygame' in sys.modules)"
+        if subprocess.run([sys.executable, "-c", check]).returncode:
+            raise RuntimeError(f"importing {modules} imports pygame")
+
+    command = _import_command(modules)
+    return lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
@@ -0,0 +1,87 @@
+"""
+Physics step benchmarks.
+"""
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from kitdys_dawg_pound.models.ball_batch import simulate_drops
+from kitdys_dawg_pound.models.ball_pool import BallPool
+from kitdys_dawg_pound.models.board_layout import get_board_layout
+from kitdys_dawg_pound.models.physics import PhysicsParams
+from kitdys_dawg_pound.models.plinko_ball import Ball
+from kitdys_dawg_pound.services.hit_stats import HitCounters
+from kitdys_dawg_pound.services.replay import DropConfig, DropRecord, ReplayWriter, resimulate
+from kitdys_dawg_pound.services.simulation import simulate_parallel
+
+ROW_COUNTS = [2, 6, 10, 15]
+
+
+@benchmark("ball_update", rows=ROW_COUNTS)
+def ball_update(rows):
+    """One Ball.update step, a new ball is dropped when the last one lands."""
+    random.seed(0)
+    layout = get_board_layout(rows)
+    ball = Ball(layout.width // 2, 20)
+
+    def step():
+        nonlocal ball
+        if ball.update(layout) is not None or ball.steps >= 3600:
+            ball = Ball(layout.width // 2, 20)
+
+    return step
+
+
+@benchmark("ball_pool_update", rows=ROW_COUNTS, balls=[1, 64, 256])
+def ball_pool_update(rows, balls):
+    """One BallPool.update step with the pool kept at a number of balls."""
+    layout = get_board_layout(rows)
+    pool = BallPool(balls, layout, rng=np.random.default_rng(0))
+
+    def step():
+        while pool.spawn(layout.width // 2, 20) is not None:
+            pass
+        pool.update()
+
+    return step
+
+
+@benchmark("simulate_drops", collision=["overlap", "swept"], step_frames=[1, 2, 4])
+def simulate_drops_bench(collision, step_frames):
+    """Dropping 2000 balls headlessly with physics steps of step_frames 60 fps frames."""
+    physics = PhysicsParams(swept_collision=collision == "swept")
+    return lambda: simulate_drops(8, 2000, physics=physics, seed=0, substeps=1 / step_frames)
+
+
+@benchmark("simulate_parallel", workers=[1, 2, 4, 8])
+def simulate_parallel_bench(workers):
+    """Dropping 16000 balls in 8 shards on a pool of worker processes."""
+    executor = ProcessPoolExecutor(workers)
+    return lambda: simulate_parallel(8, 16_000, seed=0, shard_size=2000, executor=executor, max_steps=600)
+
+
+@benchmark("replay_record")
+def replay_record():
+    """Logging one finished drop, as done for every ball that lands."""
+    directory = tempfile.mkdtemp()
+    writer = ReplayWriter(os.path.join(directory, "bench.replay"))
+    writer.set_config(DropConfig(6))
+    return lambda: writer.record(0x1234_5678_9ABC_DEF0, 1.7e9, 240, 3)
+
+
+@benchmark("replay_resimulate", rows=[6, 15])
+def replay_resimulate(rows):
+    """Simulating a logged drop again to find its outcome."""
+    record = DropRecord(DropConfig(rows), 0x1234_5678_9ABC_DEF0, 1.7e9, 0, 0)
+    return lambda: resimulate(record)
+
+
+@benchmark("hit_stats_record")
+def hit_stats_record():
+    """Counting one landed ball in the memory-mapped hit counters."""
+    counters = HitCounters.for_config(DropConfig(6), tempfile.mkdtemp())
+    return lambda: counters.record(3)
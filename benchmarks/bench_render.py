@@ -0,0 +1,119 @@
+"""
+Drawing and presentation benchmarks.
+"""
+import pygame
+
+from benchmarks.harness import benchmark, init_display
+from kitdys_dawg_pound.models.board_layout import get_board_layout
+from kitdys_dawg_pound.models.plinko_bins import PlinkoBins
+from kitdys_dawg_pound.ui.board_layer import BoardLayer
+from kitdys_dawg_pound.ui.board_renderer import BinAtlas, draw_bins
+from kitdys_dawg_pound.ui.display import Viewport
+from kitdys_dawg_pound.ui.editor import PlinkoEditor
+from kitdys_dawg_pound.ui.fonts import get_font
+from kitdys_dawg_pound.ui.popup import Popup
+
+BASE_SIZE = (800, 600)
+WINDOW_SIZE = (1200, 900)
+ROW_COUNTS = [2, 6, 10, 15]
+LABELS = ["Empty Car", "Remove Water", "Remove Food", "Pee off Roof", "Off Roading Only", "Walking Only", "Restart Game"]
+
+
+def bin_labels(rows):
+    return [LABELS[i % len(LABELS)] for i in range(rows + 1)]
+
+
+@benchmark("draw_bins_all", rows=ROW_COUNTS)
+def draw_bins_all(rows):
+    """Every bin in its idle state, as drawn when the board layer is rebuilt."""
+    init_display(WINDOW_SIZE)
+    surface = pygame.Surface(BASE_SIZE)
+    layout = get_board_layout(rows)
+    bins = PlinkoBins(rows, bin_labels(rows))
+    return lambda: draw_bins(bins, surface, layout, 1.5, animate=False)
+
+
+@benchmark("draw_bins_hit", rows=ROW_COUNTS)
+def draw_bins_hit(rows):
+    """A single pressed bin, as drawn each frame after a ball lands."""
+    init_display(WINDOW_SIZE)
+    surface = pygame.Surface(BASE_SIZE)
+    layout = get_board_layout(rows)
+    bins = PlinkoBins(rows, bin_labels(rows))
+
+    def draw():
+        bins.register_hit(rows // 2)
+        draw_bins(bins, surface, layout, 1.5, only_hit=True, background=surface)
+
+    return draw
+
+
+@benchmark("bin_atlas_build", rows=ROW_COUNTS)
+def bin_atlas_build(rows):
+    """Pre-rendering every bin idle and pressed, once per board and window scale."""
+    init_display(WINDOW_SIZE)
+    layout = get_board_layout(rows)
+    labels = tuple(bin_labels(rows))
+    return lambda: BinAtlas(labels, layout, 1.5)
+
+
+@benchmark("board_layer_rebuild", rows=ROW_COUNTS)
+def board_layer_rebuild(rows):
+    """Redrawing the static board after an edit or resize."""
+    init_display(WINDOW_SIZE)
+    layer = BoardLayer(BASE_SIZE)
+    layout = get_board_layout(rows)
+    bins = PlinkoBins(rows, bin_labels(rows))
+    return lambda: layer.rebuild(bins, layout, 1.5)
+
+
+@benchmark("editor_draw", mode=["play", "edit", "typing", "full"])
+def editor_draw(mode):
+    """Editor for one frame: idle in either mode, typing into a label, or after a full redraw."""
+    init_display(WINDOW_SIZE)
+    surface = pygame.Surface(BASE_SIZE)
+    editor = PlinkoEditor(*BASE_SIZE)
+    editor.create_bin_textboxes(bin_labels(6))
+    editor.edit_mode = mode != "play"
+    editor.draw(surface)
+
+    if mode == "typing":
+        textbox = editor.bin_textboxes[0]
+
+        def draw():
+            textbox.text = textbox.text[:-1] if len(textbox.text) > 12 else textbox.text + "x"
+            editor.draw(surface, [])
+
+        return draw
+
+    if mode == "full":
+        return lambda: editor.draw(surface)
+    return lambda: editor.draw(surface, [])
+
+
+@benchmark("popup_draw")
+def popup_draw():
+    init_display(WINDOW_SIZE)
+    surface = pygame.Surface(BASE_SIZE)
+    font = get_font("Gill Sans", 36)
+    popup = Popup()
+    popup.show("You landed in Remove Food!")
+    return lambda: popup.draw(surface, font)
+
+
+@benchmark("viewport_present", scale_filter=["fast", "quality"], update=["full", "dirty"])
+def viewport_present(scale_filter, update):
+    """Scaling the game surface to the window and pushing it to the display.
+
+    The dirty variant pushes a typical play frame: two balls and one bin.
+    """
+    screen = init_display(WINDOW_SIZE)
+    surface = pygame.Surface(BASE_SIZE)
+    surface.fill((195, 177, 225))
+    viewport = Viewport(BASE_SIZE, scale_filter)
+    viewport.resize(screen.get_size(), surface)
+
+    dirty_rects = None
+    if update == "dirty":
+        dirty_rects = [pygame.Rect(390, 150, 21, 21), pygame.Rect(410, 300, 21, 21), pygame.Rect(380, 375, 41, 45)]
+    return lambda: viewport.present(screen, surface, dirty_rects)
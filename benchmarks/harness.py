@@ -0,0 +1,144 @@
+"""
+Benchmark registry, timing and baseline comparison.
+"""
+import itertools
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+# Benchmarks never open a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+# Registered benchmarks by name, each a setup function returning the callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name, **params):
+    """Register a benchmark setup function.
+
+    The decorated function does any setup and returns a zero-argument callable,
+    which is what gets timed. Keyword arguments are lists of parameter values;
+    one benchmark is registered per combination, named like
+    ``ball_update[rows=8]``.
+    """
+    def decorator(setup):
+        keys = list(params)
+        for values in itertools.product(*(params[key] for key in keys)):
+            kwargs = dict(zip(keys, values))
+            label = ",".join(f"{key}={value}" for key, value in kwargs.items())
+            full_name = f"{name}[{label}]" if label else name
+            BENCHMARKS[full_name] = (setup, kwargs)
+        return setup
+    return decorator
+
+
+def init_display(size=(1200, 900)):
+    """Initialize pygame with a headless window of the given size."""
+    pygame.init()
+    return pygame.display.set_mode(size, pygame.RESIZABLE)
+
+
+def _time_loops(func, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+def time_benchmark(func, repeat=5, min_time=0.05):
+    """Time func, calibrating the loop count so each sample takes min_time.
+
+    Returns:
+        Dict with per-call min and median in microseconds and the loop count
+    """
+    func()  # Warm up caches
+
+    loops = 1
+    while (elapsed := _time_loops(func, loops)) < min_time:
+        loops *= 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        samples.append(_time_loops(func, loops) / loops)
+
+    return {
+        "min_us": min(samples) * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "loops": loops,
+    }
+
+
+def run_benchmarks(pattern=None, repeat=5, min_time=0.05, report=print):
+    """Run every registered benchmark whose name contains pattern.
+
+    Returns:
+        Results document with run metadata and per-benchmark timings
+    """
+    results = {}
+    for name, (setup, kwargs) in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = time_benchmark(setup(**kwargs), repeat, min_time)
+        report(f"{name:<48} {results[name]['min_us']:>12.1f} us")
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+        },
+        "results": results,
+    }
+
+
+def save_results(document, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, tolerance=0.25):
+    """Compare per-call minimum times against a baseline.
+
+    Args:
+        baseline: Results document to compare against
+        current: Results document of this run
+        tolerance: Allowed slowdown as a fraction, 0.25 allows 25% slower
+
+    Returns:
+        Tuple of (report lines, names of benchmarks that regressed)
+    """
+    lines = [f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>8}"]
+    regressions = []
+
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            lines.append(f"{name:<48} {'-':>12} {result['min_us']:>10.1f}us {'new':>8}")
+            continue
+
+        ratio = result["min_us"] / before["min_us"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(
+            f"{name:<48} {before['min_us']:>10.1f}us {result['min_us']:>10.1f}us {ratio - 1:>+8.1%}{flag}"
+        )
+
+    return lines, regressions
@@ -0,0 +1,281 @@
+"""
+Command line tools that run without a display.
+
+    python -m kitdys_dawg_pound simulate --rows 8 --drops 1000000 --seed 7
+    python -m kitdys_dawg_pound simulate --rows 8 --drops 100000000 --records drops --format csv \\
+        --output run.csv --checkpoint run.ckpt        # rerun with --resume to carry on after a crash
+    python -m kitdys_dawg_pound audit --baseline audit.json --save-baseline  # after a deliberate odds change
+    python -m kitdys_dawg_pound audit --baseline audit.json --report audit.png  # exits 1 if the odds moved
+
+Results are streamed shard by shard (see services.simulation.iter_shards), so
+memory stays flat however many drops a run has. Nothing here imports pygame.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kitdys_dawg_pound.models.board_layout import board_width
+from kitdys_dawg_pound.models.physics import PhysicsParams
+from kitdys_dawg_pound.services.audit import (
+    AUDIT_DROPS, AUDIT_ROWS, AUDIT_SEED, DEFAULT_ALPHA, DEFAULT_MAX_LOST_SHARE, load_baseline, run_audit, save_baseline,
+    write_report,
+)
+from kitdys_dawg_pound.services.simulation import DEFAULT_SHARD_SIZE, iter_shards
+
+# Bump when the checkpoint file layout changes
+CHECKPOINT_VERSION = 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m kitdys_dawg_pound", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate = commands.add_parser("simulate", help="Drop balls headlessly and stream where they land")
+    simulate.add_argument("--rows", type=int, required=True, help="Number of pin rows")
+    simulate.add_argument("--drops", type=_positive_int, required=True, help="Number of balls to drop")
+    simulate.add_argument("--labels", help="Comma separated bin labels, one per bin (rows + 1)")
+    simulate.add_argument("--seed", type=int, help="Seed of the run, a fresh one is reported on stderr if omitted")
+    simulate.add_argument("--records", choices=("histogram", "drops"), default="histogram",
+                          help="Periodic histogram snapshots (default) or one record per drop")
+    simulate.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="Output format")
+    simulate.add_argument("--snapshot-every", type=_positive_int, default=DEFAULT_SHARD_SIZE, metavar="DROPS",
+                          help="Drops between histogram snapshots, rounded up to whole shards")
+    simulate.add_argument("--output", default="-", metavar="PATH", help="File to write to, stdout by default")
+    simulate.add_argument("--checkpoint", metavar="PATH", help="Save progress here after every shard")
+    simulate.add_argument("--resume", action="store_true", help="Carry on from the checkpoint")
+    simulate.add_argument("--workers", type=int, default=1, help="Worker processes simulating ahead")
+    simulate.add_argument("--shard-size", type=_positive_int, default=DEFAULT_SHARD_SIZE,
+                          help="Drops simulated at a time, changing it changes the result of a seed")
+    simulate.add_argument("--max-frames", type=int,
+                          help="Frames before a ball is given up on, the game's budget for the board by default")
+    simulate.add_argument("--substeps", type=float, default=1, help="Physics steps per 60 fps frame")
+    simulate.add_argument("--swept", action="store_true", help="Use swept collisions (see PhysicsParams)")
+
+    audit = commands.add_parser("audit", help="Check every board's odds against a fair board and a baseline")
+    audit.add_argument("--min-rows", type=int, default=AUDIT_ROWS.start, help="Smallest board audited")
+    audit.add_argument("--max-rows", type=int, default=AUDIT_ROWS.stop - 1, help="Largest board audited")
+    audit.add_argument("--drops", type=_positive_int, default=AUDIT_DROPS, help="Balls dropped on each board")
+    audit.add_argument("--seed", type=int, default=AUDIT_SEED,
+                       help="Seed of each board's run, keep it to compare with a baseline exactly")
+    audit.add_argument("--baseline", metavar="PATH", help="Baseline to check the odds against")
+    audit.add_argument("--save-baseline", action="store_true", help="Save this audit as the new baseline instead")
+    audit.add_argument("--report", metavar="PATH", help="Write a plot of every board, e.g. audit.png or audit.pdf")
+    audit.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                       help="p-value below which a board has shifted from its baseline")
+    audit.add_argument("--max-lost", type=float, default=DEFAULT_MAX_LOST_SHARE, metavar="SHARE",
+                       help="Share of the drops a board may lose before it fails the audit")
+    audit.add_argument("--workers", type=int, help="Worker processes, defaults to the number of CPUs")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "simulate":
+            return _simulate(parser, args)
+        if args.command == "audit":
+            return _audit(parser, args)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head), keep Python from failing on the final flush
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def _simulate(parser, args):
+    labels = args.labels.split(",") if args.labels else [str(i) for i in range(args.rows + 1)]
+    if len(labels) != args.rows + 1:
+        parser.error(f"--labels needs {args.rows + 1} labels for {args.rows} rows, got {len(labels)}")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    if args.resume and args.output == "-":
+        parser.error("--resume needs --output, stdout cannot be rewound to the checkpoint")
+
+    # Everything that decides what the output holds, a checkpoint only resumes the same run
+    run = {
+        "rows": args.rows, "drops": args.drops, "labels": labels, "entropy": args.seed,
+        "records": args.records, "format": args.format, "snapshot_every": args.snapshot_every,
+        "shard_size": args.shard_size, "max_frames": args.max_frames, "substeps": args.substeps,
+        "swept": args.swept,
+    }
+    state = {"next_shard": 0, "counts": [0] * (args.rows + 1), "lost": 0, "output_bytes": 0}
+    if args.resume and os.path.exists(args.checkpoint):
+        checkpoint = _load_checkpoint(args.checkpoint)
+        saved_run = checkpoint["run"]
+        if args.seed is None:
+            run["entropy"] = saved_run["entropy"]
+        if saved_run != run:
+            parser.error(f"{args.checkpoint} is for a different run: {saved_run}")
+        state = checkpoint["state"]
+    if run["entropy"] is None:
+        run["entropy"] = np.random.SeedSequence().entropy
+
+    counts = np.array(state["counts"], dtype=np.int64)
+    lost = state["lost"]
+    num_shards = -(-args.drops // args.shard_size)
+    snapshot_shards = -(-args.snapshot_every // args.shard_size)
+    options = {
+        "width": board_width(args.rows), "physics": PhysicsParams(swept_collision=args.swept),
+        "max_steps": args.max_frames, "substeps": args.substeps,
+    }
+
+    output = _open_output(args.output, state["output_bytes"])
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    try:
+        if state["output_bytes"] == 0 and args.format == "csv":
+            header = ["drop", "bin", "label"] if args.records == "drops" else ["drops", "lost", *labels]
+            output.write(_csv_lines([header]))
+
+        shards = iter_shards(
+            args.rows, args.drops, run["entropy"], args.shard_size, state["next_shard"], executor, **options
+        )
+        for shard_index, first_drop, bins in shards:
+            landed = bins[bins >= 0]
+            counts += np.bincount(landed, minlength=args.rows + 1)
+            lost += int(bins.size - landed.size)
+
+            if args.records == "drops":
+                output.write(_drop_lines(first_drop, bins, labels, args.format))
+            elif (shard_index + 1) % snapshot_shards == 0 or shard_index + 1 == num_shards:
+                output.write(_snapshot_line(first_drop + bins.size, lost, counts, args.format))
+
+            if args.checkpoint:
+                output.flush()
+                if output is not sys.stdout.buffer:
+                    os.fsync(output.fileno())
+                state = {
+                    "next_shard": shard_index + 1, "counts": counts.tolist(), "lost": lost,
+                    "output_bytes": output.tell() if output is not sys.stdout.buffer else 0,
+                }
+                _save_checkpoint(args.checkpoint, run, state)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if output is sys.stdout.buffer:
+            output.flush()
+        else:
+            output.close()
+
+    print(f"{int(counts.sum()) + lost} drops, {lost} lost, seed {run['entropy']}", file=sys.stderr)
+    return 0
+
+
+def _audit(parser, args):
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline")
+    if not 2 <= args.min_rows <= args.max_rows:
+        parser.error("--min-rows must be at least 2 and at most --max-rows")
+
+    baseline = None
+    if args.baseline and not args.save_baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as error:
+            parser.error(f"cannot read baseline: {error}")
+
+    print(f"{'rows':>4} {'drops':>9} {'lost':>6} {'TV fair':>8} {'chi2 p fair':>12} {'chi2 p base':>12} "
+          f"{'KS p base':>10}  verdict")
+
+    def progress(audit):
+        if audit.baseline_chi2 is None:
+            base, verdict = f"{'-':>12} {'-':>10}", "no baseline" if baseline is not None else ""
+        else:
+            base = f"{audit.baseline_chi2.p_value:12.3g} {audit.baseline_ks.p_value:10.3g}"
+            verdict = "SHIFTED" if audit.shifted(args.alpha) else "ok"
+        if audit.losing(args.max_lost):
+            verdict = "LOSING" if verdict in ("", "ok") else f"{verdict}, LOSING"
+        print(f"{audit.pin_rows:4d} {audit.drops:9d} {audit.lost_share:6.2%} "
+              f"{audit.binomial_distance:8.3f} {audit.binomial_chi2.p_value:12.3g} {base}  {verdict}", flush=True)
+
+    rows = range(args.min_rows, args.max_rows + 1)
+    audits = run_audit(rows, args.drops, args.seed, baseline, args.workers, progress=progress)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, audits, args.seed)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    if args.report:
+        write_report(args.report, audits, args.alpha, max_lost_share=args.max_lost)
+        print(f"Wrote report to {args.report}", file=sys.stderr)
+
+    shifted = [audit.pin_rows for audit in audits if audit.shifted(args.alpha)]
+    if shifted:
+        print(f"Odds shifted from the baseline for {', '.join(map(str, shifted))} rows", file=sys.stderr)
+    losing = [audit.pin_rows for audit in audits if audit.losing(args.max_lost)]
+    if losing:
+        print(f"More than {args.max_lost:.2%} of the balls lost for {', '.join(map(str, losing))} rows",
+              file=sys.stderr)
+    return 1 if shifted or losing else 0
+
+
+def _open_output(path, resume_bytes):
+    """Binary output stream, cut back to resume_bytes when resuming a file."""
+    if path == "-":
+        return sys.stdout.buffer
+    if not resume_bytes:
+        return open(path, "wb")
+    output = open(path, "r+b")
+    # Anything past the checkpoint was written after it was saved and is written again
+    output.truncate(resume_bytes)
+    output.seek(resume_bytes)
+    return output
+
+
+def _drop_lines(first_drop, bins, labels, fmt):
+    drops = range(first_drop, first_drop + bins.size)
+    bin_list = bins.tolist()
+    if fmt == "csv":
+        return _csv_lines(zip(drops, bin_list, (labels[b] if b >= 0 else "" for b in bin_list)))
+
+    # Indexed by bin, a ball that never landed (-1) gets the null at the end
+    label_json = [json.dumps(label) for label in labels] + ["null"]
+    return "".join(
+        f'{{"drop": {drop}, "bin": {b}, "label": {label_json[b]}}}\n' for drop, b in zip(drops, bin_list)
+    ).encode()
+
+
+def _snapshot_line(drops, lost, counts, fmt):
+    if fmt == "csv":
+        return _csv_lines([[drops, lost, *counts.tolist()]])
+    return (json.dumps({"drops": drops, "lost": lost, "counts": counts.tolist()}) + "\n").encode()
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _load_checkpoint(path):
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise SystemExit(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+    return checkpoint
+
+
+def _save_checkpoint(path, run, state):
+    """Replace the checkpoint atomically, so a crash leaves the old or the new one."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"version": CHECKPOINT_VERSION, "run": run, "state": state}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
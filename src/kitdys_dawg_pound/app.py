@@ -0,0 +1,39 @@
+"""
+HTTP API serving board configurations and server-side drops.
+
+Run locally with ``flask --app kitdys_dawg_pound.app run``. On AWS Lambda,
+``handler`` serves the same app through Mangum.
+"""
+from asgiref.wsgi import WsgiToAsgi
+from aws_lambda_powertools import Logger
+from flask import Flask
+from flask_cors import CORS
+from mangum import Mangum
+
+from kitdys_dawg_pound.routes.boards import boards_bp
+from kitdys_dawg_pound.services.drops import DropService
+
+logger = Logger(service="kitdys-dawg-pound")
+
+
+def create_app(drop_service=None):
+    """Create the Flask app.
+
+    Args:
+        drop_service: DropService to simulate with, a default one if None
+    """
+    app = Flask(__name__)
+    CORS(app)
+    app.extensions["drop_service"] = drop_service or DropService()
+    app.register_blueprint(boards_bp)
+    return app
+
+
+app = create_app()
+_asgi_handler = Mangum(WsgiToAsgi(app), lifespan="off")
+
+
+@logger.inject_lambda_context
+def handler(event, context):
+    """AWS Lambda entry point."""
+    return _asgi_handler(event, context)
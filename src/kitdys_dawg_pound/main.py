@@ -1,220 +1,460 @@
+import asyncio
+import sys
+import time
+
+import numpy as np
 import pygame
 
+from kitdys_dawg_pound.models.board_layout import board_width, default_max_frames, get_board_layout
 from kitdys_dawg_pound.models.plinko_bins import PlinkoBins
-from kitdys_dawg_pound.ui.drawing import draw_text_box
+from kitdys_dawg_pound.ui.board_layer import BoardLayer
+from kitdys_dawg_pound.ui.board_renderer import draw_ball_pool, draw_bins, get_bin_atlas
+from kitdys_dawg_pound.ui.camera import Camera
+from kitdys_dawg_pound.ui.display import Viewport
+from kitdys_dawg_pound.ui.fonts import clear_font_cache, get_font
+from kitdys_dawg_pound.ui.frame_scheduler import ACTIVE, ASLEEP, THROTTLED, FrameScheduler
+from kitdys_dawg_pound.ui.input import allow_events, poll_input
 from kitdys_dawg_pound.ui.popup import Popup
+from kitdys_dawg_pound.ui.profiler import FrameProfiler, ProfilerOverlay
 from kitdys_dawg_pound.ui.editor import PlinkoEditor
-from kitdys_dawg_pound.models.plinko_ball import Ball
-
-def run_game():
-    # Initialize pygame
-    pygame.init()
-
-    # Base dimensions (design size)
-    BASE_WIDTH, BASE_HEIGHT = 800, 600
-
-    # Start with resizable window
-    screen = pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT), pygame.RESIZABLE)
-    pygame.display.set_caption("Plinko Game")
-
-    # Create render surface at base resolution
-    game_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
-
-    # Game state
-    pin_rows = 6
-    bin_texts = ["Empty Car","Remove Water", "Remove Food", "Pee off Roof", "Off Roading Only", "Walking Only", "Restart Game"]
-
-    # Create bins
-    bins = PlinkoBins(pin_rows, bin_texts)
-
-    # Create editor
-    editor = PlinkoEditor(BASE_WIDTH, BASE_HEIGHT)
-    editor.create_bin_textboxes(bin_texts)
-
-    # Ball - start with no ball
-    ball = None
-
-    # Game loop variables
-    clock = pygame.time.Clock()
-    running = True
-
-    popup = Popup()
-    popup_font = pygame.font.SysFont("Gill Sans", 36)
-
-    while running:
-        # Calculate letterboxing offsets and scale
-        screen_width, screen_height = screen.get_size()
-        scale_x = screen_width / BASE_WIDTH
-        scale_y = screen_height / BASE_HEIGHT
-        scale_factor = min(scale_x, scale_y)
-
-        # Calculate positioning offsets (for letterboxing)
-        scaled_width = int(BASE_WIDTH * scale_factor)
-        scaled_height = int(BASE_HEIGHT * scale_factor)
-        offset_x = (screen_width - scaled_width) // 2
-        offset_y = (screen_height - scaled_height) // 2
-
-        # Collect all mouse events for this frame
-        events_to_process = []
-        mouse_moved = False
-        current_mouse_pos = None
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.VIDEORESIZE:
-                screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-            elif event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.MOUSEMOTION:
-                # Get screen mouse position
-                screen_pos = event.pos
-
-                # First check if the click is within the game area
-                if (offset_x <= screen_pos[0] <= offset_x + scaled_width and
-                        offset_y <= screen_pos[1] <= offset_y + scaled_height):
-
-                    # Convert screen coordinates to game coordinates with offset
-                    game_x = (screen_pos[0] - offset_x) / scale_factor
-                    game_y = (screen_pos[1] - offset_y) / scale_factor
-                    game_pos = (int(game_x), int(game_y))
-
-                    if event.type == pygame.MOUSEMOTION:
-                        mouse_moved = True
-                        current_mouse_pos = game_pos
-
-                    # Create event with proper coordinates
-                    scaled_event = pygame.event.Event(event.type, {
-                        'pos': game_pos,
-                        'button': event.button if event.type == pygame.MOUSEBUTTONDOWN else 0
-                    })
-
-                    # Only check popup with scaled coordinates for MOUSEBUTTONDOWN
-                    if event.type == pygame.MOUSEBUTTONDOWN and popup.check_click(game_pos):
-                        continue  # Skip this event if popup handled it
-
-                    events_to_process.append(scaled_event)
-            else:
-                events_to_process.append(event)
-
-        # If mouse moved, always add a new motion event at the end to ensure hover states update
-        if mouse_moved and current_mouse_pos:
-            # Add an extra MOUSEMOTION event to ensure UI hover states are updated correctly
-            events_to_process.append(pygame.event.Event(pygame.MOUSEMOTION, {
-                'pos': current_mouse_pos,
-                'buttons': pygame.mouse.get_pressed()
-            }))
-
-        # Handle editor events with converted positions
-        editor_result = editor.handle_events(events_to_process)
+from kitdys_dawg_pound.models.ball_pool import BallPool
+from kitdys_dawg_pound.models.simulation_clock import SimulationClock
+from kitdys_dawg_pound.services.hit_stats import HitCounters
+from kitdys_dawg_pound.services.odds import OddsLoader
+from kitdys_dawg_pound.services.replay import DropConfig, DropPlayback, ReplayWriter
+
+# Base dimensions (design size)
+BASE_WIDTH, BASE_HEIGHT = 800, 600
+
+# Balls in flight - each drop takes a free slot in the pool
+MAX_BALLS = 256
+
+# Replays of the last drop run in slow motion, so the bounces can be followed
+REPLAY_SPEED = 0.5
+
+# Surface pixels the board scrolls per mouse wheel notch
+SCROLL_STEP = 40
+
+# Zoom in, zoom out and go back to following the balls
+CAMERA_KEYS = (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_MINUS, pygame.K_KP_MINUS, pygame.K_HOME)
+
+# Browsers have no threads, so the pygbag build cannot simulate odds in the background
+IS_BROWSER = sys.platform == "emscripten"
+
+
+class Game:
+    def __init__(self, scale_filter="quality", profile=False, fps=60):
+        """Open the game window and set up the board.
+
+        F3 toggles the frame profiler overlay and F4 exports its timings.
+        The loop runs at fps only while something moves, see pace.
+        Boards too big for the window follow the lead ball; the mouse wheel
+        scrolls them, + and - zoom and Home follows the balls again.
+        Every drop is logged for replay, and F5 plays the last one back. Bin
+        hits are counted per board configuration across sessions.
+
+        Args:
+            scale_filter: "quality" for smooth scaling to the window, "fast" for
+                nearest neighbour scaling on slow hardware
+            profile: Start with the frame profiler recording
+            fps: Frame rate while anything on the board moves
+        """
+        # Initialize pygame
+        pygame.init()
+
+        # Start with resizable window
+        self.screen = pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT), pygame.RESIZABLE)
+        pygame.display.set_caption("Plinko Game")
+
+        # Keep event types the game ignores out of the queue
+        allow_events()
+
+        # Create render surface at base resolution
+        self.game_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
+
+        # Maps the render surface onto the window, rebuilt only on resize
+        self.viewport = Viewport((BASE_WIDTH, BASE_HEIGHT), scale_filter)
+        self.viewport.resize(self.screen.get_size(), self.game_surface)
+
+        # Game state
+        self.pin_rows = 6
+        self.bin_texts = ["Empty Car","Remove Water", "Remove Food", "Pee off Roof", "Off Roading Only", "Walking Only", "Restart Game"]
+
+        # Create bins
+        self.bins = PlinkoBins(self.pin_rows, self.bin_texts)
+
+        # Create editor
+        self.editor = PlinkoEditor(BASE_WIDTH, BASE_HEIGHT)
+        self.editor.create_bin_textboxes(self.bin_texts)
+
+        # Physics runs in fixed steps, independent of the frame rate
+        self.sim_clock = SimulationClock()
+
+        # Board geometry, shared by the physics, the pins and the bins
+        self.pins_start_y = 50
+        self.layout = self._board_layout(self.pin_rows)
+        self.balls = self._ball_pool()
+
+        # Part of the board on the game surface, all of it unless the board is bigger
+        self.camera = Camera((BASE_WIDTH, BASE_HEIGHT))
+        self.camera.set_board((self.layout.width, self.layout.height))
+
+        # Drops are logged with their seeds so any of them can be replayed exactly
+        self.drop_config = self._drop_config()
+        self.drop_times = np.zeros(MAX_BALLS)
+        self.playback = None
+        try:
+            self.replay = ReplayWriter()
+            self.replay.set_config(self.drop_config)
+        except OSError:
+            self.replay = None
+
+        # Hit counts of the current board, kept on disk across sessions
+        self.hit_stats = None
+        self._open_hit_stats()
+
+        self.popup = Popup()
+        self.popup_font = get_font("Gill Sans", 36)
+
+        # Static board is pre-rendered and only the rects drawn over it are refreshed
+        self.layer = BoardLayer((BASE_WIDTH, BASE_HEIGHT))
+        self.layer_scale = None
+        self.layer_view = None
+        self.full_redraw = True
+        self.prev_dirty_rects = []
+        self.animating = False  # Balls or pressed bins were drawn, so the next frame has to erase them
+        self.waiting_for_odds = False
+
+        # Frame pacing, drops to a crawl or sleeps until input when nothing moves
+        self.scheduler = FrameScheduler(fps)
+
+        # Stage timings, the calls cost next to nothing while it is disabled
+        self.profiler = FrameProfiler(enabled=profile)
+        self.profiler_overlay = ProfilerOverlay(self.profiler, scheduler=self.scheduler)
+
+        # Bin odds for the editor, simulated in the background unless cached
+        self.odds = None
+        if not IS_BROWSER:
+            self.odds = OddsLoader(pins_start_y=self.pins_start_y, width=BASE_WIDTH, substeps=self.sim_clock.substeps)
+
+    def frame(self, frame_ms):
+        """Handle input, advance the physics and draw one frame.
+
+        Args:
+            frame_ms: Real time since the previous frame started
+
+        Returns:
+            False once the window has been closed
+        """
+        running = self._handle_events()
+        self.profiler.mark("events")
+
+        # Update all balls in flight and hand landed ones to the bins together
+        for _ in range(self.sim_clock.advance(frame_ms)):
+            landed = self.balls.update()
+            if landed.size:
+                self.bins.register_hits(landed)
+                if self.hit_stats:
+                    self.hit_stats.record_many(landed)
+                self._show_landing("You landed in", landed[-1])
+            elif (self.balls.finished_bins < 0).any():
+                self.popup = Popup()
+                self.popup.show("A ball got stuck and was taken off the board")
+            if self.replay and self.balls.finished_slots.size:
+                self._record_drops()
+
+        if self.playback and self.playback.advance(frame_ms) is not None:
+            if self.playback.bin_index >= 0:
+                self._show_landing("Replay landed in", self.playback.bin_index)
+            self.playback = None
+
+        self._follow_lead_ball(frame_ms)
+        self.profiler.mark("physics")
+
+        self._draw()
+        return running
+
+    def pace(self):
+        """Frame pacing mode for the next frame.
+
+        Returns:
+            ACTIVE while balls fly, a replay plays, bins are pressed or the
+            profiler records, THROTTLED while the editor waits for odds, ASLEEP
+            when only input can change the picture
+        """
+        if (self.full_redraw or self.animating or self.playback is not None or self.bins.hit.any()
+                or self.balls.alive.any() or self.camera.moving or self.profiler.enabled):
+            return ACTIVE
+        if self.waiting_for_odds:
+            return THROTTLED
+        return ASLEEP
+
+    def _follow_lead_ball(self, frame_ms):
+        """Point the camera at the ball furthest down, or at the replayed one."""
+        if self.playback:
+            x, y = self.playback.pool.positions(self.playback.clock.alpha)
+        else:
+            x, y = self.balls.positions(self.sim_clock.alpha)
+        if y.size:
+            lead = y.argmax()
+            self.camera.follow(x[lead], y[lead])
+        self.camera.update(frame_ms)
+
+    def _board_layout(self, pin_rows):
+        return get_board_layout(pin_rows, width=board_width(pin_rows, BASE_WIDTH), pins_start_y=self.pins_start_y)
+
+    def _ball_pool(self):
+        return BallPool(
+            MAX_BALLS, self.layout, dt=self.sim_clock.dt, max_frames=default_max_frames(self.pin_rows)
+        )
+
+    def _show_landing(self, message, bin_index):
+        self.popup = Popup()
+        self.popup.show(f"{message} {self.bins.bin_texts[bin_index]}!", self.bins.rgb_gradient[bin_index])
+
+    def _drop_config(self):
+        return DropConfig(
+            self.pin_rows, width=self.layout.width, pin_spacing=self.layout.pin_spacing,
+            pins_start_y=self.pins_start_y, drop_x=self.layout.width // 2, drop_y=20, substeps=self.sim_clock.substeps,
+            max_frames=default_max_frames(self.pin_rows)
+        )
+
+    def _open_hit_stats(self):
+        if self.hit_stats:
+            self.hit_stats.close()
+        try:
+            self.hit_stats = HitCounters.for_config(self.drop_config)
+        except (OSError, ValueError):
+            self.hit_stats = None
+
+    def _record_drops(self):
+        slots = self.balls.finished_slots
+        self.replay.record_many(
+            self.balls.seeds[slots].tolist(),
+            self.drop_times[slots].tolist(),
+            (self.balls.steps - self.balls.launch_step[slots]).tolist(),
+            self.balls.finished_bins.tolist(),
+        )
+
+    def _replay_last_drop(self):
+        last_drop = self.replay.last_drop if self.replay else None
+        if last_drop is not None and last_drop.config == self.drop_config and not self.editor.edit_mode:
+            self.playback = DropPlayback(last_drop, REPLAY_SPEED)
+
+    def _handle_events(self):
+        frame_input = poll_input(self.viewport)
+
+        if frame_input.resize:
+            self.screen = pygame.display.set_mode(frame_input.resize, pygame.RESIZABLE)
+            self.viewport.resize(self.screen.get_size(), self.game_surface)
+            self.full_redraw = True
+        elif frame_input.exposed:
+            # Whatever covered the window took the picture with it
+            self.full_redraw = True
+
+        # Camera controls only apply to the board, not while typing in the editor
+        if not self.editor.edit_mode and frame_input.scroll != (0, 0):
+            self.camera.scroll(-frame_input.scroll[0] * SCROLL_STEP, -frame_input.scroll[1] * SCROLL_STEP)
+
+        # Profiler and camera keys and clicks on the popup are handled here, the rest go to the editor
+        events = []
+        for event in frame_input.events:
+            if event.type == pygame.KEYDOWN and not self.editor.edit_mode and event.key in CAMERA_KEYS:
+                self._camera_key(event.key)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.export(pacing=self.scheduler.summary())
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                self._replay_last_drop()
+            elif not (event.type == pygame.MOUSEBUTTONDOWN and self.popup.check_click(event.pos)):
+                events.append(event)
+        frame_input.events = events
+
+        editor_result = self.editor.handle_input(frame_input)
 
         # Handle game actions based on editor results
-        if editor_result["drop_ball"] and (ball is None or not ball.active):
-            ball = Ball(BASE_WIDTH // 2, 20)
+        if editor_result["drop_ball"]:
+            slot = self.balls.spawn(self.drop_config.drop_x, self.drop_config.drop_y)
+            if slot is not None:
+                self.drop_times[slot] = time.time()
+                self.camera.following = True
 
         if editor_result["mode_changed"]:
-            if editor.edit_mode:
-                ball = None
+            self.full_redraw = True
+            if self.editor.edit_mode:
+                self.balls.clear()
+                self.playback = None
                 pygame.display.set_caption("Plinko Game - Edit Mode")
             else:
                 pygame.display.set_caption("Plinko Game")
 
         if editor_result["rows_changed"] or editor_result["labels_changed"]:
-            if editor_result["labels_changed"]:
-                bin_texts = editor.get_bin_labels()
-
-            if editor_result["rows_changed"]:
-                pin_rows = editor.get_row_value()
-                bins = PlinkoBins(pin_rows, bin_texts)
-            else:
-                bins = PlinkoBins(pin_rows, bin_texts)
-
-            editor.create_bin_textboxes(bin_texts)
-
-        # Clear the game surface
-        game_surface.fill((195, 177, 225))
-
-        text_message = "Kitdy's Dawg Pound"  # Change this to whatever text you need
-        draw_text_box(game_surface, text_message, 20, 20, 24,bg_color=(195, 177, 225),text_color=(128, 0, 128), ratio=1.0)
-
-        # Draw pins
-        pins_start_y = 50
-        pin_spacing = min(BASE_WIDTH // (pin_rows + 2), 50)
-        pin_radius = 5
-
-        # Create pins in triangular formation
-        pins = []
-        for row in range(pin_rows):
-            num_pins_in_row = row + 1
-            row_width = num_pins_in_row * pin_spacing
-            row_start_x = (BASE_WIDTH - row_width) // 2
-
-            for col in range(num_pins_in_row):
-                pin_x = row_start_x + col * pin_spacing
-                pin_y = pins_start_y + row * pin_spacing
-                pins.append((pin_x, pin_y))
-                pygame.draw.circle(game_surface,  (159, 43, 104),(pin_x, pin_y), pin_radius)
-
-
-        # Update and draw ball if it exists
-        # Update and draw ball if it exists
-        if ball:
-            bin_hit = ball.update(pin_rows, BASE_WIDTH, pin_spacing, pins_start_y)
-
-            # Calculate where the bottom of the bins should be
-            bin_bottom_y = pins_start_y + (pin_rows * pin_spacing) + 50  # Add extra space for bin height
-
-            # Check if the ball has hit a bin or fallen below the bins
-            if bin_hit is not None:
-                # Ball hit a bin normally
-                bins.register_hit(bin_hit)
-                bin_text = bins.bin_texts[bin_hit]
-                popup = Popup()
-                popup.show(f"You landed in {bin_text}!", bins.rgb_gradient[bin_hit])
-                ball = None  # Make ball disappear
-            elif ball.y > bin_bottom_y:
-                # Ball has fallen below the bins without registering a hit
-                # Find the closest bin based on x-position
-                num_bins = pin_rows + 1
-                bin_width = pin_spacing
-                bin_start_x = (BASE_WIDTH - (num_bins * bin_width)) // 2
-
-                for i in range(num_bins):
-                    bin_left = bin_start_x + (i * bin_width)
-                    bin_right = bin_left + bin_width
-
-                    if bin_left <= ball.x <= bin_right:
-                        bins.register_hit(i)
-                        bin_text = bins.bin_texts[i]
-                        popup = Popup()
-                        popup.show(f"You landed in {bin_text}!", bins.rgb_gradient[i])
-                        break
-
-                ball = None  # Make ball disappear
-            else:
-                ball.draw(game_surface)  # Only draw if ball is still active
-
-        # Draw bins - pass the actual scale_factor instead of 1.0
-        num_bins = pin_rows + 1
-        bin_row_width = num_bins * pin_spacing
-        bin_start_x = (BASE_WIDTH - bin_row_width) // 2
-        bins.draw_bins(BASE_WIDTH, game_surface, scale_factor, pin_spacing, pins_start_y, bin_start_x)
-
-        # Draw editor UI and popup
-        editor.draw(game_surface)
-        popup.draw(game_surface, popup_font)
-
-        # First fill the screen with black (for letterboxing)
-        screen.fill((195, 177, 225))
-
-        # Scale game surface while maintaining aspect ratio
-        scaled_surface = pygame.transform.smoothscale(game_surface, (scaled_width, scaled_height))
-
-        # Blit the scaled surface at the correct position
-        screen.blit(scaled_surface, (offset_x, offset_y))
-
-        pygame.display.flip()
-        clock.tick(60)
+            self.set_board(
+                self.editor.get_row_value() if editor_result["rows_changed"] else self.pin_rows,
+                self.editor.get_bin_labels() if editor_result["labels_changed"] else self.bin_texts,
+            )
+
+        return not frame_input.quit
+
+    def _camera_key(self, key):
+        if key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.camera.zoom_by(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.camera.zoom_by(-1)
+        else:
+            self.camera.following = True
+
+    def set_board(self, pin_rows, bin_texts):
+        """Switch to a board with pin_rows rows and the given bin labels."""
+        if pin_rows != self.pin_rows:
+            self.pin_rows = pin_rows
+            self.layout = self._board_layout(pin_rows)
+            self.balls = self._ball_pool()
+            self.camera.set_board((self.layout.width, self.layout.height))
+            self.drop_config = self._drop_config()
+            if self.replay:
+                self.replay.set_config(self.drop_config)
+            self._open_hit_stats()
+
+        self.bin_texts = bin_texts
+        self.bins = PlinkoBins(pin_rows, bin_texts)
+        self.editor.create_bin_textboxes(bin_texts)
+        self.layer_scale = None
+
+    def _draw(self):
+        surface = self.game_surface
+
+        # Bins are sized by the window scale, so a resize also rebuilds the layer, as does moving the camera
+        # past the part of the board the layer holds
+        scale_factor = self.viewport.scale_factor
+        if self.layer_scale != scale_factor or not self.layer.covers(self.camera):
+            self.layer.rebuild(self.bins, self.layout, scale_factor, self.camera)
+            self.layer_scale = scale_factor
+            self.full_redraw = True
+        if self.layer_view != self.camera.view_key:
+            self.layer_view = self.camera.view_key
+            self.full_redraw = True
+
+        # Rects of the game surface overwritten by the restore below
+        restored = None if self.full_redraw else self.prev_dirty_rects
+
+        if self.editor.edit_mode:
+            # The editor overlay covers the whole board and restores itself
+            # Odds of the board as it is played, including the balls it gives up on
+            board = {"width": self.drop_config.width, "max_frames": self.drop_config.max_frames}
+            odds_table = self.odds.request(self.pin_rows, **board) if self.odds else None
+            self.editor.set_bin_odds(None if odds_table is None else odds_table.probabilities)
+            self.waiting_for_odds = odds_table is None and self.odds is not None and self.odds.pending(
+                self.pin_rows, **board
+            )
+            dirty_rects = []
+        else:
+            # Restore the static board where anything was drawn last frame
+            self.layer.restore(surface, restored, self.camera)
+            dirty_rects = draw_ball_pool(surface, self.balls, self.sim_clock.alpha, self.camera)
+            if self.playback:
+                dirty_rects += draw_ball_pool(surface, self.playback.pool, self.playback.clock.alpha, self.camera)
+
+            # Draw pressed bins - pass the actual scale_factor instead of 1.0
+            dirty_rects += draw_bins(
+                self.bins, surface, self.layout, scale_factor, only_hit=True,
+                background=self.layer.background(self.camera), camera=self.camera
+            )
+            self.waiting_for_odds = False
+        self.animating = bool(dirty_rects)
+
+        # Editor widgets stay on the surface, so they only need pushing to the window
+        ui_rects = self.editor.draw(surface, restored)
+
+        # Draw popup and profiler overlay
+        popup_rect = self.popup.draw(surface, self.popup_font)
+        if popup_rect:
+            dirty_rects.append(popup_rect)
+        overlay_rect = self.profiler_overlay.draw(surface)
+        if overlay_rect:
+            dirty_rects.append(overlay_rect)
+        self.profiler.mark("draw")
+
+        # Scale to the window, pushing only what changed since last frame
+        screen_rects = self.viewport.compose(
+            self.screen, surface, None if self.full_redraw else self.prev_dirty_rects + dirty_rects + ui_rects
+        )
+        self.profiler.mark("scale")
+        self.viewport.flip(screen_rects)
+        self.profiler.mark("flip")
+        self.prev_dirty_rects = dirty_rects
+        self.full_redraw = False
+
+    def end_frame(self):
+        """Close the frame once the loop is done waiting for the next one."""
+        self.profiler.mark("idle")
+        self.profiler.end_frame()
+
+    def close(self):
+        if self.odds:
+            self.odds.shutdown()
+        if self.replay:
+            self.replay.close()
+        if self.hit_stats:
+            self.hit_stats.close()
+        clear_font_cache()
+        get_bin_atlas.cache_clear()
+        pygame.quit()
+
+
+def run_game(scale_filter="quality", profile=False, fps=60):
+    """Run the game window until it is closed.
+
+    Args:
+        scale_filter: "quality" for smooth scaling to the window, "fast" for
+            nearest neighbour scaling on slow hardware
+        profile: Start with the frame profiler recording
+        fps: Frame rate to cap drawing at, the loop slows down or sleeps
+            until input while nothing moves (see Game.pace)
+    """
+    game = Game(scale_filter, profile, fps)
+    frame_ms = 0
+
+    while game.frame(frame_ms):
+        frame_ms = game.scheduler.wait(game.pace())
+        game.end_frame()
+
+    game.close()
+
+
+async def run_game_async(scale_filter="quality", profile=False, fps=60):
+    """Run the game on an asyncio loop, yielding to it once per frame.
+
+    In the browser (pygbag) each ``await asyncio.sleep(0)`` hands control back
+    until the next animation frame, so the browser sets the pace. On the
+    desktop the loop sleeps until the next frame is due instead, for longer
+    while nothing moves (see Game.pace). The physics
+    advances on the measured frame time either way, in fixed steps, so it runs
+    at the same speed however often frames are drawn.
+
+    Args:
+        scale_filter: "quality" for smooth scaling to the window, "fast" for
+            nearest neighbour scaling on slow hardware
+        profile: Start with the frame profiler recording
+        fps: Frame rate to cap drawing at on the desktop
+    """
+    game = Game(scale_filter, profile, fps)
+    frame_ms = 0
+    frame_start = time.perf_counter()
+
+    while game.frame(frame_ms):
+        if IS_BROWSER:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            frame_ms = (now - frame_start) * 1000
+            frame_start = now
+        else:
+            frame_ms = await game.scheduler.wait_async(game.pace())
+        game.end_frame()
+
+    game.close()
 
-    pygame.quit()
 
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    run_game()
@@ -0,0 +1,559 @@
+"""
+Headless batch physics for many plinko balls at once.
+
+Ball state is kept as structure-of-arrays NumPy data so that a whole batch is
+stepped with a handful of vectorized operations. The movement, wall,
+pin-collision, elasticity and center-bias rules follow ``Ball.update`` and
+``Ball.check_pin_collision``. With ``PhysicsParams.swept_collision`` pin and
+wall collisions are found by sweeping each step's path instead, which stays
+accurate with steps several frames long.
+"""
+import numpy as np
+
+from kitdys_dawg_pound.models.board_layout import default_max_frames, get_board_layout
+from kitdys_dawg_pound.models.drop_rng import drop_random
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+from kitdys_dawg_pound.models.simulation_clock import cooldown_steps
+
+# Pin impacts resolved per ball in one swept step, later ones wait for the next step
+_MAX_IMPACTS = 3
+
+
+class BatchPhysics:
+    def __init__(self, layout, physics=DEFAULT_PHYSICS, rng=None, dt=1.0):
+        """Vectorized step function for one board layout.
+
+        Args:
+            layout: BoardLayout the balls are dropped on
+            physics: PhysicsParams to simulate with
+            rng: numpy Generator for the random draws of balls without a seed
+            dt: Step length in 60 fps frames, see SimulationClock.dt
+        """
+        # Only the nearest pin can overlap the ball when pins are this far apart
+        if layout.pin_spacing <= 2 * (layout.ball_radius + layout.pin_radius):
+            raise ValueError(f"pin_spacing {layout.pin_spacing} is too small for the ball and pin radii")
+
+        self.layout = layout
+        self.physics = physics
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.dt = dt
+        self.cooldown_steps = cooldown_steps(physics.collision_cooldown, dt)
+
+        # Per-row lookup tables padded with an empty row above and below, so
+        # clipped row indices outside the board find no pins
+        self._row_start_x = np.concatenate(([0.0], layout.row_start_x, [0.0]))
+        self._col_max = np.concatenate(([-1], layout.row_pins - 1, [-1]))
+
+    def spawn_velocity(self, count, seeds=None):
+        """Random initial horizontal velocities for newly dropped balls.
+
+        Args:
+            count: Number of balls dropped
+            seeds: Per-drop seeds, see drop_rng, or None to draw from rng
+        """
+        p = self.physics
+        if seeds is None:
+            return self.rng.uniform(-p.spawn_velocity, p.spawn_velocity, count)
+        return (drop_random(seeds, 0) * 2 - 1) * p.spawn_velocity
+
+    def step(self, x, y, vx, vy, last_collision, steps, seeds=None, launch_step=None):
+        """Advance balls by one fixed step, updating the arrays in place.
+
+        Args:
+            x, y: Ball positions
+            vx, vy: Ball velocities
+            last_collision: Step number of each ball's latest pin collision,
+                fractional with swept collisions
+            steps: Step number being simulated
+            seeds: Per-drop seeds, see drop_rng, or None to draw from rng
+            launch_step: Step number each ball was dropped at, needed with seeds
+
+        Returns:
+            Tuple of (mask of balls that reached the bins, their bin indices)
+        """
+        p = self.physics
+        layout = self.layout
+        width = layout.width
+        radius = layout.ball_radius
+        dt = self.dt
+
+        if p.swept_collision:
+            self._move_swept(x, y, vx, vy, last_collision, steps, seeds, launch_step)
+        else:
+            # Apply gravity and update position
+            vy += p.gravity * dt
+            x += vx * dt
+            y += vy * dt
+
+            # Wall collisions
+            left = x - radius < 0
+            right = ~left & (x + radius > width)
+            x[left] = radius
+            x[right] = width - radius
+            walls = left | right
+            vx[walls] *= -p.elasticity
+
+            self._collide_pins(x, y, vx, vy, last_collision, steps, seeds, launch_step)
+
+        # Check if balls reached the bins
+        landed = y > layout.floor_y
+        if not landed.any():
+            return landed, np.empty(0, dtype=np.int16)
+
+        land_x = x[landed]
+        if p.swept_collision:
+            # Where the ball crossed the floor, which a long step may have gone well past
+            land_x = land_x - vx[landed] * (y[landed] - layout.floor_y) / vy[landed]
+        return landed, layout.bin_index(land_x)
+
+    def _collide_pins(self, x, y, vx, vy, last_collision, steps, seeds, launch_step):
+        """Push balls that ended the step overlapping a pin back out and bounce them."""
+        layout = self.layout
+        spacing = layout.pin_spacing
+
+        # Offset from the nearest pin slot, row 0 of the tables is above the board
+        board_y = y - layout.top_row_y
+        row = np.rint(board_y / spacing).astype(np.intp) + 1
+        np.minimum(np.maximum(row, 0, out=row), layout.pin_rows + 1, out=row)
+        row_start_x = self._row_start_x[row]
+        col = np.rint((x - row_start_x) / spacing)
+        # Offsets from the pin's center computed like Ball does, so seeded
+        # drops follow the same path down to the last bit
+        dx = x - (row_start_x + col * spacing)
+        dy = y - (layout.top_row_y + (row - 1) * spacing)
+        dist_sq = dx * dx + dy * dy
+        radius_sum = layout.ball_radius + layout.pin_radius
+
+        # Only balls overlapping a slot that holds a pin, outside their cooldown
+        hit = np.flatnonzero(dist_sq < radius_sum * radius_sum)
+        hit_row = row[hit]
+        hit_col = col[hit]
+        hit = hit[(hit_col >= 0) & (hit_col <= self._col_max[hit_row])
+                  & (steps - last_collision[hit] >= self.cooldown_steps)]
+        if not hit.size:
+            return
+
+        dx = dx[hit]
+        dy = dy[hit]
+        dist = np.sqrt(dist_sq[hit])
+        touching = dist > 0
+        safe_dist = np.where(touching, dist, 1.0)
+        normal_x = np.where(touching, dx / safe_dist, 1.0)
+        normal_y = np.where(touching, dy / safe_dist, 0.0)
+
+        # Move ball outside pin to prevent sticking/tunneling
+        displacement = radius_sum - dist + 0.5
+        hx = x[hit] + normal_x * displacement
+        hy = y[hit] + normal_y * displacement
+
+        draws = None if seeds is None else drop_random(seeds[hit], steps - launch_step[hit] + 1)
+        hvx, hvy = self._bounce(hit, hx, vx[hit], vy[hit], normal_x, normal_y, draws)
+        x[hit] = hx
+        y[hit] = hy
+        vx[hit] = hvx
+        vy[hit] = hvy
+        last_collision[hit] = steps
+
+    def _move_swept(self, x, y, vx, vy, last_collision, steps, seeds, launch_step):
+        """Move balls by one step, bouncing them off the pins in their path.
+
+        Each ball's path is swept against the pins it passes. The ball is
+        stopped at the time of impact, bounced, and moved on for the rest of
+        the step, so it can cross a whole pin row in one step without
+        tunneling through it and steps can be several frames long. Balls fall
+        along their exact parabola between bounces and the collision cooldown
+        is kept in continuous time, so the path barely depends on the step
+        size. Walls are handled the same way, after the pins.
+        """
+        p = self.physics
+        layout = self.layout
+        radius = layout.ball_radius
+        radius_sum = radius + layout.pin_radius
+        width = layout.width
+        dt = self.dt
+        gravity = p.gravity
+        cooldown = p.collision_cooldown / dt  # In steps, impacts happen in between steps
+
+        # The first pass moves every ball, later passes only the balls that bounced
+        balls = None
+        bx, by, bvx, bvy, blast = x, y, vx, vy, last_collision
+        for impacts in range(_MAX_IMPACTS + 1):
+            # Balls fly freely until their cooldown is over and are swept after that
+            sweep = impacts < _MAX_IMPACTS
+            if balls is None:
+                # Cooldowns of impacts in earlier steps
+                ready = np.minimum(np.maximum(blast + cooldown - steps, 0), 1)
+                cooling = np.flatnonzero(ready)
+                cool_x, cool_y, cool_vy = bx[cooling], by[cooling], bvy[cooling]
+                self._fly(cool_x, cool_y, bvx[cooling], cool_vy, ready[cooling] * dt)
+                bx[cooling], by[cooling], bvy[cooling] = cool_x, cool_y, cool_vy
+            else:
+                # Time into the step of the impact each ball just bounced off
+                now = blast - steps
+                ready = np.minimum(now + cooldown, 1) if sweep else np.ones(now.size)
+                self._fly(bx, by, bvx, bvy, (ready - now) * dt)
+
+            struck = bx[:0].astype(np.intp)
+            if sweep:
+                # Sweep the rest of the step along the chord of the parabola
+                span = (1 - ready) * dt
+                move_x = bvx * span
+                move_y = (bvy + gravity * span / 2) * span
+                board_y = by - layout.top_row_y
+                toi, pin_x, pin_y = self._time_of_impact(bx, board_y, move_x, move_y)
+                struck = np.flatnonzero(np.isfinite(toi))
+
+                if struck.size:
+                    toi = toi[struck]
+                    pin_x = pin_x[struck]
+                    pin_y = pin_y[struck]
+                    elapsed, normal_x, normal_y = self._impact(
+                        bx[struck] - pin_x, board_y[struck] - pin_y, bvx[struck], bvy[struck],
+                        toi * span[struck], span[struck]
+                    )
+
+                    # Ball position at the time of impact, on the pin's surface
+                    hx = pin_x + normal_x * radius_sum
+                    hy = pin_y + normal_y * radius_sum + layout.top_row_y
+                    impact_vy = bvy[struck] + gravity * elapsed
+                    impact_time = ready[struck] + elapsed / dt
+
+                bx += move_x
+                by += move_y
+                bvy += gravity * span
+
+                if struck.size:
+                    hit = struck if balls is None else balls[struck]
+                    draws = None
+                    if seeds is not None:
+                        # Numbered by the frame of the impact, the cooldown keeps them apart
+                        frame = np.floor((steps - launch_step[hit] + impact_time) * dt).astype(np.int64)
+                        draws = drop_random(seeds[hit], frame + 1)
+                    hvx, hvy = self._bounce(hit, hx, bvx[struck], impact_vy, normal_x, normal_y, draws)
+                    bx[struck] = hx
+                    by[struck] = hy
+                    bvx[struck] = hvx
+                    bvy[struck] = hvy
+                    blast[struck] = steps + impact_time
+
+            if balls is not None:
+                x[balls] = bx
+                y[balls] = by
+                vx[balls] = bvx
+                vy[balls] = bvy
+                last_collision[balls] = blast
+            if not struck.size:
+                break
+
+            # Balls that bounced go around again from the time of impact
+            balls = struck if balls is None else balls[struck]
+            bx, by, bvx, bvy, blast = x[balls], y[balls], vx[balls], vy[balls], last_collision[balls]
+
+        # Walls, reflecting the part of the path that went past the wall
+        left = x - radius < 0
+        right = ~left & (x + radius > width)
+        x[left] = radius + (radius - x[left]) * p.elasticity
+        x[right] = width - radius - (x[right] + radius - width) * p.elasticity
+        vx[left | right] *= -p.elasticity
+
+    def _fly(self, x, y, vx, vy, span):
+        """Move balls along their parabola for span frames, in place."""
+        gravity = self.physics.gravity
+        x += vx * span
+        y += (vy + gravity * span / 2) * span
+        vy += gravity * span
+
+    def _impact(self, dx, dy, vx, vy, elapsed, span):
+        """Refine impacts found along path chords to where the parabola meets the pin.
+
+        Args:
+            dx, dy: Offsets of the balls from the pins they hit, at the path start
+            vx, vy: Ball velocities at the path start
+            elapsed: Frames from the path start until the chord touches the pin
+            span: Frames covered by each path
+
+        Returns:
+            Tuple of (frames until the impact, normal at the impact)
+        """
+        gravity = self.physics.gravity
+        radius_sum = self.layout.ball_radius + self.layout.pin_radius
+
+        # A few Newton steps on |offset(t)| = radius_sum, starting from the
+        # chord, which is within gravity * span**2 / 8 of the parabola. Balls
+        # that overlap the pin from the start bounce right away.
+        for _ in range(2):
+            offset_x = dx + vx * elapsed
+            offset_y = dy + (vy + gravity * elapsed / 2) * elapsed
+            slope = offset_x * vx + offset_y * (vy + gravity * elapsed)
+            error = (offset_x * offset_x + offset_y * offset_y - radius_sum * radius_sum) / 2
+            approaching = (slope < 0) & (elapsed > 0)
+            elapsed = elapsed - np.where(approaching, error / np.where(approaching, slope, -1.0), 0.0)
+            np.minimum(np.maximum(elapsed, 0, out=elapsed), span, out=elapsed)
+
+        offset_x = dx + vx * elapsed
+        offset_y = dy + (vy + gravity * elapsed / 2) * elapsed
+        dist = np.sqrt(offset_x * offset_x + offset_y * offset_y)
+        touching = dist > 0
+        safe_dist = np.where(touching, dist, 1.0)
+        normal_x = np.where(touching, offset_x / safe_dist, 1.0)
+        normal_y = np.where(touching, offset_y / safe_dist, 0.0)
+        return elapsed, normal_x, normal_y
+
+    def _time_of_impact(self, x, board_y, move_x, move_y):
+        """Earliest time each straight path touches a pin.
+
+        Args:
+            x, board_y: Path starts, y relative to the top pin row
+            move_x, move_y: Path vectors
+
+        Returns:
+            Tuple of (time of impact as a fraction of the path, inf for paths
+            that touch no pin, x and board y of the pin hit)
+        """
+        layout = self.layout
+        spacing = layout.pin_spacing
+        radius_sum = layout.ball_radius + layout.pin_radius
+
+        # Rows and columns of the pins within reach of each path's bounding box.
+        # Ranges are clamped to pins on the board, and testing a pin twice or
+        # one out of reach is harmless as the test below is exact.
+        end_y = board_y + move_y
+        row_lo = np.ceil((np.minimum(board_y, end_y) - radius_sum) / spacing)
+        row_hi = np.floor((np.maximum(board_y, end_y) + radius_sum) / spacing)
+        np.maximum(row_lo, 0, out=row_lo)
+        np.minimum(row_hi, layout.pin_rows - 1, out=row_hi)
+        row_span = row_hi - row_lo
+        near = np.flatnonzero(row_span >= 0)
+
+        all_toi = np.full(x.size, np.inf)
+        all_pin_x = np.zeros(x.size)
+        all_pin_y = np.zeros(x.size)
+        if not near.size:
+            return all_toi, all_pin_x, all_pin_y
+
+        x = x[near]
+        board_y = board_y[near]
+        move_x = move_x[near]
+        move_y = move_y[near]
+        row_lo = row_lo[near]
+        row_hi = row_hi[near]
+        row_span = row_span[near]
+        toi = all_toi[near]
+        pin_x = pin_y = 0.0
+        x_lo = np.minimum(x, x + move_x) - radius_sum
+        x_hi = np.maximum(x, x + move_x) + radius_sum
+        length_sq = move_x * move_x + move_y * move_y
+        safe_length_sq = np.where(length_sq > 0, length_sq, 1.0)
+
+        for row_offset in range(int(row_span.max()) + 1):
+            row = np.minimum(row_lo + row_offset, row_hi)
+            np.maximum(row, 0, out=row)
+            row_index = row.astype(np.intp)
+            row_y = row * spacing
+            row_x = layout.row_start_x[row_index]  # X of the row's first pin
+            last_col = layout.row_pins[row_index] - 1
+            col_lo = np.ceil((x_lo - row_x) / spacing)
+            col_hi = np.floor((x_hi - row_x) / spacing)
+
+            for col_offset in range(max(int((col_hi - col_lo).max()), 0) + 1):
+                col = np.minimum(col_lo + col_offset, col_hi)
+                np.maximum(col, 0, out=col)
+                np.minimum(col, last_col, out=col)
+                px = row_x + col * spacing
+                rel_x = x - px
+                rel_y = board_y - row_y
+
+                # First t with |rel + t * move| = radius_sum, 0 if already overlapping
+                b = rel_x * move_x + rel_y * move_y
+                c = rel_x * rel_x + rel_y * rel_y - radius_sum * radius_sum
+                disc = b * b - length_sq * c
+                t = np.maximum((-b - np.sqrt(np.maximum(disc, 0))) / safe_length_sq, 0)
+                t = np.where((b < 0) & (disc >= 0), t, np.inf)
+                first = t < toi
+                np.minimum(toi, t, out=toi)
+                pin_x = np.where(first, px, pin_x)
+                pin_y = np.where(first, row_y, pin_y)
+
+        toi[toi > 1] = np.inf
+        all_toi[near] = toi
+        all_pin_x[near] = pin_x
+        all_pin_y[near] = pin_y
+        return all_toi, all_pin_x, all_pin_y
+
+    def _bounce(self, hit, hx, hvx, hvy, normal_x, normal_y, draws=None):
+        """Velocities of balls bouncing off pins at hx.
+
+        Args:
+            draws: Uniform random number of each bounce from the drop's
+                stream, or None to draw from rng
+
+        Returns:
+            Tuple of (vx, vy) after the bounce
+        """
+        p = self.physics
+        spacing = self.layout.pin_spacing
+
+        # Reflect, then apply elasticity and dampening
+        dot_product = hvx * normal_x + hvy * normal_y
+        hvx = (hvx - 2 * dot_product * normal_x) * (p.elasticity * 0.5)
+        hvy = (hvy - 2 * dot_product * normal_y) * p.elasticity
+
+        # Center bias after collision
+        center_x = self.layout.width / 2
+        hvx -= np.where(hx > center_x + spacing, p.center_push, 0.0)
+        hvx += np.where(hx < center_x - spacing, p.center_push, 0.0)
+        if draws is None:
+            draws = self.rng.random(hit.size)
+        nudge = draws < p.center_nudge_chance
+        hvx += np.where(nudge, np.where(hx < center_x, p.center_nudge, -p.center_nudge), 0.0)
+        return hvx, hvy
+
+
+class BallBatch:
+    def __init__(self, count, layout, physics=DEFAULT_PHYSICS, rng=None, start_x=None, start_y=20,
+                 max_in_flight=8192, max_steps=3600, dt=1.0, seeds=None):
+        """Create a batch of balls dropped from the same point.
+
+        At most ``max_in_flight`` balls are simulated at once. Whenever balls
+        land, waiting balls are dropped in their place, which keeps the working
+        arrays small enough to stay in cache.
+
+        Args:
+            count: Number of balls in the batch
+            layout: BoardLayout the balls are dropped on
+            physics: PhysicsParams to simulate with
+            rng: numpy Generator used for all random draws
+            start_x: Drop x position, defaults to the board center
+            start_y: Drop y position
+            max_in_flight: Number of balls stepped together
+            max_steps: Steps a ball may stay in flight before it is given up on
+            dt: Step length in 60 fps frames, see SimulationClock.dt
+            seeds: Optional per-drop seed of each ball, making every ball
+                reproducible on its own instead of drawing from rng
+        """
+        self.engine = BatchPhysics(layout, physics, rng, dt)
+        self.drop_seeds = None if seeds is None else np.asarray(seeds, dtype=np.uint64)
+        self.start_x = layout.width // 2 if start_x is None else start_x
+        self.start_y = start_y
+        self.max_in_flight = max_in_flight
+        self.max_steps = max_steps
+
+        self.bin_index = np.full(count, -1, dtype=np.int16)
+        self.launched = 0
+        self.steps = 0
+
+        # Arrays below only hold balls in flight, ids maps them to bin_index
+        self.ids = np.empty(0, dtype=np.int64)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.velocity_x = np.empty(0)
+        self.velocity_y = np.empty(0)
+        self.last_collision = np.empty(0)
+        self.launch_step = np.empty(0, dtype=np.int64)
+        self.seeds = None if seeds is None else np.empty(0, dtype=np.uint64)
+        self._launch()
+
+    @property
+    def done(self):
+        return not self.ids.size and self.launched == len(self.bin_index)
+
+    def _launch(self):
+        """Drop waiting balls until max_in_flight are in the air."""
+        n = min(self.max_in_flight - self.ids.size, len(self.bin_index) - self.launched)
+        if n <= 0:
+            return
+
+        new_ids = np.arange(self.launched, self.launched + n)
+        seeds = None
+        if self.drop_seeds is not None:
+            seeds = self.drop_seeds[new_ids]
+            self.seeds = np.concatenate((self.seeds, seeds))
+
+        self.ids = np.concatenate((self.ids, new_ids))
+        self.x = np.concatenate((self.x, np.full(n, self.start_x, dtype=np.float64)))
+        self.y = np.concatenate((self.y, np.full(n, self.start_y, dtype=np.float64)))
+        self.velocity_x = np.concatenate((self.velocity_x, self.engine.spawn_velocity(n, seeds)))
+        self.velocity_y = np.concatenate((self.velocity_y, np.zeros(n)))
+        self.last_collision = np.concatenate(
+            (self.last_collision, np.full(n, self.steps - self.engine.cooldown_steps))
+        )
+        self.launch_step = np.concatenate((self.launch_step, np.full(n, self.steps)))
+        self.launched += n
+
+    def step(self):
+        """Advance every ball in flight by one fixed step.
+
+        Returns:
+            Ids of the balls that landed in a bin during this step
+        """
+        landed, bins = self.engine.step(
+            self.x, self.y, self.velocity_x, self.velocity_y, self.last_collision, self.steps,
+            self.seeds, self.launch_step
+        )
+        self.steps += 1
+
+        expired = self.steps - self.launch_step >= self.max_steps
+        finished = landed | expired
+        if not finished.any():
+            return self.ids[:0]
+
+        landed_ids = self.ids[landed]
+        self.bin_index[landed_ids] = bins
+
+        # Drop finished balls from the working arrays and refill from the queue
+        flying = ~finished
+        self.ids = self.ids[flying]
+        self.x = self.x[flying]
+        self.y = self.y[flying]
+        self.velocity_x = self.velocity_x[flying]
+        self.velocity_y = self.velocity_y[flying]
+        self.last_collision = self.last_collision[flying]
+        self.launch_step = self.launch_step[flying]
+        if self.seeds is not None:
+            self.seeds = self.seeds[flying]
+        self._launch()
+        return landed_ids
+
+    def run(self):
+        """Step until every ball has landed or been given up on.
+
+        Returns:
+            Array of bin indices, -1 for balls that never landed
+        """
+        while not self.done:
+            self.step()
+        return self.bin_index
+
+
+def simulate_drops(pin_rows, count, width=800, pin_spacing=None, pins_start_y=50,
+                   physics=DEFAULT_PHYSICS, seed=None, max_in_flight=8192, max_steps=None,
+                   substeps=1):
+    """Drop many balls headlessly and return where each one landed.
+
+    Args:
+        pin_rows: Number of pin rows
+        count: Number of balls to drop
+        width: Board width in pixels
+        pin_spacing: Distance between pins, defaults to the game's spacing
+        pins_start_y: Y position the pin rows are measured from
+        physics: PhysicsParams to simulate with
+        seed: Seed for the random generator, or a numpy Generator
+        max_in_flight: Number of balls stepped together
+        max_steps: 60 fps frames to simulate before giving up on a ball, by
+            default the game's budget, see default_max_frames
+        substeps: Physics steps per 60 fps frame, below 1 for steps longer
+            than a frame, which needs physics.swept_collision to stay accurate
+
+    Returns:
+        int16 array of bin indices, -1 for balls that never landed
+    """
+    layout = get_board_layout(
+        pin_rows, pin_spacing, width, pins_start_y, physics.pin_radius, physics.ball_radius
+    )
+    if max_steps is None:
+        max_steps = default_max_frames(pin_rows)
+    batch = BallBatch(
+        count, layout, physics, np.random.default_rng(seed), max_in_flight=max_in_flight,
+        max_steps=round(max_steps * substeps), dt=1 / substeps
+    )
+    return batch.run()
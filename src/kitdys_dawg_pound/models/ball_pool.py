@@ -0,0 +1,145 @@
+"""
+Pool of reusable ball slots for multi-ball play.
+"""
+import numpy as np
+
+from kitdys_dawg_pound.models.ball_batch import BatchPhysics
+from kitdys_dawg_pound.models.drop_rng import drop_random_one, new_seeds
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+
+
+class BallPool:
+    def __init__(self, capacity, layout, physics=DEFAULT_PHYSICS, rng=None, dt=1.0, max_frames=600):
+        """Create a pool with a fixed number of ball slots.
+
+        Ball state lives in preallocated arrays, one entry per slot. Dropping a
+        ball claims a free slot and landing releases it again, so nothing is
+        allocated per ball while the game runs.
+
+        Every drop draws its random numbers from its own seed, so any drop
+        can be simulated again exactly from its seed alone.
+
+        Args:
+            capacity: Maximum number of balls in flight
+            layout: BoardLayout the balls are dropped on
+            physics: PhysicsParams to simulate with
+            rng: numpy Generator the drop seeds are drawn from
+            dt: Step length in 60 fps frames, see SimulationClock.dt
+            max_frames: 60 fps frames a ball may stay in flight before it is removed,
+                so a ball balanced on a pin does not hold its slot forever
+        """
+        self.engine = BatchPhysics(layout, physics, rng, dt)
+        self.capacity = capacity
+        self.max_steps = round(max_frames / dt)
+        self.steps = 0
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.velocity_x = np.zeros(capacity)
+        self.velocity_y = np.zeros(capacity)
+        self.last_collision = np.zeros(capacity)
+        self.launch_step = np.zeros(capacity, dtype=np.int64)
+        self.seeds = np.zeros(capacity, dtype=np.uint64)
+        self._new_seeds = []
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._free = list(range(capacity - 1, -1, -1))
+
+        # Balls that left the board in the latest update, with their bin or -1 if they expired
+        self.finished_slots = np.empty(0, dtype=np.intp)
+        self.finished_bins = np.empty(0, dtype=np.int16)
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def spawn(self, x, y, seed=None):
+        """Drop a ball at (x, y).
+
+        Args:
+            x, y: Drop position
+            seed: Seed of the drop's random numbers, a new one is drawn if None
+
+        Returns:
+            The slot used, or None if every slot is taken
+        """
+        if not self._free:
+            return None
+
+        slot = self._free.pop()
+        if seed is None:
+            # Seeds are drawn in blocks, one call per drop would cost more than the drop
+            if not self._new_seeds:
+                self._new_seeds = new_seeds(self.engine.rng, 256).tolist()
+            seed = self._new_seeds.pop()
+        self.seeds[slot] = seed
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.velocity_x[slot] = (drop_random_one(seed, 0) * 2 - 1) * self.engine.physics.spawn_velocity
+        self.velocity_y[slot] = 0
+        self.last_collision[slot] = self.steps - self.engine.cooldown_steps
+        self.launch_step[slot] = self.steps
+        self.alive[slot] = True
+        return slot
+
+    def clear(self):
+        """Remove every ball from the board."""
+        self.alive[:] = False
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+    def update(self):
+        """Advance all live balls by one fixed step in a single pass.
+
+        Returns:
+            int16 array with the bin index of each ball that landed
+        """
+        self.finished_slots = self.finished_slots[:0]
+        self.finished_bins = self.finished_bins[:0]
+        if len(self._free) == self.capacity:
+            return np.empty(0, dtype=np.int16)
+
+        slots = np.flatnonzero(self.alive)
+        launch_step = self.launch_step[slots]
+
+        x = self.x[slots]
+        y = self.y[slots]
+        vx = self.velocity_x[slots]
+        vy = self.velocity_y[slots]
+        last_collision = self.last_collision[slots]
+
+        self.prev_x[slots] = x
+        self.prev_y[slots] = y
+        landed, bins = self.engine.step(x, y, vx, vy, last_collision, self.steps, self.seeds[slots], launch_step)
+        self.steps += 1
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.velocity_x[slots] = vx
+        self.velocity_y[slots] = vy
+        self.last_collision[slots] = last_collision
+
+        # Release the slots of landed and expired balls for reuse
+        finished = landed | (self.steps - launch_step >= self.max_steps)
+        if finished.any():
+            finished_slots = slots[finished]
+            self.alive[finished_slots] = False
+            self._free.extend(finished_slots.tolist())
+
+            self.finished_slots = finished_slots
+            self.finished_bins = np.full(finished_slots.size, -1, dtype=np.int16)
+            self.finished_bins[landed[finished]] = bins
+        return bins
+
+    def positions(self, alpha=1.0):
+        """Positions of live balls between their last two physics states.
+
+        Args:
+            alpha: Interpolation factor from SimulationClock.alpha
+
+        Returns:
+            Tuple of (x, y) arrays
+        """
+        slots = np.flatnonzero(self.alive)
+        x = self.prev_x[slots] + (self.x[slots] - self.prev_x[slots]) * alpha
+        y = self.prev_y[slots] + (self.y[slots] - self.prev_y[slots]) * alpha
+        return x, y
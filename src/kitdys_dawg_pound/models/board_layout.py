@@ -0,0 +1,159 @@
+"""
+Board geometry shared by physics, rendering and the bins.
+"""
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+
+
+# Closest the game puts pins, leaving a ball room to fall between them. Boards
+# with too many rows to fit their width at this spacing grow wider instead.
+MIN_PIN_SPACING = 40
+
+# Frames a ball gets to land, DEFAULT_MAX_FRAMES plus FRAMES_PER_ROW for each
+# row. The slowest balls take about 40 frames a row on tall boards and up to
+# 100 on short ones, which the base covers.
+DEFAULT_MAX_FRAMES = 600
+FRAMES_PER_ROW = 60
+
+
+def default_pin_spacing(pin_rows, width):
+    """Pin spacing used by the game for a board of the given size."""
+    return max(MIN_PIN_SPACING, min(width // (pin_rows + 2), 50))
+
+
+def board_width(pin_rows, width=800):
+    """Width of the game's board for pin_rows, at least width and wider once the pins no longer fit."""
+    return max(width, (pin_rows + 2) * default_pin_spacing(pin_rows, width))
+
+
+def default_max_frames(pin_rows):
+    """Frames a ball may stay in flight on a board with pin_rows before it is given up on."""
+    return DEFAULT_MAX_FRAMES + FRAMES_PER_ROW * pin_rows
+
+
+@dataclass(frozen=True, eq=False)
+class BoardLayout:
+    """Pin and bin positions for one board configuration.
+
+    Pin rows start one spacing below ``pins_start_y`` and are staggered by half
+    a spacing: row ``r`` holds ``r + 3`` pins centered on the board, and the
+    bins sit between the pins of the bottom row. Arrays are read-only so a
+    layout can be shared freely, use ``get_board_layout`` to get one.
+    """
+    pin_rows: int
+    pin_spacing: int
+    width: int
+    pins_start_y: int
+    pin_radius: int
+    ball_radius: int
+    pin_x: np.ndarray  # Pin centers in board order, row by row from the top
+    pin_y: np.ndarray
+    row_start_x: np.ndarray  # X of the first pin in each row
+    row_pins: np.ndarray  # Number of pins in each row
+    bin_edges: np.ndarray  # num_bins + 1 x positions separating the bins
+    bin_centers: np.ndarray
+    bin_top: int  # Y of the top of the bins
+    floor_y: int  # A ball below this has landed in a bin
+
+    @property
+    def num_bins(self):
+        return self.pin_rows + 1
+
+    @property
+    def top_row_y(self):
+        """Y of the top pin row."""
+        return self.pins_start_y + self.pin_spacing
+
+    @property
+    def height(self):
+        """Height of the board down to below the bins."""
+        return self.bin_top + 2 * self.pin_spacing
+
+    def pins_in(self, left, top, right, bottom):
+        """Indices of the pins centered inside a rectangle.
+
+        Found from the row and column ranges the rectangle covers, so the
+        cost depends on how many pins it holds and not on the board size.
+        """
+        spacing = self.pin_spacing
+        first_row = max(0, math.ceil((top - self.top_row_y) / spacing))
+        last_row = min(self.pin_rows - 1, math.floor((bottom - self.top_row_y) / spacing))
+        if first_row > last_row:
+            return np.empty(0, dtype=np.intp)
+
+        rows = np.arange(first_row, last_row + 1)
+        row_start_x = self.row_start_x[rows]
+        first_col = np.maximum(np.ceil((left - row_start_x) / spacing), 0).astype(np.intp)
+        last_col = np.minimum(np.floor((right - row_start_x) / spacing), self.row_pins[rows] - 1).astype(np.intp)
+        counts = np.maximum(last_col - first_col + 1, 0)
+
+        # Concatenated index ranges, pins are stored row by row and row r holds r + 3
+        starts = rows * (rows + 5) // 2 + first_col
+        return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    def pins(self):
+        """Pin centers as a list of (x, y) tuples in board order."""
+        return list(zip(self.pin_x.tolist(), self.pin_y.tolist()))
+
+    def bin_index(self, x):
+        """Bin below x position(s), clamped to the outermost bins."""
+        index = np.floor((x - self.bin_edges[0]) / self.pin_spacing).astype(np.int16)
+        return np.minimum(np.maximum(index, 0), self.num_bins - 1)
+
+
+@lru_cache(maxsize=32)
+def get_board_layout(pin_rows, pin_spacing=None, width=800, pins_start_y=50,
+                     pin_radius=DEFAULT_PHYSICS.pin_radius, ball_radius=DEFAULT_PHYSICS.ball_radius):
+    """Board layout for a configuration, built once and shared.
+
+    Args:
+        pin_rows: Number of pin rows
+        pin_spacing: Distance between pins, defaults to the game's spacing
+        width: Board width in pixels
+        pins_start_y: Y position the pin rows are measured from
+        pin_radius: Radius of each pin
+        ball_radius: Radius of the balls dropped on the board
+
+    Returns:
+        BoardLayout
+    """
+    if pin_spacing is None:
+        pin_spacing = default_pin_spacing(pin_rows, width)
+
+    rows = np.arange(pin_rows)
+    row_pins = rows + 3
+    row_offset = np.where(rows % 2 == 1, pin_spacing // 2, 0)
+    row_start_x = (width // 2 - ((rows + 1) // 2 + 1) * pin_spacing + row_offset).astype(np.float64)
+    pin_row = np.repeat(rows, row_pins)
+    pin_col = np.arange(pin_row.size) - np.repeat(np.cumsum(row_pins) - row_pins, row_pins)
+    pin_x = row_start_x[pin_row] + pin_col * pin_spacing
+    pin_y = (pins_start_y + (pin_row + 1) * pin_spacing).astype(np.float64)
+
+    num_bins = pin_rows + 1
+    bin_edges = width / 2 + (np.arange(num_bins + 1) - num_bins / 2) * pin_spacing
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+
+    for array in (pin_x, pin_y, row_start_x, row_pins, bin_edges, bin_centers):
+        array.setflags(write=False)
+
+    return BoardLayout(
+        pin_rows=pin_rows,
+        pin_spacing=pin_spacing,
+        width=width,
+        pins_start_y=pins_start_y,
+        pin_radius=pin_radius,
+        ball_radius=ball_radius,
+        pin_x=pin_x,
+        pin_y=pin_y,
+        row_start_x=row_start_x,
+        row_pins=row_pins,
+        bin_edges=bin_edges,
+        bin_centers=bin_centers,
+        bin_top=pins_start_y + pin_rows * pin_spacing + pin_spacing // 2,
+        floor_y=pins_start_y + pin_rows * pin_spacing + 100,
+    )
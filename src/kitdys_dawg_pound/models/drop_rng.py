@@ -0,0 +1,64 @@
+"""
+Counter-based random numbers for reproducible drops.
+
+Every drop has its own 64-bit seed, and each random draw it makes is a pure
+function of (seed, counter) computed with the splitmix64 mixer. A drop gets
+the same draws whichever other balls were in flight with it, so it can be
+simulated again on its own.
+
+Counter 0 is the spawn velocity, and a draw during the physics step taken
+``age`` steps after the drop uses counter ``age + 1``.
+"""
+import numpy as np
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+_MASK = (1 << 64) - 1
+
+_GOLDEN_U64 = np.uint64(_GOLDEN)
+_MIX_1_U64 = np.uint64(_MIX_1)
+_MIX_2_U64 = np.uint64(_MIX_2)
+_SHIFTS = tuple(np.uint64(shift) for shift in (30, 27, 31, 11))
+
+
+def splitmix64(values):
+    """splitmix64 output for each uint64 state in values.
+
+    Arithmetic wraps modulo 2**64, which NumPy does silently for arrays (not
+    for scalars, hence ndmin=1).
+    """
+    return _mix(np.array(values, dtype=np.uint64, ndmin=1))
+
+
+def _mix(z):
+    s30, s27, s31, _ = _SHIFTS
+    z = z + _GOLDEN_U64
+    z = (z ^ (z >> s30)) * _MIX_1_U64
+    z = (z ^ (z >> s27)) * _MIX_2_U64
+    return z ^ (z >> s31)
+
+
+def drop_random(seeds, counters):
+    """Uniform floats in [0, 1), one per (seed, counter) pair.
+
+    Args:
+        seeds: uint64 seeds of the drops
+        counters: Draw number within each drop's stream
+    """
+    state = np.array(counters, dtype=np.uint64, ndmin=1) * _GOLDEN_U64 + np.asarray(seeds, dtype=np.uint64)
+    return (_mix(state) >> _SHIFTS[3]) * (1.0 / (1 << 53))
+
+
+def drop_random_one(seed, counter):
+    """drop_random for a single draw, in plain Python as it is much faster for one value."""
+    z = (int(seed) + counter * _GOLDEN + _GOLDEN) & _MASK
+    z = ((z ^ (z >> 30)) * _MIX_1) & _MASK
+    z = ((z ^ (z >> 27)) * _MIX_2) & _MASK
+    z ^= z >> 31
+    return (z >> 11) * (1.0 / (1 << 53))
+
+
+def new_seeds(rng, count):
+    """Draw count fresh drop seeds from a numpy Generator."""
+    return rng.integers(0, 2**64, count, dtype=np.uint64)
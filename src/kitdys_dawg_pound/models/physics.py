@@ -0,0 +1,25 @@
+"""
+Physics constants shared by the interactive ball and the batch simulator.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PhysicsParams:
+    """Tuning values for ball movement and pin collisions.
+
+    Velocities are in pixels per frame at 60 fps.
+    """
+    gravity: float = 0.2
+    elasticity: float = 0.65
+    ball_radius: int = 10
+    pin_radius: int = 5
+    spawn_velocity: float = 0.15  # Initial horizontal speed is uniform in +/- this
+    collision_cooldown: int = 3  # Frames between pin collisions (50 ms at 60 fps)
+    center_push: float = 0.05  # Applied when more than one pin spacing off center
+    center_nudge: float = 0.02
+    center_nudge_chance: float = 0.7
+    swept_collision: bool = False  # Sweep each step's path against the pins instead of testing overlap at its end
+
+
+DEFAULT_PHYSICS = PhysicsParams()
@@ -1,30 +1,66 @@
-import pygame
 import random
 import math
 
+from kitdys_dawg_pound.models.drop_rng import drop_random_one
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+from kitdys_dawg_pound.models.plinko_pins import get_pin_index
+from kitdys_dawg_pound.models.simulation_clock import cooldown_steps
+
+
 class Ball:
-    def __init__(self, x, y, radius=10):
+    __slots__ = (
+        "x", "y", "physics", "radius", "velocity_x", "velocity_y", "gravity", "elasticity",
+        "active", "color", "steps", "last_collision_step", "cooldown_steps", "prev_x", "prev_y", "seed",
+    )
+
+    def __init__(self, x, y, radius=None, physics=DEFAULT_PHYSICS, seed=None):
         self.x = x
         self.y = y
-        self.radius = radius
-        self.velocity_x = random.uniform(-0.15, 0.15)
+        self.physics = physics
+        self.radius = physics.ball_radius if radius is None else radius
+
+        # Random draws come from the drop's own stream, see drop_rng
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.velocity_x = (drop_random_one(self.seed, 0) * 2 - 1) * physics.spawn_velocity
         self.velocity_y = 0
-        self.gravity = 0.2
-        self.elasticity = 0.65
+        self.gravity = physics.gravity
+        self.elasticity = physics.elasticity
         self.active = True
         self.color = (112, 41, 99)
-        self.last_collision_time = 0
 
-    def update(self, pin_rows, width, pin_spacing, pins_start_y):
+        # Simulated time in physics steps, used for the collision cooldown
+        self.steps = 0
+        self.last_collision_step = None
+        self.cooldown_steps = physics.collision_cooldown
+
+        # Position before the latest step, for interpolated drawing
+        self.prev_x = x
+        self.prev_y = y
+
+    def update(self, layout, dt=1.0):
+        """Advance the ball by one fixed physics step.
+
+        Args:
+            layout: BoardLayout of the board the ball is dropped on
+            dt: Step length in 60 fps frames, see SimulationClock.dt
+
+        Returns:
+            Index of the bin the ball landed in, or None while it is falling
+        """
         if not self.active:
             return None
 
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.cooldown_steps = cooldown_steps(self.physics.collision_cooldown, dt)
+        width = layout.width
+
         # Apply gravity
-        self.velocity_y += self.gravity
+        self.velocity_y += self.gravity * dt
 
         # Update position
-        self.x += self.velocity_x
-        self.y += self.velocity_y
+        self.x += self.velocity_x * dt
+        self.y += self.velocity_y * dt
 
         # Wall collisions
         if self.x - self.radius < 0:
@@ -34,36 +70,20 @@ class Ball:
             self.x = width - self.radius
             self.velocity_x = -self.velocity_x * self.elasticity
 
-        # Check pin collisions using the same logic from create_pins function
-        pin_radius = 5
-        offset = pin_spacing // 2
+        # Check pin collisions against the pins near the ball only
+        pin_radius = layout.pin_radius
+        pin_index = get_pin_index(layout, self.radius + pin_radius)
 
-        # This exactly matches the create_pins logic
-        for row in range(1, pin_rows + 1):
-            row_offset = offset if row % 2 == 0 else 0
-            for col in range(-(row//2) - 1, (row-1)//2 + 2):
-                pin_x = width // 2 + col * pin_spacing + row_offset
-                pin_y = row * pin_spacing + pins_start_y
+        for pin_x, pin_y in pin_index.nearby(self.x, self.y):
+            if self.check_pin_collision(pin_x, pin_y, pin_radius, width, layout.pin_spacing):
+                pass  # Continue checking other pins
 
-                if self.check_pin_collision(pin_x, pin_y, pin_radius, width, pin_spacing):
-                    pass  # Continue checking other pins
+        self.steps += 1
 
         # Check if ball reached bottom (bins)
-        bin_bottom = pins_start_y + pin_rows * pin_spacing + 100
-        if self.y > bin_bottom:
-            # Calculate which bin the ball landed in
-            num_bins = pin_rows + 1
-
-            # Calculate bin index based on the same pin spacing logic
-            bottom_row_width = num_bins * pin_spacing
-            bottom_row_start_x = (width - bottom_row_width) / 2
-            bin_index = int((self.x - bottom_row_start_x) / pin_spacing)
-
-            # Ensure bin_index is within valid range
-            bin_index = max(0, min(bin_index, num_bins - 1))
-
+        if self.y > layout.floor_y:
             self.active = False
-            return bin_index
+            return int(layout.bin_index(self.x))
 
         return None
 
@@ -76,25 +96,23 @@ class Ball:
 
         # Collision detected
         if dist_sq < radius_sum * radius_sum:
-            # Prevent multiple collisions in same frame
-            current_time = pygame.time.get_ticks()
-            if current_time - self.last_collision_time < 50:  # 50ms cooldown
+            # Prevent multiple collisions in same step, cooldown is in simulated time
+            if (self.last_collision_step is not None
+                    and self.steps - self.last_collision_step < self.cooldown_steps):
                 return False
 
-            self.last_collision_time = current_time
+            self.last_collision_step = self.steps
 
-            # Calculate overlap and angle
-            overlap = radius_sum - math.sqrt(dist_sq)
-            angle = math.atan2(dy, dx)
+            # Normal vector from the pin to the ball, straight right for a ball
+            # right on the pin's center. Computed like BatchPhysics does, so a
+            # seeded drop lands in the same bin in both.
+            dist = math.sqrt(dist_sq)
+            normal_x, normal_y = (dx / dist, dy / dist) if dist > 0 else (1.0, 0.0)
 
             # Move ball outside pin to prevent sticking/tunneling
-            displacement = overlap + 0.5  # Extra 0.5 pixels to ensure separation
-            self.x += math.cos(angle) * displacement
-            self.y += math.sin(angle) * displacement
-
-            # Calculate normal vector for reflection
-            normal_x = math.cos(angle)
-            normal_y = math.sin(angle)
+            displacement = radius_sum - dist + 0.5  # Extra 0.5 pixels to ensure separation
+            self.x += normal_x * displacement
+            self.y += normal_y * displacement
 
             # Calculate dot product and reflection
             dot_product = self.velocity_x * normal_x + self.velocity_y * normal_y
@@ -108,18 +126,14 @@ class Ball:
             # Add center bias after collision
             center_x = width / 2
             if self.x > center_x + pin_spacing:
-                self.velocity_x -= 0.05  # Push left if on the right side
+                self.velocity_x -= self.physics.center_push  # Push left if on the right side
             elif self.x < center_x - pin_spacing:
-                self.velocity_x += 0.05  # Push right if on the left side
+                self.velocity_x += self.physics.center_push  # Push right if on the left side
 
             # Random bias toward center (70% chance)
-            if random.random() < 0.7:
+            if drop_random_one(self.seed, self.steps + 1) < self.physics.center_nudge_chance:
                 bias_direction = 1 if self.x < center_x else -1
-                self.velocity_x += bias_direction * 0.02
+                self.velocity_x += bias_direction * self.physics.center_nudge
 
             return True
         return False
-
-    def draw(self, screen):
-        if self.active:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
\ No newline at end of file
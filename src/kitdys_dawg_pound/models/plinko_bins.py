@@ -1,8 +1,6 @@
-import pygame
+import numpy as np
 
-from kitdys_dawg_pound.ui.drawing import draw_rounded_rect
-from kitdys_dawg_pound.ui.gradient import create_plinko_gradients
-from kitdys_dawg_pound.ui.text import create_bin_texts
+from kitdys_dawg_pound.models.colors import create_plinko_gradients
 
 
 class PlinkoBins:
@@ -15,7 +13,7 @@ class PlinkoBins:
         """
         self.pin_rows = pin_rows
         self.bin_texts = bin_texts
-        self.hit_bins = []
+        self.hit = np.zeros(pin_rows + 1, dtype=bool)  # Bins hit since they were last drawn
         self.rgb_gradient, self.dark_rgb_gradient = create_plinko_gradients(pin_rows)
 
         # Store indices of recent bins
@@ -23,127 +21,14 @@ class PlinkoBins:
         self.recent_bins = bin_texts[recent_start:recent_start+4]
         self.recent_bin_colors = self.rgb_gradient[recent_start:recent_start+4]
 
-    def draw_bins(self, width, screen, ratio, pin_spacing, pins_start_y, pins_start_x=0):
-        """Draw all bins on the screen."""
-        bin_width = (pin_spacing * 0.8)
-        click_offset = 4 * ratio
-
-        # Calculate bottom row pin positions
-        bottom_row = self.pin_rows - 1
-        num_pins_in_bottom_row = bottom_row + 1
-        row_width = num_pins_in_bottom_row * pin_spacing
-        row_start_x = (width - row_width) // 2
-        base_y = self.pin_rows * pin_spacing + pins_start_y + pin_spacing // 2
-
-        # Determine maximum possible font size first
-        test_font = pygame.font.SysFont("Gill Sans", 36)
-        max_text_width = 0
-        for text in self.bin_texts:
-            text_width = test_font.size(text)[0]
-            max_text_width = max(max_text_width, text_width)
-
-        # Calculate scaling factor based on actual text width
-        scaling_factor = bin_width / (max_text_width + 10)  # Add padding
-        font_size = int(36 * scaling_factor * ratio)
-
-        # Ensure minimum and maximum size
-        font_size = max(10, min(36, font_size))
-
-        # Create font object instead of pre-rendered surfaces
-        font = pygame.font.SysFont("Gill Sans", font_size)
-
-        # Position and draw each bin
-        for bin_index in range(self.pin_rows + 1):
-            bin_x = row_start_x + (bin_index * pin_spacing) - (pin_spacing / 2)
-            self._draw_single_bin(
-                screen, bin_index, base_y, bin_x, bin_width,
-                pin_spacing, font, click_offset, ratio
-            )
-
-    def _draw_single_bin(
-            self,
-            screen,
-            bin_index,
-            base_y,
-            bin_x,
-            bin_width,
-            pin_spacing,
-            font,
-            click_offset,
-            ratio,
-    ):
-        animate = bin_index in self.hit_bins
-        base_x = bin_x - bin_width // 2
-        corner_radius = int(4 * ratio) + (ratio > 1)
-        bin_height = bin_width  # Square bin
-
-        # Set orange color for bins
-        bin_color = (128, 0, 128)  # Orange
-        shadow_color = (116, 1, 113)  # Darker orange for shadow
-
-        if animate:
-            light_rect = pygame.Rect(base_x, base_y + click_offset, bin_width, bin_height)
-            # Draw orange rectangle
-            draw_rounded_rect(screen, light_rect, bin_color, corner_radius)
-
-            # Wrap and draw black text
-            self._draw_wrapped_text(
-                screen, font, self.bin_texts[bin_index],
-                (195, 177, 225),  # Black text
-                base_x, base_y + click_offset, bin_width, bin_height
-            )
-
-            # Remove from hit bins after drawing
-            self.hit_bins = list(filter(lambda x: x != bin_index, self.hit_bins))
-        else:
-            dark_rect = pygame.Rect(base_x, base_y + click_offset, bin_width, bin_height)
-            light_rect = pygame.Rect(base_x, base_y, bin_width, bin_height)
-
-            # Draw shadow and orange rectangle
-            draw_rounded_rect(screen, dark_rect, shadow_color, corner_radius)
-            draw_rounded_rect(screen, light_rect, bin_color, corner_radius)
-
-            # Wrap and draw black text
-            self._draw_wrapped_text(
-                screen, font, self.bin_texts[bin_index],
-                (195, 177, 225),  # Black text
-                base_x, base_y, bin_width, bin_height
-            )
-
-    def _draw_wrapped_text(self, screen, font, text, color, x, y, width, height):
-        """Draw text wrapped within the given rectangle."""
-        words = text.split(' ')
-        lines = []
-        current_line = []
-
-        # Create wrapped lines
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            test_width = font.size(test_line)[0]
-
-            if test_width <= width - 10:  # 5px padding on each side
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    lines.append(word)
-
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        # Render text lines
-        line_height = font.get_linesize()
-        total_height = line_height * len(lines)
-        start_y = y + (height - total_height) // 2
-
-        for i, line in enumerate(lines):
-            text_surface = font.render(line, True, color)
-            text_rect = text_surface.get_rect(
-                center=(x + width // 2, start_y + i * line_height + line_height // 2)
-            )
-            screen.blit(text_surface, text_rect)
+    @property
+    def hit_bins(self):
+        """Indices of the bins hit since they were last drawn, in bin order."""
+        return np.flatnonzero(self.hit)
+
+    def clear_hit(self, bin_index):
+        """Forget a hit once the bin has been drawn pressed."""
+        self.hit[bin_index] = False
 
     def register_hit(self, bin_index):
         """Register a bin as being hit by a ball.
@@ -151,8 +36,15 @@ class PlinkoBins:
         Args:
             bin_index: Index of the bin that was hit
         """
-        if bin_index not in self.hit_bins:
-            self.hit_bins.append(bin_index)
+        self.hit[bin_index] = True
+
+    def register_hits(self, bin_indices):
+        """Register every bin hit by a batch of balls.
+
+        Args:
+            bin_indices: Array or iterable of bin indices, one per landed ball
+        """
+        self.hit[np.asarray(bin_indices, dtype=np.intp)] = True
 
     def update_pin_rows(self, new_rows):
         """Update the number of pin rows and adjust bin texts accordingly.
@@ -161,6 +53,7 @@ class PlinkoBins:
             new_rows: New number of pin rows
         """
         self.pin_rows = new_rows
+        self.hit = np.zeros(new_rows + 1, dtype=bool)
 
         # Ensure we have the correct number of bin texts (should be pin_rows + 1)
         needed_bins = new_rows + 1
@@ -1,15 +1,39 @@
 """
 Create the pins for the plinko board.
 """
+from functools import lru_cache
+
+from kitdys_dawg_pound.models.board_layout import BoardLayout, get_board_layout
+
 
 def create_pins(ratio: float, pin_radius: int, pin_rows: int, pin_start: int, width: int) -> list:
-    pins = []
-    pin_spacing = int(40 * ratio)
-    offset = pin_spacing // 2
-    for row in range(1, pin_rows + 1):
-        row_offset = offset if row % 2 == 0 else 0
-        for col in range(-(row//2) - 1, (row -1) //2 + 2):
-            x = width // 2 + col * pin_spacing + row_offset
-            y = row * pin_spacing + pin_start
-            pins.append((x,y))
-    return pins
+    layout = get_board_layout(pin_rows, int(40 * ratio), width, pin_start, pin_radius)
+    return layout.pins()
+
+
+class PinIndex:
+    """Grid of buckets holding the pins within reach of each cell.
+
+    Looking up the bucket for a point returns every pin whose center is within
+    ``reach`` of it (plus a few near misses), in board order.
+    """
+
+    def __init__(self, pins, reach, cell_size):
+        self.cell_size = cell_size
+        self._buckets = {}
+
+        for pin in pins:
+            x, y = pin
+            for cell_y in range(int((y - reach) // cell_size), int((y + reach) // cell_size) + 1):
+                for cell_x in range(int((x - reach) // cell_size), int((x + reach) // cell_size) + 1):
+                    self._buckets.setdefault((cell_x, cell_y), []).append(pin)
+
+    def nearby(self, x, y):
+        """Pins that a ball centered at (x, y) could be touching."""
+        return self._buckets.get((int(x // self.cell_size), int(y // self.cell_size)), ())
+
+
+@lru_cache(maxsize=32)
+def get_pin_index(layout: BoardLayout, reach: float) -> PinIndex:
+    """Pin index for a board, built once per board layout."""
+    return PinIndex(layout.pins(), reach, layout.pin_spacing)
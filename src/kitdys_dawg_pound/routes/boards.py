@@ -0,0 +1,72 @@
+"""
+Board configuration and drop endpoints.
+"""
+import numpy as np
+from flask import Blueprint, current_app, jsonify, request
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+MIN_ROWS = 2
+MAX_ROWS = 15
+MAX_DROPS = 10_000
+MAX_TRAJECTORY_DROPS = 50
+
+boards_bp = Blueprint("boards", __name__, url_prefix="/boards")
+
+
+class DropRequest(BaseModel):
+    count: int = Field(1, ge=1, le=MAX_DROPS)
+    trajectories: bool = False
+    stride: int = Field(2, ge=1, le=60)  # Steps between recorded trajectory points
+
+    @model_validator(mode="after")
+    def check_trajectory_count(self):
+        if self.trajectories and self.count > MAX_TRAJECTORY_DROPS:
+            raise ValueError(f"trajectories are limited to {MAX_TRAJECTORY_DROPS} balls per request")
+        return self
+
+
+def _drop_service():
+    return current_app.extensions["drop_service"]
+
+
+def _check_rows(pin_rows):
+    if not MIN_ROWS <= pin_rows <= MAX_ROWS:
+        return jsonify(error=f"pin_rows must be between {MIN_ROWS} and {MAX_ROWS}"), 400
+    return None
+
+
+@boards_bp.get("/<int:pin_rows>")
+def get_board(pin_rows):
+    """Pin and bin geometry of a board, for drawing it."""
+    error = _check_rows(pin_rows)
+    if error:
+        return error
+    return jsonify(_drop_service().board_config(pin_rows))
+
+
+@boards_bp.post("/<int:pin_rows>/drops")
+def create_drops(pin_rows):
+    """Drop balls on a board and return where they landed."""
+    error = _check_rows(pin_rows)
+    if error:
+        return error
+
+    try:
+        drop_request = DropRequest.model_validate(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify(error="invalid request", details=e.errors(include_url=False, include_context=False)), 400
+
+    service = _drop_service()
+    body = {"pin_rows": pin_rows, "count": drop_request.count}
+    if drop_request.trajectories:
+        bins, paths = service.drop_with_trajectories(pin_rows, drop_request.count, drop_request.stride)
+        body["trajectories"] = paths
+    else:
+        bins = service.drop(pin_rows, drop_request.count)
+
+    # A ball that never landed is in bins as -1 and counted as lost instead of in a bin
+    landed = bins[bins >= 0]
+    body["bins"] = bins.tolist()
+    body["histogram"] = np.bincount(landed, minlength=pin_rows + 1).tolist()
+    body["lost"] = int(bins.size - landed.size)
+    return jsonify(body), 201
@@ -0,0 +1,396 @@
+"""
+Fairness audit of the board's landing odds.
+
+The physics nudges balls toward the center of the board, so landings are not
+binomial. An audit simulates every board size as the game plays it, measures
+how far each one is from a fair binomial board, and checks it against a saved
+baseline so a change to the physics that moves the odds is caught before it
+ships. Balls the game gives up on never pay out, so an audit also flags
+boards that lose more of them than DEFAULT_MAX_LOST_SHARE.
+
+Audits use a fixed seed by default. With the same seed, drops and shard size
+an unchanged physics model reproduces the baseline exactly, and any change
+shows up as a difference in counts, which the tests below then judge.
+
+The tests are implemented here with NumPy and math, so the audit needs no
+SciPy. Plotting imports matplotlib only when a report is written.
+"""
+import dataclasses
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from kitdys_dawg_pound.models.board_layout import board_width, default_max_frames
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+from kitdys_dawg_pound.services.odds import Z_95
+from kitdys_dawg_pound.services.simulation import simulate_parallel
+
+# Board sizes the game offers online
+AUDIT_ROWS = range(2, 16)
+
+# Drops per board, enough to resolve a shift of about half a percentage point in a bin
+AUDIT_DROPS = 50_000
+
+# Fixed so that repeated audits of the same physics give the same counts
+AUDIT_SEED = 0
+
+# Small shards so the drops of one board are spread over all workers
+AUDIT_SHARD_SIZE = 10_000
+
+# p-value below which a board counts as shifted from its baseline
+DEFAULT_ALPHA = 0.001
+
+# Share of the drops a board may lose before the audit flags it, one in a hundred
+DEFAULT_MAX_LOST_SHARE = 0.01
+
+# Bump when the baseline file layout changes
+BASELINE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class TestResult:
+    """Outcome of a goodness of fit test."""
+    statistic: float
+    p_value: float
+    dof: int = None  # Degrees of freedom of a chi-square test
+
+
+@dataclass(frozen=True, eq=False)
+class BoardAudit:
+    """Simulated landings of one board and how they compare."""
+    pin_rows: int
+    counts: np.ndarray  # Balls landed in each bin
+    lost: int  # Balls that never reached a bin
+    binomial_chi2: TestResult
+    binomial_ks: TestResult
+    baseline_counts: np.ndarray = None  # Counts of the baseline, None without one
+    baseline_lost: int = None
+    baseline_chi2: TestResult = None
+    baseline_ks: TestResult = None
+
+    @property
+    def drops(self):
+        return int(self.counts.sum()) + self.lost
+
+    @property
+    def lost_share(self):
+        """Share of the drops that never reached a bin."""
+        return self.lost / max(self.drops, 1)
+
+    @property
+    def probabilities(self):
+        """Share of the landed balls in each bin."""
+        return self.counts / max(int(self.counts.sum()), 1)
+
+    @property
+    def binomial(self):
+        return binomial_probabilities(self.pin_rows)
+
+    @property
+    def baseline_probabilities(self):
+        if self.baseline_counts is None:
+            return None
+        return self.baseline_counts / max(int(self.baseline_counts.sum()), 1)
+
+    @property
+    def binomial_distance(self):
+        """Total variation distance from a fair board, the most odds that move between bins."""
+        return float(np.abs(self.probabilities - self.binomial).sum() / 2)
+
+    def confidence_intervals(self, z=Z_95):
+        """Wilson score interval of each bin's probability, as (low, high) arrays."""
+        return wilson_interval(self.counts, int(self.counts.sum()), z)
+
+    def shifted(self, alpha=DEFAULT_ALPHA):
+        """Whether the landings differ from the baseline at significance alpha."""
+        if self.baseline_chi2 is None:
+            return False
+        return self.baseline_chi2.p_value < alpha or self.baseline_ks.p_value < alpha
+
+    def losing(self, max_lost_share=DEFAULT_MAX_LOST_SHARE):
+        """Whether more than max_lost_share of the drops never reached a bin."""
+        return self.lost_share > max_lost_share
+
+
+def binomial_probabilities(pin_rows):
+    """Landing odds of a fair board, each pin sending the ball left or right with equal chance."""
+    return np.array([math.comb(pin_rows, k) for k in range(pin_rows + 1)]) / 2.0 ** pin_rows
+
+
+def wilson_interval(counts, total, z=Z_95):
+    """Wilson score interval of binomial proportions counts / total."""
+    counts = np.asarray(counts, dtype=float)
+    if total == 0:
+        return np.zeros_like(counts), np.ones_like(counts)
+    p = counts / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+
+def chi_square_fit(counts, probabilities, min_expected=5):
+    """Pearson's chi-square test of counts against expected probabilities.
+
+    Neighbouring bins are pooled until each group expects at least
+    min_expected balls, as the test is unreliable for rarer outcomes.
+    """
+    counts = np.asarray(counts, dtype=float)
+    observed, expected = _pool_small_bins(counts, counts.sum() * np.asarray(probabilities), min_expected)
+    if len(observed) < 2:
+        return TestResult(0.0, 1.0, 0)
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    dof = len(observed) - 1
+    return TestResult(statistic, _chi2_sf(statistic, dof), dof)
+
+
+def chi_square_homogeneity(counts_a, counts_b):
+    """Chi-square test of whether two sets of counts come from the same distribution."""
+    table = np.array([counts_a, counts_b], dtype=float)
+    table = table[:, table.sum(axis=0) > 0]
+    if table.shape[1] < 2 or not table.sum(axis=1).all():
+        return TestResult(0.0, 1.0, 0)
+    expected = table.sum(axis=1, keepdims=True) * table.sum(axis=0) / table.sum()
+    statistic = float(((table - expected) ** 2 / expected).sum())
+    dof = table.shape[1] - 1
+    return TestResult(statistic, _chi2_sf(statistic, dof), dof)
+
+
+def ks_fit(counts, probabilities):
+    """Kolmogorov-Smirnov test of counts against expected probabilities.
+
+    Bins are discrete, which makes the asymptotic p-value conservative.
+    """
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum()
+    if not total:
+        return TestResult(0.0, 1.0)
+    statistic = float(np.abs(np.cumsum(counts) / total - np.cumsum(probabilities)).max())
+    return TestResult(statistic, _kolmogorov_sf(statistic * math.sqrt(total)))
+
+
+def ks_two_sample(counts_a, counts_b):
+    """Two-sample Kolmogorov-Smirnov test of two sets of counts, conservative like ks_fit."""
+    counts_a = np.asarray(counts_a, dtype=float)
+    counts_b = np.asarray(counts_b, dtype=float)
+    total_a, total_b = counts_a.sum(), counts_b.sum()
+    if not total_a or not total_b:
+        return TestResult(0.0, 1.0)
+    statistic = float(np.abs(np.cumsum(counts_a) / total_a - np.cumsum(counts_b) / total_b).max())
+    return TestResult(statistic, _kolmogorov_sf(statistic * math.sqrt(total_a * total_b / (total_a + total_b))))
+
+
+def audit_board(pin_rows, counts, lost, baseline=None):
+    """Compare the landings of one board with a fair board and with its baseline.
+
+    Args:
+        pin_rows: Number of pin rows
+        counts: Balls landed in each bin
+        lost: Balls that never reached a bin
+        baseline: (counts, lost) of the baseline run, or None
+
+    Returns:
+        BoardAudit
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    binomial = binomial_probabilities(pin_rows)
+    baseline_fields = {}
+    if baseline is not None:
+        baseline_counts, baseline_lost = np.asarray(baseline[0], dtype=np.int64), int(baseline[1])
+        baseline_fields = {
+            "baseline_counts": baseline_counts,
+            "baseline_lost": baseline_lost,
+            # Lost balls are a category of their own, a board that starts losing balls has shifted too
+            "baseline_chi2": chi_square_homogeneity(np.append(counts, lost), np.append(baseline_counts, baseline_lost)),
+            "baseline_ks": ks_two_sample(counts, baseline_counts),
+        }
+    return BoardAudit(
+        pin_rows, counts, int(lost), chi_square_fit(counts, binomial), ks_fit(counts, binomial), **baseline_fields
+    )
+
+
+def run_audit(rows=AUDIT_ROWS, drops=AUDIT_DROPS, seed=AUDIT_SEED, baseline=None, workers=None,
+              shard_size=AUDIT_SHARD_SIZE, physics=DEFAULT_PHYSICS, progress=None):
+    """Simulate each board size and audit its landings.
+
+    Each board is simulated at the width and frame budget the game gives it,
+    so its lost balls are the ones players would lose.
+
+    Args:
+        rows: Pin row counts to audit
+        drops: Balls dropped on each board
+        seed: Seed of every board's run, see SimulationResult.seed
+        baseline: Baseline from load_baseline, or None
+        workers: Worker processes, defaults to the number of CPUs
+        shard_size: Drops per shard
+        physics: PhysicsParams to simulate with
+        progress: Called with each BoardAudit as it is done
+
+    Returns:
+        List of BoardAudit, one per board
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    audits = []
+    try:
+        for pin_rows in rows:
+            result = simulate_parallel(
+                pin_rows, drops, seed, workers, shard_size, executor, width=board_width(pin_rows), physics=physics,
+                max_steps=default_max_frames(pin_rows)
+            )
+            saved = baseline.get(pin_rows) if baseline else None
+            audit = audit_board(pin_rows, result.counts, result.lost, saved)
+            audits.append(audit)
+            if progress:
+                progress(audit)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return audits
+
+
+def save_baseline(path, audits, seed=AUDIT_SEED, physics=DEFAULT_PHYSICS):
+    """Save the landings of an audit as the baseline later audits are checked against."""
+    baseline = {
+        "version": BASELINE_VERSION,
+        "seed": seed,
+        "physics": dataclasses.asdict(physics),
+        "boards": {
+            str(audit.pin_rows): {"counts": audit.counts.tolist(), "lost": audit.lost} for audit in audits
+        },
+    }
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(baseline, f, indent=1)
+    os.replace(temp_path, path)
+
+
+def load_baseline(path):
+    """Read a baseline saved by save_baseline.
+
+    Returns:
+        Dict of pin rows to (counts, lost)
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} audit baseline")
+    return {int(rows): (board["counts"], board["lost"]) for rows, board in baseline["boards"].items()}
+
+
+def write_report(path, audits, alpha=DEFAULT_ALPHA, title="Board fairness audit",
+                 max_lost_share=DEFAULT_MAX_LOST_SHARE):
+    """Plot each board's odds against a fair board and the baseline.
+
+    Each panel shows the simulated odds with their 95% intervals, the
+    binomial odds as a line and the baseline's as crosses. Panels of boards
+    that shifted from the baseline or lose too many balls are titled in red.
+    The format follows the extension of path, e.g. .png or .pdf.
+    """
+    from matplotlib.figure import Figure
+
+    columns = min(4, len(audits))
+    figure_rows = -(-len(audits) // columns)
+    figure = Figure(figsize=(4 * columns, 3 * figure_rows + 0.6), layout="constrained")
+    figure.suptitle(title)
+    axes = figure.subplots(figure_rows, columns, squeeze=False).ravel()
+
+    for ax, audit in zip(axes, audits):
+        bins = np.arange(audit.pin_rows + 1)
+        probabilities = audit.probabilities
+        low, high = audit.confidence_intervals()
+        ax.bar(bins, probabilities, color="#9f2b68", alpha=0.6, label="simulated")
+        ax.errorbar(bins, probabilities, yerr=(probabilities - low, high - probabilities), fmt="none",
+                    ecolor="black", elinewidth=0.8, capsize=2)
+        ax.plot(bins, audit.binomial, color="black", marker=".", linewidth=1, label="binomial")
+        if audit.baseline_counts is not None:
+            ax.plot(bins, audit.baseline_probabilities, linestyle="none", marker="x", color="tab:orange",
+                    label="baseline")
+
+        lines = [
+            f"{audit.pin_rows} rows, {audit.drops:,} drops, {audit.lost_share:.2%} lost"
+            + (" (too many)" if audit.losing(max_lost_share) else ""),
+            f"vs binomial: TV {audit.binomial_distance:.3f}, chi2 p {audit.binomial_chi2.p_value:.2g}",
+        ]
+        if audit.baseline_chi2 is not None:
+            lines.append(f"vs baseline: chi2 p {audit.baseline_chi2.p_value:.2g}, KS p {audit.baseline_ks.p_value:.2g}")
+        flagged = audit.shifted(alpha) or audit.losing(max_lost_share)
+        ax.set_title("\n".join(lines), fontsize=8, color="red" if flagged else "black")
+        ax.set_xticks(bins if audit.pin_rows <= 8 else bins[::2])
+        ax.tick_params(labelsize=7)
+
+    for ax in axes[len(audits):]:
+        ax.set_visible(False)
+    axes[0].legend(fontsize=7)
+    figure.savefig(path)
+
+
+def _pool_small_bins(observed, expected, min_expected):
+    pooled_observed, pooled_expected = [], []
+    group_observed = group_expected = 0.0
+    for count, expectation in zip(observed, expected):
+        group_observed += count
+        group_expected += expectation
+        if group_expected >= min_expected:
+            pooled_observed.append(group_observed)
+            pooled_expected.append(group_expected)
+            group_observed = group_expected = 0.0
+    # A short group left at the end joins the one before it
+    if group_expected and pooled_expected:
+        pooled_observed[-1] += group_observed
+        pooled_expected[-1] += group_expected
+    elif group_expected:
+        pooled_observed.append(group_observed)
+        pooled_expected.append(group_expected)
+    return np.array(pooled_observed), np.array(pooled_expected)
+
+
+def _chi2_sf(statistic, dof):
+    """Chance of a chi-square value of at least statistic, the regularized upper incomplete gamma Q(dof/2, x/2)."""
+    if statistic <= 0:
+        return 1.0
+    a, x = dof / 2, statistic / 2
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        # Series for the lower function P, which converges quickly here
+        term = total = 1 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if term < total * 1e-15:
+                break
+        return max(0.0, 1 - total * math.exp(log_prefactor))
+
+    # Continued fraction for Q, evaluated with the modified Lentz method
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    result = d
+    for i in range(1, 1000):
+        a_i = -i * (i - a)
+        b += 2
+        d = a_i * d + b
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = b + a_i / c
+        c = c if abs(c) > tiny else tiny
+        result *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return min(1.0, result * math.exp(log_prefactor))
+
+
+def _kolmogorov_sf(x):
+    """Chance of the Kolmogorov distribution exceeding x."""
+    if x <= 0:
+        return 1.0
+    if x < 1.18:
+        y = math.exp(-math.pi ** 2 / (8 * x * x))
+        return max(0.0, 1 - math.sqrt(2 * math.pi) / x * (y + y ** 9 + y ** 25 + y ** 49))
+    return min(1.0, 2 * sum((-1) ** (j - 1) * math.exp(-2 * j * j * x * x) for j in range(1, 6)))
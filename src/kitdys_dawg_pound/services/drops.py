@@ -0,0 +1,142 @@
+"""
+Server-side ball drops on the headless physics core.
+
+Outcomes are simulated here rather than in the client, so they can be trusted.
+Plain drops are served from a per-board reservoir of balls that were already
+simulated in one large batch. Every ball is still simulated individually and
+handed out only once, but the cost of a batch is shared by many requests.
+
+Balls get the game's frame budget to land. One that never does is handed out
+like any other, as bin -1, rather than left out of the reservoir, which would
+quietly shift the odds toward the balls that land quickly.
+"""
+import dataclasses
+import threading
+
+import numpy as np
+
+from kitdys_dawg_pound.models.ball_batch import BallBatch
+from kitdys_dawg_pound.models.board_layout import default_max_frames, get_board_layout
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+
+# Height balls are dropped from, the same as in the game
+DROP_Y = 20
+
+
+class DropService:
+    def __init__(self, physics=DEFAULT_PHYSICS, width=800, pins_start_y=50, refill_size=50_000,
+                 max_steps=None):
+        """Create a drop service for boards of one width.
+
+        Args:
+            physics: PhysicsParams to simulate with
+            width: Board width in pixels
+            pins_start_y: Y position the pin rows are measured from
+            refill_size: Balls simulated at a time to refill a board's reservoir
+            max_steps: Steps a ball may stay in flight before it is given up
+                on, by default the game's budget for the board
+        """
+        self.physics = physics
+        self.width = width
+        self.pins_start_y = pins_start_y
+        self.refill_size = refill_size
+        self.max_steps = max_steps
+
+        self._rng = np.random.default_rng()
+        self._reservoirs = {}
+        # Guards the rng and the board locks, each board's lock guards its reservoir
+        self._lock = threading.Lock()
+        self._board_locks = {}
+
+    def layout(self, pin_rows):
+        return get_board_layout(
+            pin_rows, width=self.width, pins_start_y=self.pins_start_y,
+            pin_radius=self.physics.pin_radius, ball_radius=self.physics.ball_radius
+        )
+
+    def board_config(self, pin_rows):
+        """Geometry and physics of a board, for clients to render it."""
+        layout = self.layout(pin_rows)
+        return {
+            "pin_rows": pin_rows,
+            "width": layout.width,
+            "pin_spacing": layout.pin_spacing,
+            "pins_start_y": layout.pins_start_y,
+            "pin_radius": layout.pin_radius,
+            "ball_radius": layout.ball_radius,
+            "pins": [[x, y] for x, y in layout.pins()],
+            "bin_edges": layout.bin_edges.tolist(),
+            "bin_centers": layout.bin_centers.tolist(),
+            "bin_top": layout.bin_top,
+            "floor_y": layout.floor_y,
+            "drop_x": layout.width // 2,
+            "drop_y": DROP_Y,
+            "physics": dataclasses.asdict(self.physics),
+        }
+
+    def drop(self, pin_rows, count):
+        """Land count balls on a board.
+
+        A reservoir is refilled holding only its board's lock, so the
+        simulation of a board's first batch does not hold up other boards.
+
+        Returns:
+            int16 array with the bin each ball landed in, -1 for a ball that
+            never landed
+        """
+        with self._board_lock(pin_rows):
+            reservoir = self._reservoirs.get(pin_rows, np.empty(0, dtype=np.int16))
+            while reservoir.size < count:
+                reservoir = np.concatenate((reservoir, self._simulate(pin_rows, max(self.refill_size, count))))
+
+            self._reservoirs[pin_rows] = reservoir[count:]
+            return reservoir[:count]
+
+    def drop_with_trajectories(self, pin_rows, count, stride=2):
+        """Land count balls and record the path of each one.
+
+        These balls are simulated for the request itself, which costs a full
+        simulation per call, so keep count small.
+
+        Args:
+            pin_rows: Number of pin rows
+            count: Number of balls to drop
+            stride: Record a position every this many steps
+
+        Returns:
+            Tuple of (bins, list with one [[x, y], ...] path per ball), the
+            bin is -1 for a ball that never landed
+        """
+        layout = self.layout(pin_rows)
+        batch = BallBatch(
+            count, layout, self.physics, self._new_rng(), start_y=DROP_Y, max_steps=self._max_steps(pin_rows)
+        )
+        paths = [[] for _ in range(count)]
+
+        while not batch.done:
+            if batch.steps % stride == 0:
+                for ball_id, x, y in zip(batch.ids.tolist(), batch.x.round(1).tolist(), batch.y.round(1).tolist()):
+                    paths[ball_id].append([x, y])
+            batch.step()
+
+        return batch.bin_index, paths
+
+    def _simulate(self, pin_rows, count):
+        """Simulate count balls, -1 for the ones that never land."""
+        batch = BallBatch(
+            count, self.layout(pin_rows), self.physics, self._new_rng(), start_y=DROP_Y,
+            max_steps=self._max_steps(pin_rows)
+        )
+        return batch.run()
+
+    def _max_steps(self, pin_rows):
+        return default_max_frames(pin_rows) if self.max_steps is None else self.max_steps
+
+    def _board_lock(self, pin_rows):
+        with self._lock:
+            return self._board_locks.setdefault(pin_rows, threading.Lock())
+
+    def _new_rng(self):
+        """Generator of its own for one simulation, a Generator is not safe to share between threads."""
+        with self._lock:
+            return np.random.default_rng(self._rng.integers(2**63))
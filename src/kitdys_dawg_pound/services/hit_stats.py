@@ -0,0 +1,165 @@
+"""
+Persistent bin hit counters, one memory-mapped file per board configuration.
+
+Each file has a fixed layout (see ``_file_dtype``): a header, then total hits,
+first and last hit times per bin, and a ring of per-day hit counts covering
+the last ``days`` days (UTC). The game updates the counters in place through
+the memory map, so recording a hit is a few array increments with nothing to
+serialize, and the OS writes the pages back in its own time.
+
+A file has a single writer. Reporting processes open it read-only and read
+the same pages without any locking; a reader can be an update or two behind,
+and a day's row is marked invalid while it is being recycled.
+"""
+import datetime
+import os
+import time
+
+import numpy as np
+
+MAGIC = b"KDPHITS1"
+VERSION = 1
+
+# Days of per-day counts kept, older days are overwritten
+DEFAULT_DAYS = 366
+
+DEFAULT_STATS_DIR = os.environ.get(
+    "KITDYS_STATS_DIR", os.path.join(os.path.expanduser("~"), ".local", "share", "kitdys_dawg_pound", "stats")
+)
+
+_HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("num_bins", "<u4"), ("days", "<u4"), ("pad", "<u4")])
+
+# Day index of a ring row that holds no day
+_NO_DAY = -1
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _file_dtype(num_bins, days):
+    return np.dtype([
+        ("header", _HEADER_DTYPE),
+        ("totals", "<u8", (num_bins,)),
+        ("first_hit", "<f8", (num_bins,)),  # Unix time, 0 before the first hit
+        ("last_hit", "<f8", (num_bins,)),
+        ("day", "<i4", (days,)),  # Days since the epoch held by each ring row
+        ("daily", "<u4", (days, num_bins)),
+    ])
+
+
+def stats_path(config, directory=None):
+    """Counters file of a DropConfig."""
+    return os.path.join(directory or DEFAULT_STATS_DIR, f"{config.key.hex()}.hits")
+
+
+class HitCounters:
+    def __init__(self, path, num_bins=None, days=DEFAULT_DAYS, readonly=False):
+        """Open a counters file, creating it if it does not exist yet.
+
+        Args:
+            path: File to map
+            num_bins: Number of bins, needed to create the file
+            days: Days of per-day counts kept, used when creating the file
+            readonly: Map read-only, for reporting next to a running game
+
+        Raises:
+            ValueError: If the file is not a counters file or has a different number of bins
+        """
+        self.path = path
+        self.readonly = readonly
+
+        if os.path.exists(path):
+            header = np.fromfile(path, dtype=_HEADER_DTYPE, count=1)
+            if not header.size or header["magic"][0] != MAGIC or header["version"][0] != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} hit counters file")
+            if num_bins is not None and header["num_bins"][0] != num_bins:
+                raise ValueError(f"{path} counts {header['num_bins'][0]} bins, not {num_bins}")
+            num_bins, days = int(header["num_bins"][0]), int(header["days"][0])
+            mode = "r" if readonly else "r+"
+        else:
+            if readonly or num_bins is None:
+                raise FileNotFoundError(path)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            mode = "w+"
+
+        self.num_bins = num_bins
+        self.days = days
+        self._map = np.memmap(path, dtype=_file_dtype(num_bins, days), mode=mode, shape=())
+
+        if mode == "w+":
+            self._map["header"] = (MAGIC, VERSION, num_bins, days, 0)
+            self._map["day"] = _NO_DAY
+            self._map.flush()
+
+        self.totals = self._map["totals"]
+        self.first_hit = self._map["first_hit"]
+        self.last_hit = self._map["last_hit"]
+        self._day = self._map["day"]
+        self._daily = self._map["daily"]
+
+    @classmethod
+    def for_config(cls, config, directory=None, readonly=False):
+        """Counters of a DropConfig, kept under directory."""
+        return cls(stats_path(config, directory), config.pin_rows + 1, readonly=readonly)
+
+    def record(self, bin_index, now=None):
+        """Count one ball landing in bin_index."""
+        now = time.time() if now is None else now
+        row = self._day_row(now)
+        self.totals[bin_index] += 1
+        self._daily[row, bin_index] += 1
+        if not self.first_hit[bin_index]:
+            self.first_hit[bin_index] = now
+        self.last_hit[bin_index] = now
+
+    def record_many(self, bin_indices, now=None):
+        """Count a batch of balls that landed at the same time."""
+        now = time.time() if now is None else now
+        counts = np.bincount(bin_indices, minlength=self.num_bins)
+        hit = counts > 0
+        row = self._day_row(now)
+        self.totals += counts.astype(np.uint64)
+        self._daily[row] += counts.astype(np.uint32)
+        self.first_hit[hit & (self.first_hit == 0)] = now
+        self.last_hit[hit] = now
+
+    def daily_totals(self, start=None, end=None):
+        """Per-day hit counts, oldest first.
+
+        Args:
+            start: First date to include, datetime.date
+            end: Last date to include
+
+        Returns:
+            List of (date, counts array) for the days that have hits
+        """
+        days = self._day.copy()
+        rollup = []
+        for row in np.argsort(days):
+            day = int(days[row])
+            if day == _NO_DAY:
+                continue
+            date = datetime.date.fromordinal(_EPOCH_ORDINAL + day)
+            if (start is None or date >= start) and (end is None or date <= end):
+                rollup.append((date, self._daily[row].astype(np.int64)))
+        return rollup
+
+    def flush(self):
+        """Write changed pages to disk now instead of when the OS gets to it."""
+        if not self.readonly:
+            self._map.flush()
+
+    def close(self):
+        self.flush()
+        del self.totals, self.first_hit, self.last_hit, self._day, self._daily
+        self._map = None
+
+    def _day_row(self, now):
+        day = int(now // 86400)
+        row = day % self.days
+        if self._day[row] != day:
+            # Recycle the row of the day that was `days` days ago
+            self._day[row] = _NO_DAY
+            self._daily[row] = 0
+            self._day[row] = day
+        return row
+
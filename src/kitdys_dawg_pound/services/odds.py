@@ -0,0 +1,208 @@
+"""
+Landing odds per bin, estimated by batch simulation and cached on disk.
+
+Tables are keyed by a hash of everything that changes the outcome (board
+geometry, physics parameters and step length), so a cached table is reused
+exactly when it still describes the board being played.
+"""
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+
+from kitdys_dawg_pound.models.ball_batch import simulate_drops
+from kitdys_dawg_pound.models.board_layout import default_max_frames, default_pin_spacing
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+
+# Bump when a physics change makes existing tables wrong
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "KITDYS_ODDS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "kitdys_dawg_pound", "odds")
+)
+
+# z score of the confidence level the tolerance applies to (95%)
+Z_95 = 1.96
+
+
+@dataclass(frozen=True, eq=False)
+class OddsTable:
+    """Landing counts for one board configuration."""
+    key: str
+    pin_rows: int
+    counts: np.ndarray  # Balls landed in each bin
+    lost: int  # Balls that never reached a bin
+
+    @property
+    def drops(self):
+        return int(self.counts.sum()) + self.lost
+
+    @property
+    def probabilities(self):
+        """Chance of a dropped ball landing in each bin."""
+        return self.counts / max(self.drops, 1)
+
+    def half_width(self, z=Z_95):
+        """Widest confidence interval half-width over all bins."""
+        if not self.drops:
+            return math.inf
+        p = self.probabilities
+        return float(z * np.sqrt(p * (1 - p) / self.drops).max())
+
+
+def config_key(pin_rows, physics=DEFAULT_PHYSICS, width=800, pin_spacing=None, pins_start_y=50, substeps=1,
+               max_frames=None):
+    """Hash identifying the outcome distribution of a board configuration."""
+    if pin_spacing is None:
+        pin_spacing = default_pin_spacing(pin_rows, width)
+    if max_frames is None:
+        max_frames = default_max_frames(pin_rows)
+
+    config = {
+        "version": CACHE_VERSION,
+        "pin_rows": pin_rows,
+        "width": width,
+        "pin_spacing": pin_spacing,
+        "pins_start_y": pins_start_y,
+        "substeps": substeps,
+        "max_frames": max_frames,
+        "physics": dataclasses.asdict(physics),
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def load_odds(key, cache_dir=None):
+    """Read a cached table, or None if there is none for key."""
+    path = os.path.join(cache_dir or DEFAULT_CACHE_DIR, f"{key}.npz")
+    try:
+        with np.load(path) as data:
+            return OddsTable(key, int(data["pin_rows"]), data["counts"], int(data["lost"]))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_odds(table, cache_dir=None):
+    """Write a table to the cache, replacing any older one atomically."""
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{table.key}.npz")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, pin_rows=table.pin_rows, counts=table.counts, lost=table.lost)
+    os.replace(tmp_path, path)
+
+
+def get_odds(pin_rows, physics=DEFAULT_PHYSICS, width=800, pin_spacing=None, pins_start_y=50, substeps=1,
+             max_frames=None, tolerance=0.005, batch_size=50_000, max_drops=5_000_000, cache_dir=None):
+    """Landing odds for a board, from the cache or by simulating drops.
+
+    Drops are simulated in batches until every bin's 95% confidence interval
+    is within +/- tolerance, then the table is cached. A cached table that is
+    not precise enough is extended rather than recomputed.
+
+    Args:
+        pin_rows: Number of pin rows
+        physics: PhysicsParams the board is played with
+        width: Board width in pixels
+        pin_spacing: Distance between pins, defaults to the game's spacing
+        pins_start_y: Y position the pin rows are measured from
+        substeps: Physics steps per 60 fps frame
+        max_frames: 60 fps frames before a ball is given up on, defaults to
+            the game's budget (see default_max_frames). Balls given up on
+            count as lost, so this has to match the game for the odds to.
+        tolerance: Required confidence interval half-width, as a probability
+        batch_size: Drops simulated between precision checks
+        max_drops: Stop sampling here even if the tolerance is not reached
+        cache_dir: Directory of cached tables, defaults to DEFAULT_CACHE_DIR
+
+    Returns:
+        OddsTable
+    """
+    if max_frames is None:
+        max_frames = default_max_frames(pin_rows)
+    key = config_key(pin_rows, physics, width, pin_spacing, pins_start_y, substeps, max_frames)
+    table = load_odds(key, cache_dir)
+    if table is not None and (table.half_width() <= tolerance or table.drops >= max_drops):
+        return table
+
+    counts = table.counts.astype(np.int64) if table else np.zeros(pin_rows + 1, dtype=np.int64)
+    lost = table.lost if table else 0
+
+    while True:
+        # Seeded by configuration and progress, so the same table is always produced
+        drops = int(counts.sum()) + lost
+        rng = np.random.default_rng([int(key, 16), drops])
+        bins = simulate_drops(pin_rows, batch_size, width, pin_spacing, pins_start_y, physics, rng,
+                              max_steps=max_frames, substeps=substeps)
+
+        landed = bins[bins >= 0]
+        counts += np.bincount(landed, minlength=pin_rows + 1)
+        lost += int(bins.size - landed.size)
+        table = OddsTable(key, pin_rows, counts, lost)
+        if table.half_width() <= tolerance or table.drops >= max_drops:
+            break
+
+    save_odds(table, cache_dir)
+    return table
+
+
+class OddsLoader:
+    """Fetches odds tables on a worker thread so the game keeps running.
+
+    ``request`` returns None until the table for a board is ready, then
+    returns the table on every later call. Keyword arguments given to it
+    override the loader's own for that board, such as the width of a board
+    that grows with its rows. Odds are only informational, so a
+    failed computation also gives None instead of stopping the game, and
+    ``pending`` tells the two apart.
+
+    The worker is a daemon thread rather than an executor's, whose threads
+    the interpreter joins on exit, so quitting never waits for a table.
+    """
+
+    def __init__(self, **odds_kwargs):
+        self.odds_kwargs = odds_kwargs
+        self._futures = {}
+        self._jobs = queue.SimpleQueue()
+        threading.Thread(target=self._work, name="odds", daemon=True).start()
+
+    def request(self, pin_rows, **board_kwargs):
+        future = self._future(pin_rows, board_kwargs)
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def pending(self, pin_rows, **board_kwargs):
+        """Whether the table for a board is still being computed."""
+        return not self._future(pin_rows, board_kwargs).done()
+
+    def shutdown(self):
+        """Drop the waiting requests, a table being simulated is abandoned with its thread."""
+        for future in self._futures.values():
+            future.cancel()
+        self._jobs.put(None)
+
+    def _future(self, pin_rows, board_kwargs):
+        board = (pin_rows, *sorted(board_kwargs.items()))
+        future = self._futures.get(board)
+        if future is None:
+            future = self._futures[board] = Future()
+            self._jobs.put((future, pin_rows, {**self.odds_kwargs, **board_kwargs}))
+        return future
+
+    def _work(self):
+        while (job := self._jobs.get()) is not None:
+            future, pin_rows, odds_kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(get_odds(pin_rows, **odds_kwargs))
+            except Exception as error:
+                future.set_exception(error)
@@ -0,0 +1,253 @@
+"""
+Append-only replay log of ball drops.
+
+Every drop is logged with the seed of its random stream (see drop_rng), which
+is all it takes to simulate it again exactly. The log is a binary file: an
+8-byte magic and a version, then records that each start with a type byte.
+
+- CONFIG records hold a board configuration as JSON, keyed by its hash.
+- DROP records are fixed size: config hash, seed, drop time, steps in flight
+  and the bin the ball landed in (-1 if it never landed).
+
+Records are only ever appended, so a log can be written by several sessions
+in turn, and a record cut short by a crash is skipped when reading.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import struct
+import time
+from dataclasses import dataclass
+from functools import cached_property
+
+from kitdys_dawg_pound.models.ball_batch import BallBatch
+from kitdys_dawg_pound.models.ball_pool import BallPool
+from kitdys_dawg_pound.models.board_layout import default_pin_spacing, get_board_layout
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS, PhysicsParams
+from kitdys_dawg_pound.models.simulation_clock import SimulationClock
+
+MAGIC = b"KDPDROPS"
+VERSION = 1
+
+DEFAULT_REPLAY_PATH = os.environ.get(
+    "KITDYS_REPLAY_LOG",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "kitdys_dawg_pound", "drops.replay"),
+)
+
+RECORD_CONFIG = 1
+RECORD_DROP = 2
+
+_HEADER = struct.Struct("<8sH")
+_CONFIG_HEADER = struct.Struct("<B8sI")  # Type, config hash, JSON length
+_DROP = struct.Struct("<B8sQdIh")  # Type, config hash, seed, drop time, steps in flight, bin
+
+
+@dataclass(frozen=True)
+class DropConfig:
+    """Everything besides the seed that decides where a drop lands."""
+    pin_rows: int
+    width: int = 800
+    pin_spacing: int = None  # Defaults to the game's spacing for pin_rows
+    pins_start_y: int = 50
+    drop_x: float = None  # Defaults to the board center
+    drop_y: float = 20
+    substeps: int = 1
+    max_frames: int = 600  # 60 fps frames before a ball is given up on
+    physics: PhysicsParams = DEFAULT_PHYSICS
+
+    def __post_init__(self):
+        if self.pin_spacing is None:
+            object.__setattr__(self, "pin_spacing", default_pin_spacing(self.pin_rows, self.width))
+        if self.drop_x is None:
+            object.__setattr__(self, "drop_x", self.width // 2)
+
+    @cached_property
+    def key(self):
+        """8-byte hash identifying the configuration in a log."""
+        return hashlib.sha256(self.to_json().encode()).digest()[:8]
+
+    def layout(self):
+        return get_board_layout(
+            self.pin_rows, self.pin_spacing, self.width, self.pins_start_y,
+            self.physics.pin_radius, self.physics.ball_radius
+        )
+
+    def to_json(self):
+        return json.dumps(dataclasses.asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text):
+        fields = json.loads(text)
+        return cls(**{**fields, "physics": PhysicsParams(**fields["physics"])})
+
+
+@dataclass(frozen=True)
+class DropRecord:
+    config: DropConfig
+    seed: int
+    dropped_at: float  # Unix time of the drop
+    steps: int  # Physics steps from the drop until the ball landed or was given up on
+    bin_index: int  # -1 if the ball never landed
+
+
+class ReplayWriter:
+    """Appends drops to a replay log.
+
+    Records are packed into a memory buffer and written out once it holds
+    ``flush_bytes`` or ``flush_interval`` seconds have passed, so logging a
+    drop costs about as much as packing a struct.
+    """
+
+    def __init__(self, path=None, flush_bytes=4096, flush_interval=1.0):
+        self.path = path or DEFAULT_REPLAY_PATH
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.config = None
+        self.last_drop = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._buffer = bytearray()
+        self._written_configs = set()
+        self._last_flush = time.monotonic()
+        if self._file.tell() == 0:
+            self._buffer += _HEADER.pack(MAGIC, VERSION)
+
+    def set_config(self, config):
+        """Log the configuration of the drops that follow."""
+        self.config = config
+        if config.key not in self._written_configs:
+            config_json = config.to_json().encode()
+            self._buffer += _CONFIG_HEADER.pack(RECORD_CONFIG, config.key, len(config_json))
+            self._buffer += config_json
+            self._written_configs.add(config.key)
+
+    def record(self, seed, dropped_at, steps, bin_index):
+        """Log one finished drop on the current configuration."""
+        drop = DropRecord(self.config, int(seed), float(dropped_at), int(steps), int(bin_index))
+        self._buffer += _DROP.pack(RECORD_DROP, self.config.key, drop.seed, drop.dropped_at, drop.steps, drop.bin_index)
+        self.last_drop = drop
+
+        if len(self._buffer) >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def record_many(self, seeds, dropped_at, steps, bins):
+        """Log several finished drops, arguments are parallel sequences."""
+        for drop in zip(seeds, dropped_at, steps, bins):
+            self.record(*drop)
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_replay(path=None):
+    """Yield the DropRecords of a replay log in the order they were logged.
+
+    Raises:
+        ValueError: If the file is not a replay log this version can read
+    """
+    with open(path or DEFAULT_REPLAY_PATH, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        return
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} replay log")
+
+    configs = {}
+    offset = _HEADER.size
+    while offset < len(data):
+        record_type = data[offset]
+        if record_type == RECORD_CONFIG:
+            if offset + _CONFIG_HEADER.size > len(data):
+                return
+            _, key, length = _CONFIG_HEADER.unpack_from(data, offset)
+            offset += _CONFIG_HEADER.size
+            if offset + length > len(data):
+                return
+            configs[key] = DropConfig.from_json(data[offset:offset + length].decode())
+            offset += length
+        elif record_type == RECORD_DROP:
+            if offset + _DROP.size > len(data):
+                return
+            _, key, seed, dropped_at, steps, bin_index = _DROP.unpack_from(data, offset)
+            offset += _DROP.size
+            yield DropRecord(configs[key], seed, dropped_at, steps, bin_index)
+        else:
+            raise ValueError(f"unknown record type {record_type} at byte {offset}")
+
+
+def resimulate(record):
+    """Simulate a logged drop again without rendering it.
+
+    Returns:
+        Tuple of (bin index or -1, steps in flight), equal to the logged
+        values for a drop replayed with the same code
+    """
+    config = record.config
+    batch = BallBatch(
+        1, config.layout(), config.physics, start_x=config.drop_x, start_y=config.drop_y,
+        max_steps=config.max_frames * config.substeps, dt=1 / config.substeps, seeds=[record.seed]
+    )
+    batch.run()
+    return int(batch.bin_index[0]), batch.steps
+
+
+class DropPlayback:
+    """A logged drop played back in real time, at any speed.
+
+    The ball is simulated again step by step on its own BallPool, so it can
+    be drawn like any other ball.
+    """
+
+    def __init__(self, record, speed=1.0):
+        config = record.config
+        self.record = record
+        self.clock = SimulationClock(config.substeps, speed)
+        self.pool = BallPool(1, config.layout(), config.physics, dt=self.clock.dt, max_frames=config.max_frames)
+        self.pool.spawn(config.drop_x, config.drop_y, seed=record.seed)
+        self.bin_index = None
+
+    @property
+    def done(self):
+        return self.bin_index is not None
+
+    def advance(self, frame_ms):
+        """Advance by frame_ms of wall time.
+
+        Returns:
+            The bin index (-1 if the ball never landed) once the ball has
+            finished, otherwise None
+        """
+        for _ in range(self.clock.advance(frame_ms)):
+            self._step()
+            if self.done:
+                break
+        return self.bin_index
+
+    def skip_to_end(self):
+        """Finish the drop at once, without any frames in between."""
+        while not self.done:
+            self._step()
+        return self.bin_index
+
+    def _step(self):
+        self.pool.update()
+        if self.pool.finished_bins.size:
+            self.bin_index = int(self.pool.finished_bins[0])
@@ -0,0 +1,156 @@
+"""
+Drop simulation sharded across worker processes.
+
+A run of N drops is cut into fixed-size shards. Each shard draws from its own
+random stream, spawned from the run's seed with NumPy's SeedSequence, and
+returns a bin histogram that is summed into the result. The shards of a run
+depend only on its seed and shard size, so a seeded run gives the same
+histogram however many workers it is spread over.
+
+iter_shards streams the shards of a run one at a time instead, from any shard
+on, so a run of any length can be written out, stopped and resumed in
+constant memory.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+import numpy as np
+
+from kitdys_dawg_pound.models.ball_batch import simulate_drops
+from kitdys_dawg_pound.models.physics import DEFAULT_PHYSICS
+
+# Drops per shard, enough to keep the vectorized batch busy
+DEFAULT_SHARD_SIZE = 50_000
+
+
+@dataclass(frozen=True, eq=False)
+class SimulationResult:
+    """Landing counts of a simulation run."""
+    counts: np.ndarray  # Balls landed in each bin
+    lost: int  # Balls that never reached a bin
+    seed: int  # Entropy of the run's SeedSequence, passing it as seed repeats the run
+
+    @property
+    def drops(self):
+        return int(self.counts.sum()) + self.lost
+
+
+def shard_sizes(count, shard_size=DEFAULT_SHARD_SIZE):
+    """Sizes of the shards count drops are cut into."""
+    full, rest = divmod(count, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+
+def shard_seed(entropy, shard_index):
+    """Random stream of one shard of a run, the same child SeedSequence.spawn gives."""
+    return np.random.SeedSequence(entropy, spawn_key=(shard_index,))
+
+
+def _simulate_bins(pin_rows, count, seed, options):
+    return simulate_drops(pin_rows, count, seed=seed, **options)
+
+
+def _simulate_shard(pin_rows, count, seed, options):
+    bins = _simulate_bins(pin_rows, count, seed, options)
+    landed = bins[bins >= 0]
+    return np.bincount(landed, minlength=pin_rows + 1), int(bins.size - landed.size)
+
+
+def iter_shards(pin_rows, count, entropy, shard_size=DEFAULT_SHARD_SIZE, start_shard=0, executor=None,
+                prefetch=None, **options):
+    """Simulate a run shard by shard, in order.
+
+    Drops keep the place they have in the whole run, so the bins of a run
+    are the same whether it is streamed, resumed from start_shard or summed
+    by simulate_parallel with the same shard size.
+
+    Args:
+        pin_rows: Number of pin rows
+        count: Number of balls in the whole run
+        entropy: Entropy of the run's SeedSequence, see SimulationResult.seed
+        shard_size: Drops per shard
+        start_shard: First shard to simulate
+        executor: Executor to simulate shards on ahead of the consumer, None
+            to simulate each one when it is asked for
+        prefetch: Shards in flight on the executor, twice the CPU count by default
+        **options: Keyword arguments for simulate_drops
+
+    Yields:
+        Tuple of (shard index, index of its first drop, int16 array of bins)
+    """
+    num_shards = -(-count // shard_size)
+
+    def shard_args(index):
+        return pin_rows, min(shard_size, count - index * shard_size), shard_seed(entropy, index), options
+
+    if executor is None:
+        for index in range(start_shard, num_shards):
+            yield index, index * shard_size, _simulate_bins(*shard_args(index))
+        return
+
+    # A bounded window of submitted shards keeps memory flat however far the run goes
+    prefetch = prefetch or 2 * (os.cpu_count() or 1)
+    pending = deque()
+    next_index = start_shard
+    while pending or next_index < num_shards:
+        while next_index < num_shards and len(pending) < prefetch:
+            pending.append((next_index, executor.submit(_simulate_bins, *shard_args(next_index))))
+            next_index += 1
+        index, future = pending.popleft()
+        yield index, index * shard_size, future.result()
+
+
+def simulate_parallel(pin_rows, count, seed=None, workers=None, shard_size=DEFAULT_SHARD_SIZE, executor=None,
+                      width=800, pin_spacing=None, pins_start_y=50, physics=DEFAULT_PHYSICS, max_in_flight=8192,
+                      max_steps=None, substeps=1):
+    """Drop many balls on worker processes and count where they landed.
+
+    Args:
+        pin_rows: Number of pin rows
+        count: Number of balls to drop
+        seed: Integer seed of the run, None for a fresh one (see SimulationResult.seed)
+        workers: Worker processes, defaults to the number of CPUs. With 1 the
+            shards are simulated in this process.
+        shard_size: Drops per shard, changing it changes the result of a seed
+        executor: Executor to run the shards on instead of a new process pool
+        width: Board width in pixels
+        pin_spacing: Distance between pins, defaults to the game's spacing
+        pins_start_y: Y position the pin rows are measured from
+        physics: PhysicsParams to simulate with
+        max_in_flight: Number of balls stepped together in a shard
+        max_steps: 60 fps frames to simulate before giving up on a ball, see simulate_drops
+        substeps: Physics steps per 60 fps frame
+
+    Returns:
+        SimulationResult
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = shard_sizes(count, shard_size)
+    seeds = [shard_seed(seed_sequence.entropy, index) for index in range(len(sizes))]
+    options = {
+        "width": width, "pin_spacing": pin_spacing, "pins_start_y": pins_start_y, "physics": physics,
+        "max_in_flight": max_in_flight, "max_steps": max_steps, "substeps": substeps,
+    }
+    shard_args = (repeat(pin_rows), sizes, seeds, repeat(options))
+
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None and workers > 1 and len(sizes) > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(sizes)))
+
+    counts = np.zeros(pin_rows + 1, dtype=np.int64)
+    lost = 0
+    try:
+        # Integer sums, so the total does not depend on which shard finishes first
+        shards = executor.map(_simulate_shard, *shard_args) if executor else map(_simulate_shard, *shard_args)
+        for shard_counts, shard_lost in shards:
+            counts += shard_counts
+            lost += shard_lost
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return SimulationResult(counts, lost, seed_sequence.entropy)
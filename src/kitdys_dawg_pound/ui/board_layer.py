@@ -0,0 +1,108 @@
+import math
+
+import pygame
+
+from kitdys_dawg_pound.ui.board_renderer import draw_bins
+from kitdys_dawg_pound.ui.drawing import draw_text_box
+
+# Surface pixels the layer reaches past each side of the camera's view, so a
+# moving camera only rebuilds it once it has moved this far
+VIEW_MARGIN = 256
+
+# Color of the title surface's transparent pixels, not used by the title itself
+TITLE_COLORKEY = (255, 0, 255)
+
+
+class BoardLayer:
+    """Pre-rendered background for everything that only changes on edit.
+
+    ``base`` holds the background and pins. ``surface`` is ``base`` with the
+    idle bins drawn on top, and is what each frame is restored from. On a board
+    seen through a Camera the layer holds the camera's view and up to
+    VIEW_MARGIN of the board around it, and is rebuilt when the view moves out
+    of it. The title stays put over a scrolling board, so it is kept apart and
+    drawn on restore.
+    """
+
+    def __init__(self, size, bg_color=(195, 177, 225), title="Kitdy's Dawg Pound", margin=VIEW_MARGIN):
+        self.view_size = size
+        self.base = pygame.Surface(size)
+        self.surface = pygame.Surface(size)
+        self.bg_color = bg_color
+        self.title = title
+        self.margin = margin
+        self.origin = (0, 0)  # Zoomed board position of the layer's top left
+        self.zoom = 1.0
+
+        # The title box, with its rounded corners left see-through
+        title_surface = pygame.Surface(size)
+        title_surface.fill(TITLE_COLORKEY)
+        title_surface.set_colorkey(TITLE_COLORKEY)
+        self.title_rect = draw_text_box(title_surface, title, 20, 20, 24, bg_color=bg_color,
+                                        text_color=(128, 0, 128), ratio=1.0)
+        self.title_surface = title_surface.subsurface(self.title_rect).copy()
+
+    def covers(self, camera):
+        """Whether the layer holds the whole of the camera's view."""
+        if camera is None:
+            return True
+        left, top = camera.left - self.origin[0], camera.top - self.origin[1]
+        width, height = self.surface.get_size()
+        return (camera.zoom == self.zoom and 0 <= left and left + self.view_size[0] <= width
+                and 0 <= top and top + self.view_size[1] <= height)
+
+    def rebuild(self, bins, layout, ratio, camera=None):
+        """Redraw the layer for a new board, window scale or camera view."""
+        # The part of the board around the view, seen through a camera fixed on the layer
+        region = None
+        if camera is not None:
+            size = []
+            origin = []
+            for view, board, position in zip(self.view_size, camera.board_size, (camera.left, camera.top)):
+                board = math.ceil(board * camera.zoom)
+                size.append(max(view, min(view + 2 * self.margin, board)))
+                origin.append(min(max(position - self.margin, 0), max(board - size[-1], 0)))
+            if self.surface.get_size() != tuple(size):
+                self.base = pygame.Surface(size)
+                self.surface = pygame.Surface(size)
+            self.origin = tuple(origin)
+            self.zoom = camera.zoom
+            region = camera.region(*self.origin, size)
+        self.base.fill(self.bg_color)
+
+        # Pins in staggered rows, only those on the layer
+        pin_x, pin_y = layout.pin_x, layout.pin_y
+        pin_radius = layout.pin_radius
+        if region is not None:
+            on_layer = layout.pins_in(*region.visible_rect(margin=pin_radius))
+            pin_x, pin_y = region.to_view(pin_x[on_layer], pin_y[on_layer])
+            pin_radius *= region.zoom
+        for x, y in zip(pin_x.round().astype(int).tolist(), pin_y.astype(int).tolist()):
+            pygame.draw.circle(self.base, (159, 43, 104), (x, y), pin_radius)
+
+        # Idle bins, pressed bins are drawn per frame on top
+        self.surface.blit(self.base, (0, 0))
+        draw_bins(bins, self.surface, layout, ratio, animate=False, camera=region)
+
+    def background(self, camera=None):
+        """Background and pins under the camera's view, without the bins and the title."""
+        return self.base.subsurface(self._view_rect(camera))
+
+    def restore(self, target, rects=None, camera=None):
+        """Copy the camera's view of the layer onto target, either fully or only inside rects."""
+        view = self.surface.subsurface(self._view_rect(camera))
+        if rects is None:
+            target.blit(view, (0, 0))
+            target.blit(self.title_surface, self.title_rect)
+            return
+
+        for rect in rects:
+            target.blit(view, rect, rect)
+            title_part = rect.clip(self.title_rect)
+            if title_part:
+                target.blit(self.title_surface, title_part, title_part.move(-self.title_rect.x, -self.title_rect.y))
+
+    def _view_rect(self, camera):
+        if camera is None:
+            return pygame.Rect((0, 0), self.view_size)
+        return pygame.Rect((camera.left - self.origin[0], camera.top - self.origin[1]), self.view_size)
@@ -0,0 +1,208 @@
+"""
+Pygame drawing for the board models.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pygame
+
+from kitdys_dawg_pound.ui.drawing import draw_rounded_rect
+from kitdys_dawg_pound.ui.fonts import get_font, measure_text, render_text, wrap_text
+
+BIN_FONT = "Gill Sans"
+BALL_COLOR = (112, 41, 99)
+
+
+def draw_ball(screen, ball, alpha=1.0):
+    """Draw a Ball between its last two physics states.
+
+    Args:
+        screen: Surface to draw on
+        ball: Ball to draw
+        alpha: Interpolation factor from SimulationClock.alpha
+
+    Returns:
+        Rect covered by the ball, or None if it has landed
+    """
+    if not ball.active:
+        return None
+    x = ball.prev_x + (ball.x - ball.prev_x) * alpha
+    y = ball.prev_y + (ball.y - ball.prev_y) * alpha
+    return pygame.draw.circle(screen, ball.color, (int(x), int(y)), ball.radius)
+
+
+def draw_ball_pool(screen, pool, alpha=1.0, camera=None):
+    """Draw the live balls of a BallPool between their last two physics states.
+
+    Args:
+        camera: Camera the board is seen through, balls out of its view are skipped
+
+    Returns:
+        List of rects covered by the drawn balls
+    """
+    x, y = pool.positions(alpha)
+    radius = pool.engine.layout.ball_radius
+
+    if camera is not None:
+        x, y = camera.to_view(x, y)
+        radius *= camera.zoom
+        width, height = screen.get_size()
+        on_view = (x > -radius) & (x < width + radius) & (y > -radius) & (y < height + radius)
+        x, y = x[on_view], y[on_view]
+
+    return [
+        pygame.draw.circle(screen, BALL_COLOR, (ball_x, ball_y), radius)
+        for ball_x, ball_y in zip(x.astype(int).tolist(), y.astype(int).tolist())
+    ]
+
+
+def draw_bins(bins, screen, layout, ratio, animate=True, only_hit=False, background=None, camera=None):
+    """Draw all bins on the screen.
+
+    Args:
+        bins: PlinkoBins with the labels and hits to draw
+        layout: BoardLayout giving the bin positions
+        ratio: Window scale factor, used for text size and press depth
+        animate: Draw bins hit since the last draw in their pressed state
+        only_hit: Skip bins that were not hit
+        background: Surface copied under a pressed bin before drawing it
+        camera: Camera the board is seen through, bins out of its view are skipped
+
+    Returns:
+        List of rects covered by the drawn bins
+    """
+    if only_hit and not bins.hit.any():
+        return []
+
+    atlas = get_bin_atlas(tuple(bins.bin_texts), layout, ratio, camera.zoom if camera else 1.0)
+    hit = bins.hit[:layout.num_bins] if animate else np.zeros(layout.num_bins, dtype=bool)
+    indices = np.flatnonzero(hit) if only_hit else range(layout.num_bins)
+    view_rect = screen.get_rect()
+
+    dirty_rects = []
+    for bin_index in indices:
+        pressed = bool(hit[bin_index])
+        bin_rect = atlas.rects[bin_index]
+        if camera is not None:
+            bin_rect = bin_rect.move(-camera.left, -camera.top)
+            if not bin_rect.colliderect(view_rect):
+                continue
+        if pressed and background is not None:
+            screen.blit(background, bin_rect, bin_rect)
+        screen.blit(atlas.surface, bin_rect, atlas.cells[pressed][bin_index])
+        dirty_rects.append(bin_rect)
+
+    # Pressed bins are drawn once, then go back to idle
+    if animate:
+        bins.hit[:] = False
+    return dirty_rects
+
+
+class BinAtlas:
+    """Every bin of a board pre-rendered idle and pressed, with its label.
+
+    ``surface`` holds one cell per bin and state: idle bins in the top row and
+    pressed bins below them. A cell covers the bin's whole screen rect and is
+    transparent around the bin, so drawing a bin is a single blit. Bins are
+    drawn zoom times their board size, at their place on a camera at the origin.
+    """
+
+    def __init__(self, bin_texts, layout, ratio, zoom=1.0):
+        scale = ratio * zoom
+        bin_width = layout.pin_spacing * 0.8 * zoom
+        click_offset = 4 * scale
+        corner_radius = int(4 * scale) + (scale > 1)
+        num_bins = layout.num_bins
+        bin_lefts = [bin_x * zoom - bin_width // 2 for bin_x in layout.bin_centers.tolist()]
+
+        # Screen rects, from the same float positions the bins always had
+        self.rects = [
+            pygame.Rect(bin_left, layout.bin_top * zoom, bin_width + 1, bin_width + click_offset + 1)
+            for bin_left in bin_lefts
+        ]
+        cell_width = max(rect.width for rect in self.rects)
+        cell_height = self.rects[0].height
+        self.surface = pygame.Surface((cell_width * num_bins, cell_height * 2), pygame.SRCALPHA)
+        self.cells = [
+            [pygame.Rect(i * cell_width, row * cell_height, rect.width, rect.height) for i, rect in enumerate(self.rects)]
+            for row in range(2)
+        ]
+
+        font_size = _bin_font_size(bin_texts, bin_width, ratio)
+        for bin_index in range(num_bins):
+            text = bin_texts[bin_index]
+            for pressed, cells in enumerate(self.cells):
+                cell = cells[bin_index]
+                self.surface.set_clip(cell)
+                # Draw at the bin's fractional offset within its rect, as on screen
+                x = cell.x + bin_lefts[bin_index] % 1
+                _draw_single_bin(
+                    self.surface, text, x, cell.y, bin_width, font_size, click_offset, corner_radius, pressed
+                )
+        self.surface.set_clip(None)
+
+
+@lru_cache(maxsize=8)
+def get_bin_atlas(bin_texts, layout, ratio, zoom=1.0):
+    """BinAtlas for a tuple of labels on a layout, built once per board, window scale and camera zoom."""
+    return BinAtlas(bin_texts, layout, ratio, zoom)
+
+
+def _bin_font_size(bin_texts, bin_width, ratio):
+    """Largest label font size, from 10 to 36, that fits the widest label in a bin."""
+    max_text_width = 0
+    for text in bin_texts:
+        text_width = measure_text(BIN_FONT, 36, text)[0]
+        max_text_width = max(max_text_width, text_width)
+
+    # Calculate scaling factor based on actual text width
+    scaling_factor = bin_width / (max_text_width + 10)  # Add padding
+    font_size = int(36 * scaling_factor * ratio)
+    return max(10, min(36, font_size))
+
+
+def _draw_single_bin(surface, text, base_x, base_y, bin_width, font_size, click_offset, corner_radius, pressed):
+    bin_height = bin_width  # Square bin
+
+    # Set orange color for bins
+    bin_color = (128, 0, 128)  # Orange
+    shadow_color = (116, 1, 113)  # Darker orange for shadow
+
+    if pressed:
+        light_rect = pygame.Rect(base_x, base_y + click_offset, bin_width, bin_height)
+        # Draw orange rectangle
+        draw_rounded_rect(surface, light_rect, bin_color, corner_radius)
+        text_y = base_y + click_offset
+    else:
+        dark_rect = pygame.Rect(base_x, base_y + click_offset, bin_width, bin_height)
+        light_rect = pygame.Rect(base_x, base_y, bin_width, bin_height)
+
+        # Draw shadow and orange rectangle
+        draw_rounded_rect(surface, dark_rect, shadow_color, corner_radius)
+        draw_rounded_rect(surface, light_rect, bin_color, corner_radius)
+        text_y = base_y
+
+    # Wrap and draw black text
+    _draw_wrapped_text(
+        surface, font_size, text,
+        (195, 177, 225),  # Black text
+        base_x, text_y, bin_width, bin_height
+    )
+
+
+def _draw_wrapped_text(screen, font_size, text, color, x, y, width, height):
+    """Draw text wrapped within the given rectangle."""
+    # 5px padding on each side
+    lines = wrap_text(BIN_FONT, font_size, text, width - 10)
+
+    # Render text lines
+    line_height = get_font(BIN_FONT, font_size).get_linesize()
+    total_height = line_height * len(lines)
+    start_y = y + (height - total_height) // 2
+
+    for i, line in enumerate(lines):
+        text_surface = render_text(BIN_FONT, font_size, line, color)
+        text_rect = text_surface.get_rect(
+            center=(x + width // 2, start_y + i * line_height + line_height // 2)
+        )
+        screen.blit(text_surface, text_rect)
@@ -0,0 +1,125 @@
+"""
+Camera over boards bigger than the game surface.
+"""
+import numpy as np
+
+# Board pixels per surface pixel the camera can zoom out to, 1.0 is unscaled
+ZOOM_LEVELS = (0.25, 0.5, 0.75, 1.0)
+
+
+class Camera:
+    """Part of the board shown on the game surface.
+
+    A board point (x, y) is drawn at (x * zoom - left, y * zoom - top), with
+    ``left`` and ``top`` whole surface pixels so nothing shimmers while the
+    camera moves. A board that fits the surface keeps the camera at the
+    origin and unscaled, so it is drawn exactly as without one.
+    """
+
+    def __init__(self, view_size, ease=0.2, lead=0.4):
+        """Create a camera.
+
+        Args:
+            view_size: Size of the surface the board is drawn on
+            ease: Share of the distance to its target the camera covers per 60 fps frame
+            lead: Height of a followed ball on the view, as a share from the top
+        """
+        self.view_width, self.view_height = view_size
+        self.ease = ease
+        self.lead = lead
+        self.board_size = view_size
+        self.zoom = 1.0
+        self.left = self.top = 0
+        self.following = True
+        self._target = (0, 0)
+
+    def set_board(self, board_size):
+        """Show a new board from its top center, unscaled."""
+        self.board_size = board_size
+        self.zoom = 1.0
+        self.following = True
+        self.left = self.top = 0
+        self.left, self.top = self._target = self._clamp((board_size[0] - self.view_width) / 2, 0)
+
+    @property
+    def scrollable(self):
+        """Whether the board is bigger than the view."""
+        return self.board_size[0] > self.view_width or self.board_size[1] > self.view_height
+
+    @property
+    def moving(self):
+        """Whether the camera is still on its way to its target."""
+        return (self.left, self.top) != self._target
+
+    @property
+    def view_key(self):
+        """Changes whenever what the camera shows changes."""
+        return self.left, self.top, self.zoom
+
+    def region(self, left, top, size):
+        """Camera fixed on size surface pixels from (left, top), at this camera's zoom."""
+        region = Camera(size, self.ease, self.lead)
+        region.board_size = self.board_size
+        region.zoom = self.zoom
+        region.left, region.top = region._target = left, top
+        region.following = False
+        return region
+
+    def visible_rect(self, margin=0):
+        """Part of the board on view as (left, top, right, bottom) in board pixels."""
+        return (
+            (self.left - margin) / self.zoom, (self.top - margin) / self.zoom,
+            (self.left + self.view_width + margin) / self.zoom, (self.top + self.view_height + margin) / self.zoom,
+        )
+
+    def to_view(self, x, y):
+        """Surface position of board position(s)."""
+        return np.multiply(x, self.zoom) - self.left, np.multiply(y, self.zoom) - self.top
+
+    def scroll(self, dx, dy):
+        """Move the view by surface pixels and stop following balls."""
+        self.following = False
+        self.left, self.top = self._target = self._clamp(self.left + dx, self.top + dy)
+
+    def zoom_by(self, steps):
+        """Zoom in (positive) or out by steps of ZOOM_LEVELS, keeping the view's center in place."""
+        if not self.scrollable:
+            return
+        level = ZOOM_LEVELS.index(self.zoom) + steps
+        zoom = ZOOM_LEVELS[min(max(level, 0), len(ZOOM_LEVELS) - 1)]
+        center_x = (self.left + self.view_width / 2) / self.zoom
+        center_y = (self.top + self.view_height / 2) / self.zoom
+        self.zoom = zoom
+        self.left, self.top = self._target = self._clamp(
+            center_x * zoom - self.view_width / 2, center_y * zoom - self.view_height / 2
+        )
+
+    def follow(self, x, y):
+        """Aim the view at a ball at board position (x, y), unless the player scrolled away."""
+        if self.following and self.scrollable:
+            self._target = self._clamp(x * self.zoom - self.view_width / 2, y * self.zoom - self.view_height * self.lead)
+
+    def update(self, frame_ms):
+        """Ease toward the target over frame_ms of real time.
+
+        Returns:
+            True if the view moved
+        """
+        if not self.moving:
+            return False
+        share = 1 - (1 - self.ease) ** (frame_ms * 60 / 1000)
+        target_left, target_top = self._target
+        left = round(self.left + (target_left - self.left) * share)
+        top = round(self.top + (target_top - self.top) * share)
+        # Rounding can stall the last pixels of the way, so step over them
+        if left == self.left:
+            left += (target_left > left) - (target_left < left)
+        if top == self.top:
+            top += (target_top > top) - (target_top < top)
+        self.left, self.top = left, top
+        return True
+
+    def _clamp(self, left, top):
+        max_left = max(0, self.board_size[0] * self.zoom - self.view_width)
+        max_top = max(0, self.board_size[1] * self.zoom - self.view_height)
+        return round(min(max(left, 0), max_left)), round(min(max(top, 0), max_top))
@@ -0,0 +1,143 @@
+import math
+
+import pygame
+
+# Scaling filters, "fast" is nearest neighbour and "quality" is bilinear
+SCALE_FILTERS = {
+    "fast": pygame.transform.scale,
+    "quality": pygame.transform.smoothscale,
+}
+
+
+class Viewport:
+    """Letterboxed mapping of the base-resolution game surface onto the window.
+
+    The scaled target surface is allocated once per window size, so presenting
+    a frame never allocates. Only changed rects are scaled when they are known.
+    """
+
+    def __init__(self, base_size, scale_filter="quality", bg_color=(195, 177, 225)):
+        self.base_width, self.base_height = base_size
+        self.bg_color = bg_color
+        self.set_filter(scale_filter)
+        self.screen_size = None
+        self.scale_factor = 1.0
+        self.offset = (0, 0)
+        self.game_rect = pygame.Rect(0, 0, self.base_width, self.base_height)
+        self.target = None
+
+    def set_filter(self, scale_filter):
+        """Select the "fast" or "quality" scaling filter."""
+        self.scale_filter = scale_filter
+        self._scale = SCALE_FILTERS[scale_filter]
+
+    def resize(self, screen_size, surface):
+        """Recompute the letterbox and reallocate the scaled target.
+
+        Args:
+            screen_size: New window size
+            surface: Game surface, the target is created in its pixel format
+        """
+        screen_width, screen_height = screen_size
+        self.screen_size = screen_size
+        self.scale_factor = min(screen_width / self.base_width, screen_height / self.base_height)
+
+        # Calculate positioning offsets (for letterboxing)
+        scaled_width = int(self.base_width * self.scale_factor)
+        scaled_height = int(self.base_height * self.scale_factor)
+        self.offset = ((screen_width - scaled_width) // 2, (screen_height - scaled_height) // 2)
+        self.game_rect = pygame.Rect(self.offset, (scaled_width, scaled_height))
+        self.target = pygame.Surface((scaled_width, scaled_height), 0, surface)
+
+    def to_game(self, screen_pos):
+        """Convert a window position to game coordinates.
+
+        Returns:
+            (x, y) in game coordinates, or None outside the game area
+        """
+        if not (self.game_rect.left <= screen_pos[0] <= self.game_rect.right and
+                self.game_rect.top <= screen_pos[1] <= self.game_rect.bottom):
+            return None
+
+        game_x = (screen_pos[0] - self.game_rect.left) / self.scale_factor
+        game_y = (screen_pos[1] - self.game_rect.top) / self.scale_factor
+        return int(game_x), int(game_y)
+
+    def present(self, screen, surface, dirty_rects=None):
+        """Scale the game surface onto the window and push it to the display.
+
+        Args:
+            screen: Display surface
+            surface: Game surface at base resolution
+            dirty_rects: Game surface rects that changed, or None for a full refresh
+        """
+        self.flip(self.compose(screen, surface, dirty_rects))
+
+    def compose(self, screen, surface, dirty_rects=None):
+        """Scale the game surface onto the window without updating the display.
+
+        Args:
+            screen: Display surface
+            surface: Game surface at base resolution
+            dirty_rects: Game surface rects that changed, or None for a full refresh
+
+        Returns:
+            Window rects to pass to flip, or None when the whole window changed
+        """
+        if screen.get_size() != self.screen_size:
+            self.resize(screen.get_size(), surface)
+            dirty_rects = None
+
+        surface_rect = surface.get_rect()
+
+        # Many small updates cost more than one full one past a certain area
+        if dirty_rects is not None:
+            dirty_rects = [rect.inflate(4, 4).clip(surface_rect) for rect in dirty_rects]
+            dirty_rects = [rect for rect in dirty_rects if rect.width and rect.height]
+            if sum(rect.width * rect.height for rect in dirty_rects) > surface_rect.width * surface_rect.height // 2:
+                dirty_rects = None
+
+        unscaled = self.scale_factor == 1
+
+        if dirty_rects is None:
+            screen.fill(self.bg_color)
+            if unscaled:
+                screen.blit(surface, self.offset)
+            else:
+                self._scale(surface, self.target.get_size(), self.target)
+                screen.blit(self.target, self.offset)
+            return None
+
+        offset_x, offset_y = self.offset
+        target_rect = self.target.get_rect()
+        screen_rects = []
+        for rect in dirty_rects:
+            if unscaled:
+                screen_rect = rect.move(offset_x, offset_y)
+                screen.blit(surface, screen_rect, rect)
+                screen_rects.append(screen_rect)
+                continue
+
+            # Map the rect to whole target pixels covering it
+            left = int(rect.left * self.scale_factor)
+            top = int(rect.top * self.scale_factor)
+            right = math.ceil(rect.right * self.scale_factor)
+            bottom = math.ceil(rect.bottom * self.scale_factor)
+            scaled_rect = pygame.Rect(left, top, right - left, bottom - top).clip(target_rect)
+            if not scaled_rect.width or not scaled_rect.height:
+                continue
+
+            self._scale(surface.subsurface(rect), scaled_rect.size, self.target.subsurface(scaled_rect))
+            screen_rect = scaled_rect.move(offset_x, offset_y)
+            screen.blit(self.target, screen_rect, scaled_rect)
+            screen_rects.append(screen_rect)
+
+        return screen_rects
+
+    @staticmethod
+    def flip(screen_rects=None):
+        """Push composed window rects to the display, or all of it for None."""
+        if screen_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(screen_rects)
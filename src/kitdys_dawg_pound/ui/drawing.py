@@ -1,5 +1,7 @@
 import pygame
 
+from kitdys_dawg_pound.ui.fonts import render_text
+
 
 def draw_rounded_rect(surface, rect, color, corner_radius, corners=[True, True, True, True]):
     """Draw a rectangle with selectable rounded or square corners on the given surface."""
@@ -43,8 +45,7 @@ def draw_rounded_rect(surface, rect, color, corner_radius, corners=[True, True,
 def draw_text_box(surface, text, x, y, font_size, padding=10, bg_color=(50, 50, 50), text_color=(255, 255, 255), ratio=1.0):
     """Draw a text box with background on the given surface."""
     corner_radius = int(4 * ratio) + (ratio > 1)
-    font = pygame.font.SysFont("Gill Sans", font_size)
-    text_surf = font.render(text, True, text_color)
+    text_surf = render_text("Gill Sans", font_size, text, tuple(text_color))
     # Create box slightly larger than text
     box_width = text_surf.get_width() + padding * 2
     box_height = text_surf.get_height() + padding * 2
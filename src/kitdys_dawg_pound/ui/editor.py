@@ -1,6 +1,13 @@
-import pygame
+from kitdys_dawg_pound.ui.input import WidgetDispatcher
+from kitdys_dawg_pound.ui.ui_controls import Button, Label, Panel, TextBox
 
-from kitdys_dawg_pound.ui.ui_controls import Button, TextBox
+# Pin rows a board can have, boards too big for the window are seen through a Camera
+MIN_ROWS = 2
+MAX_ROWS = 200
+
+# Y of the first bin label text box and the distance between text boxes
+BIN_LABELS_Y = 80
+BIN_LABEL_STEP = 50
 
 
 class PlinkoEditor:
@@ -10,37 +17,110 @@ class PlinkoEditor:
         self.edit_mode = False
 
         # Create UI elements
-        self.row_label = pygame.font.SysFont("Arial", 24).render("Number of Rows:", True, (255, 255, 255))
+        self.row_label = Label(20, 30, 150, 30, "Number of Rows:")
         self.row_textbox = TextBox(180, 20, 60, 40, "8")
+        self.bin_title = Label(20, 50, 150, 30, "Bin Labels:")
 
         # Create buttons
         self.edit_button = Button(width - 120, 20, 100, 40, "Edit")
         self.play_button = Button(width - 230, 20, 100, 40, "Play")
         self.apply_button = Button(width - 120, height - 60, 100, 40, "Apply")
 
-        # Bin label textboxes (created dynamically)
+        # Bin label textboxes and their odds (created dynamically), paged as
+        # big boards have far more bins than fit above the Apply button
         self.bin_textboxes = []
+        self.odds_labels = []
+        self.bins_per_page = max(1, (self.apply_button.rect.top - BIN_LABELS_Y) // BIN_LABEL_STEP)
+        self.page = 0
+        self.prev_button = Button(width - 340, height - 60, 100, 40, "Prev")
+        self.next_button = Button(width - 230, height - 60, 100, 40, "Next")
+        self.page_label = Label(20, height - 60, 200, 40, font_size=20, align="midleft")
+
+        # Edit mode overlay, kept on a cached surface between edits
+        self.overlay = Panel(0, 0, width, height, (40, 40, 40))
+
+        # Hit-tested input for the widgets currently on screen
+        self.input = WidgetDispatcher()
+
+        # Landing chance of each bin, shown next to its label when known
+        self.bin_odds = None
         self.update_bin_textboxes(self.get_row_value())
 
     def create_bin_textboxes(self, bin_texts):
         self.bin_textboxes = []
-        y_pos = 80
+        self.odds_labels = []
         for i, text in enumerate(bin_texts):
-            textbox = TextBox(20, y_pos + i * 50, 150, 40, text)
+            # Every page starts again at the top
+            textbox = TextBox(20, BIN_LABELS_Y + i % self.bins_per_page * BIN_LABEL_STEP, 150, 40, text)
             self.bin_textboxes.append(textbox)
+            self.odds_labels.append(Label(textbox.rect.right + 10, textbox.rect.y, 80, 40, font_size=20, align="midleft"))
+
+        self._update_odds_labels()
+        self.show_page(self.page)
+
+    @property
+    def page_count(self):
+        return -(-len(self.bin_textboxes) // self.bins_per_page)
+
+    def show_page(self, page):
+        """Show the bin labels of a page, clamped to the pages there are."""
+        self.page = max(0, min(page, self.page_count - 1))
+        shown = self._page_slice()
+        children = [
+            self.row_label, self.row_textbox, self.bin_title,
+            *self.bin_textboxes[shown], *self.odds_labels[shown], self.apply_button,
+        ]
+        if self.page_count > 1:
+            last = min(shown.stop, len(self.bin_textboxes))
+            self.page_label.text = f"Bins {shown.start + 1}-{last} of {len(self.bin_textboxes)}"
+            children += [self.prev_button, self.next_button, self.page_label]
+        self.overlay.set_children(children)
+        self._update_widgets()
+
+    def _page_slice(self):
+        first = self.page * self.bins_per_page
+        return slice(first, first + self.bins_per_page)
+
+    def _update_widgets(self):
+        """Point the input dispatcher at the widgets of the current mode."""
+        widgets = [self.edit_button, self.play_button]
+        if self.edit_mode:
+            widgets += [self.row_textbox, *self.bin_textboxes[self._page_slice()], self.apply_button]
+            if self.page_count > 1:
+                widgets += [self.prev_button, self.next_button]
+        self.input.set_widgets(widgets)
+
+    def handle_input(self, frame_input):
+        """Apply a frame of input to the editor.
 
-    def handle_events(self, events):
+        Args:
+            frame_input: FrameInput from poll_input
+
+        Returns:
+            Dict of flags for the game loop
+        """
         result = {"mode_changed": False, "rows_changed": False, "labels_changed": False, "drop_ball": False}
 
-        for event in events:
+        if frame_input.moved:
+            self.input.update_pointer(frame_input.pointer)
+
+        # The mouse wheel turns the pages of bin labels, up for the previous page
+        if self.edit_mode and frame_input.scroll[1]:
+            self.show_page(self.page - (1 if frame_input.scroll[1] > 0 else -1))
+
+        for event in frame_input.events:
+            widget = self.input.dispatch(event)
+            if widget is None:
+                continue
+
             # Handle mode buttons
-            if self.edit_button.handle_event(event) and not self.edit_mode:
+            if widget is self.edit_button and not self.edit_mode:
                 self.edit_mode = True
                 result["mode_changed"] = True
 
             # If in edit mode, clicking play exits edit mode
             # If already in play mode, clicking play drops a ball
-            if self.play_button.handle_event(event):
+            elif widget is self.play_button:
                 if self.edit_mode:
                     self.edit_mode = False
                     result["mode_changed"] = True
@@ -48,8 +128,13 @@ class PlinkoEditor:
                     # Signal to drop a ball when in play mode
                     result["drop_ball"] = True
 
+            elif widget is self.prev_button:
+                self.show_page(self.page - 1)
+            elif widget is self.next_button:
+                self.show_page(self.page + 1)
+
             # In edit mode, handle apply button
-            if self.edit_mode and self.apply_button.handle_event(event):
+            elif widget is self.apply_button:
                 # Validate and apply changes
                 try:
                     # Check if row value changed
@@ -63,44 +148,68 @@ class PlinkoEditor:
                 except ValueError:
                     pass
 
-                # Get bin labels
-                bin_labels = self.get_bin_labels()
                 result["labels_changed"] = True
                 self.edit_mode = False
 
-            # In edit mode, handle other controls
-            if self.edit_mode:
-                self.row_textbox.handle_event(event)
-                for textbox in self.bin_textboxes:
-                    textbox.handle_event(event)
+            if result["mode_changed"] or result["labels_changed"]:
+                self._update_widgets()
 
         return result
 
-    def draw(self, screen):
-        # Always draw mode buttons
-        self.edit_button.draw(screen)
-        self.play_button.draw(screen)
+    def draw(self, screen, damaged=None):
+        """Repaint the widgets that changed or were drawn over.
 
-        if self.edit_mode:
-            # Draw editor UI
-            pygame.draw.rect(screen, (40, 40, 40, 200), (0, 0, self.width, self.height))
+        Widgets stay on screen between frames, so a frame without input draws
+        nothing. In edit mode the overlay covers the whole screen and is
+        copied from its cached surface.
 
-            # Draw row controls
-            screen.blit(self.row_label, (20, 30))
-            self.row_textbox.draw(screen)
+        Args:
+            screen: Surface the editor was drawn on last frame
+            damaged: Rects overwritten since the last draw, or None when the
+                whole screen was
 
-            # Draw bin label section
-            bin_title = pygame.font.SysFont("Arial", 24).render("Bin Labels:", True, (255, 255, 255))
-            screen.blit(bin_title, (20, 80 - 30))
+        Returns:
+            List of rects that were drawn over
+        """
+        if self.edit_mode:
+            changed = self.overlay.update()
+            if damaged is None:
+                self.overlay.blit(screen)
+                return [self.overlay.rect.copy()]
 
-            for textbox in self.bin_textboxes:
-                textbox.draw(screen)
+            self.overlay.blit(screen, changed + damaged)
+            return changed
 
-            self.apply_button.draw(screen)
+        # Always draw mode buttons
+        dirty_rects = []
+        for button in (self.edit_button, self.play_button):
+            if damaged is None or button.rect.collidelist(damaged) != -1:
+                button.dirty = True
+            if button.dirty:
+                dirty_rects.append(button.draw(screen))
+        return dirty_rects
+
+    def set_bin_odds(self, probabilities):
+        """Set the landing chance of each bin, or None while it is unknown."""
+        bin_odds = None if probabilities is None else list(probabilities)
+        if bin_odds != self.bin_odds:
+            self.bin_odds = bin_odds
+            self._update_odds_labels()
+
+    def _update_odds_labels(self):
+        # Odds belong to the board being played, so skip them while the
+        # labels are being edited for a different number of bins
+        if self.bin_odds is None or len(self.bin_odds) != len(self.odds_labels):
+            for label in self.odds_labels:
+                label.text = ""
+            return
+
+        for label, probability in zip(self.odds_labels, self.bin_odds):
+            label.text = f"{probability:.1%}"
 
     def get_row_value(self):
         try:
-            return max(2, min(15, int(self.row_textbox.text)))
+            return max(MIN_ROWS, min(MAX_ROWS, int(self.row_textbox.text)))
         except ValueError:
             return 8
 
@@ -0,0 +1,59 @@
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=None)
+def get_font(font_name, font_size, bold=False):
+    """Get the shared font object for a name and size, loading it once."""
+    return pygame.font.SysFont(font_name, font_size, bold)
+
+
+@lru_cache(maxsize=1024)
+def measure_text(font_name, font_size, text, bold=False):
+    """Width and height of text rendered in the given font."""
+    return get_font(font_name, font_size, bold).size(text)
+
+
+@lru_cache(maxsize=512)
+def render_text(font_name, font_size, text, color, bold=False):
+    """Render antialiased text, reusing the surface for repeated calls.
+
+    The returned surface is shared between callers and must not be drawn on.
+    """
+    return get_font(font_name, font_size, bold).render(text, True, color)
+
+
+@lru_cache(maxsize=512)
+def wrap_text(font_name, font_size, text, width, bold=False):
+    """Split text into lines that fit within width pixels.
+
+    Returns:
+        Tuple of line strings
+    """
+    lines = []
+    current_line = []
+
+    for word in text.split(' '):
+        test_line = ' '.join(current_line + [word])
+        test_width = measure_text(font_name, font_size, test_line, bold)[0]
+
+        if test_width <= width:
+            current_line.append(word)
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                lines.append(word)
+
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    return tuple(lines)
+
+
+def clear_font_cache():
+    """Drop every cached font and surface, needed after pygame.quit()."""
+    for cached in (get_font, measure_text, render_text, wrap_text):
+        cached.cache_clear()
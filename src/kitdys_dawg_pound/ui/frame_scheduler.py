@@ -0,0 +1,95 @@
+"""
+Adaptive frame pacing for the game loop.
+
+The game tells the scheduler each frame how fast it needs to run: ``ACTIVE``
+while anything on screen moves, ``THROTTLED`` while it waits on background
+work, ``ASLEEP`` when only input can change what is shown. Outside of
+``ACTIVE`` the loop blocks on the event queue, so input still wakes it at
+once and an idle window costs next to no CPU.
+"""
+import asyncio
+import time
+
+import pygame
+
+ACTIVE = "active"  # Full frame rate
+THROTTLED = "throttled"  # A few frames a second, or sooner on input
+ASLEEP = "asleep"  # Until the next input, with a rare wake-up as a safety net
+
+MODES = (ACTIVE, THROTTLED, ASLEEP)
+
+
+class FrameScheduler:
+    def __init__(self, fps=60, throttled_fps=10, max_sleep_ms=1000):
+        """Create a frame scheduler.
+
+        Args:
+            fps: Frame rate while the game is active
+            throttled_fps: Frame rate while waiting on background work
+            max_sleep_ms: Longest wait for input while asleep
+        """
+        self.fps = fps
+        self.frame_ms = 1000 / fps
+        self.throttled_ms = 1000 / throttled_fps
+        self.max_sleep_ms = max_sleep_ms
+
+        self.mode_ms = dict.fromkeys(MODES, 0.0)
+        self.mode_frames = dict.fromkeys(MODES, 0)
+
+        self._clock = pygame.time.Clock()
+        self._frame_start = time.perf_counter()
+
+    def wait(self, mode):
+        """Block until the next frame is due in mode.
+
+        Returns:
+            Real time since the previous frame started in ms, capped at one
+            active frame after a throttled or sleeping frame since nothing
+            moved while the loop waited
+        """
+        if mode == ACTIVE:
+            return self._account(mode, self._clock.tick(self.fps))
+
+        event = pygame.event.wait(int(self._timeout_ms(mode)))
+        if event.type != pygame.NOEVENT:
+            # Put the wake-up event back in front of anything queued behind it
+            queued = pygame.event.get()
+            pygame.event.post(event)
+            for queued_event in queued:
+                pygame.event.post(queued_event)
+        return self._account(mode, self._clock.tick())
+
+    async def wait_async(self, mode):
+        """wait for loops run on asyncio, which must not block on the event queue.
+
+        Outside of ``ACTIVE`` the queue is checked once per active frame
+        interval, so input is picked up as fast as at full rate.
+        """
+        deadline = self._frame_start + (self.frame_ms if mode == ACTIVE else self._timeout_ms(mode)) / 1000
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or (mode != ACTIVE and pygame.event.peek()):
+                break
+            await asyncio.sleep(remaining if mode == ACTIVE else min(remaining, self.frame_ms / 1000))
+        return self._account(mode, self._clock.tick())
+
+    def summary(self):
+        """Wall time, frames and share of the total spent in each mode."""
+        total_ms = sum(self.mode_ms.values())
+        return {
+            mode: {
+                "seconds": self.mode_ms[mode] / 1000,
+                "frames": self.mode_frames[mode],
+                "share": self.mode_ms[mode] / total_ms if total_ms else 0.0,
+            }
+            for mode in MODES
+        }
+
+    def _timeout_ms(self, mode):
+        return self.throttled_ms if mode == THROTTLED else self.max_sleep_ms
+
+    def _account(self, mode, elapsed_ms):
+        self._frame_start = time.perf_counter()
+        self.mode_ms[mode] += elapsed_ms
+        self.mode_frames[mode] += 1
+        return elapsed_ms if mode == ACTIVE else min(elapsed_ms, self.frame_ms)
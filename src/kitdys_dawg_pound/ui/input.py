@@ -0,0 +1,169 @@
+"""
+Per-frame input: one pass over the event queue and hit-tested widget dispatch.
+"""
+from dataclasses import dataclass, field
+
+import pygame
+
+# Event types the game reacts to, SDL drops every other type before it is queued.
+# VIDEORESIZE and VIDEOEXPOSE are made from the window resize and expose events,
+# so those have to stay allowed too.
+ALLOWED_EVENTS = (
+    pygame.QUIT,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWRESIZED,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+)
+
+# Mouse button the widgets and the board react to
+LEFT_BUTTON = 1
+
+
+def allow_events(event_types=ALLOWED_EVENTS):
+    """Block every event type except event_types."""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(event_types))
+
+
+@dataclass
+class FrameInput:
+    """Input gathered over one frame, with pointer motion coalesced."""
+    quit: bool = False
+    resize: tuple = None  # Window size after the last resize of the frame
+    exposed: bool = False  # Whether the window has to be drawn again, e.g. after being uncovered
+    moved: bool = False  # Whether the pointer moved this frame
+    pointer: tuple = None  # Last pointer position in game coordinates, None outside the game area
+    scroll: tuple = (0, 0)  # Mouse wheel movement summed over the frame, x and y
+    events: list = field(default_factory=list)  # Clicks in game coordinates and key presses, in order
+
+
+def poll_input(viewport):
+    """Drain the event queue into a FrameInput.
+
+    Motion events only update the pointer position and wheel events add up,
+    so a fast mouse costs the same as a still one. Only left clicks are kept:
+    clicks outside the game area are dropped and clicks inside are converted
+    with the viewport as it was when the frame started.
+    """
+    frame_input = FrameInput()
+
+    for event in pygame.event.get():
+        if event.type == pygame.MOUSEMOTION:
+            frame_input.moved = True
+            frame_input.pointer = viewport.to_game(event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == LEFT_BUTTON:
+            # Other buttons are dropped, SDL also reports wheel steps as buttons 4 and 5
+            game_pos = viewport.to_game(event.pos)
+            if game_pos is not None:
+                frame_input.events.append(pygame.event.Event(event.type, pos=game_pos, button=event.button))
+        elif event.type == pygame.KEYDOWN:
+            frame_input.events.append(event)
+        elif event.type == pygame.MOUSEWHEEL:
+            frame_input.scroll = (frame_input.scroll[0] + event.x, frame_input.scroll[1] + event.y)
+        elif event.type == pygame.VIDEORESIZE:
+            frame_input.resize = (event.w, event.h)
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            frame_input.exposed = True
+        elif event.type == pygame.QUIT:
+            frame_input.quit = True
+
+    return frame_input
+
+
+class WidgetIndex:
+    """Grid of buckets holding the widgets that overlap each cell.
+
+    Widgets later in the list are drawn on top, so they win where widgets
+    overlap.
+    """
+
+    def __init__(self, widgets, cell_size=100):
+        self.cell_size = cell_size
+        self._buckets = {}
+
+        for widget in widgets:
+            rect = widget.rect
+            for cell_y in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                for cell_x in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+                    self._buckets.setdefault((cell_x, cell_y), []).append(widget)
+
+    def at(self, pos):
+        """Topmost widget containing pos, or None."""
+        for widget in reversed(self._buckets.get((pos[0] // self.cell_size, pos[1] // self.cell_size), ())):
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+
+class WidgetDispatcher:
+    """Routes input to widgets.
+
+    Clicks go to the widget under the pointer, which also takes the keyboard
+    focus if it accepts it. Key presses go to the focused widget only.
+    """
+
+    def __init__(self, widgets=()):
+        self.focus = None
+        self.hover = None
+        self.pointer = None
+        self.set_widgets(widgets)
+
+    def set_widgets(self, widgets):
+        """Replace the widgets that receive input, keeping the focus if it is still among them."""
+        self.index = WidgetIndex(widgets)
+        if self.focus is not None and self.focus not in widgets:
+            self._set_focus(None)
+        self.update_pointer(self.pointer)
+
+    def update_pointer(self, pos):
+        """Move the hover highlight to the widget under pos."""
+        self.pointer = pos
+        self._set_hover(self.index.at(pos) if pos is not None else None)
+
+    def dispatch(self, event):
+        """Deliver event to the widget it is meant for.
+
+        Returns:
+            The widget if it handled the event as an action (a button press or
+            a submitted text box), otherwise None
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            target = self.index.at(event.pos)
+            self._set_focus(target if target is not None and target.focusable else None)
+        elif event.type == pygame.KEYDOWN:
+            target = self.focus
+        else:
+            return None
+
+        if target is None:
+            return None
+
+        handled = target.handle_event(event)
+
+        # Submitting a text box gives up the focus
+        if self.focus is not None and not self.focus.active:
+            self.focus = None
+        return target if handled else None
+
+    def _set_focus(self, widget):
+        if self.focus is widget:
+            return
+        if self.focus is not None:
+            self.focus.active = False
+        self.focus = widget
+        if widget is not None:
+            widget.active = True
+
+    def _set_hover(self, widget):
+        if self.hover is widget:
+            return
+        if self.hover is not None:
+            self.hover.hovered = False
+        self.hover = widget
+        if widget is not None:
+            widget.hovered = True
@@ -13,6 +13,10 @@ class Popup:
         self.min_height = 80
         self.padding = 20
 
+        # Composed popup surface, rebuilt only when the message or font changes
+        self._surface = None
+        self._surface_key = None
+
     def show(self, message, color=None):
         self.active = True
         self.message = message
@@ -30,15 +34,19 @@ class Popup:
         return False
 
     def draw(self, screen, font):
+        """Draw the popup if it is showing.
+
+        Returns:
+            Rect covered by the popup, or None when hidden
+        """
         if not self.active:
-            return
+            return None
 
-        # First measure the text to determine popup size
-        text_width, text_height = font.size(self.message)
+        if self._surface_key != (self.message, font):
+            self._surface = self._render(font)
+            self._surface_key = (self.message, font)
 
-        # Calculate popup dimensions based on text
-        popup_width = max(self.min_width, text_width + self.padding * 2)
-        popup_height = max(self.min_height, text_height + self.padding * 2)
+        popup_width, popup_height = self._surface.get_size()
 
         # Center the popup
         width, height = screen.get_size()
@@ -48,6 +56,19 @@ class Popup:
         # Store the popup rectangle for click detection
         self.rect = pygame.Rect(x, y, popup_width, popup_height)
 
+        # Draw to screen
+        screen.blit(self._surface, (x, y))
+        return self.rect
+
+    def _render(self, font):
+        """Render the popup box and message onto a new surface."""
+        # First measure the text to determine popup size
+        text_width, text_height = font.size(self.message)
+
+        # Calculate popup dimensions based on text
+        popup_width = max(self.min_width, text_width + self.padding * 2)
+        popup_height = max(self.min_height, text_height + self.padding * 2)
+
         # Draw rounded rectangle with green background
         s = pygame.Surface((popup_width, popup_height), pygame.SRCALPHA)
         draw_rounded_rect(s, pygame.Rect(0, 0, popup_width, popup_height),
@@ -57,6 +78,4 @@ class Popup:
         text = font.render(self.message, True, (195, 177, 225))  # Black text
         text_rect = text.get_rect(center=(popup_width//2, popup_height//2))
         s.blit(text, text_rect)
-
-        # Draw to screen
-        screen.blit(s, (x, y))
\ No newline at end of file
+        return s
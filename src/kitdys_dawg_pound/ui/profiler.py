@@ -0,0 +1,181 @@
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+from kitdys_dawg_pound.ui.fonts import get_font
+
+# Stages of one game loop iteration, in the order they run
+STAGES = ("events", "physics", "draw", "scale", "flip", "idle")
+
+
+class FrameProfiler:
+    """Per-stage frame timings kept in a fixed-size ring buffer.
+
+    The loop calls ``mark`` at the end of each stage and ``end_frame`` after the
+    last one. Every call returns immediately while the profiler is disabled,
+    so it can stay in place in production builds.
+    """
+
+    def __init__(self, capacity=600, enabled=False):
+        self.capacity = capacity
+        self.enabled = False
+        self.frame_count = 0
+
+        self._stage_index = {stage: i for i, stage in enumerate(STAGES)}
+        self._buffer = np.zeros((capacity, len(STAGES)))
+        self._row = np.zeros(len(STAGES))
+        self._last = 0.0
+
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        """Start recording, timing from now."""
+        self.enabled = True
+        self._row[:] = 0
+        self._last = time.perf_counter()
+
+    def disable(self):
+        self.enabled = False
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def clear(self):
+        """Drop all recorded frames."""
+        self.frame_count = 0
+        self._buffer[:] = 0
+
+    def mark(self, stage):
+        """Attribute the time since the previous mark to stage."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._row[self._stage_index[stage]] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        """Store the stage timings of the frame that just finished."""
+        if not self.enabled:
+            return
+        self._buffer[self.frame_count % self.capacity] = self._row
+        self._row[:] = 0
+        self.frame_count += 1
+
+    def frames(self):
+        """Recorded stage timings in ms, one row per frame, oldest first."""
+        if self.frame_count <= self.capacity:
+            return self._buffer[:self.frame_count].copy()
+        start = self.frame_count % self.capacity
+        return np.concatenate((self._buffer[start:], self._buffer[:start]))
+
+    def summary(self):
+        """FPS, frame time percentiles and mean time per stage over the buffer.
+
+        Returns:
+            Dict of statistics, empty when no frame was recorded
+        """
+        frames = self.frames()
+        if not len(frames):
+            return {}
+
+        totals = frames.sum(axis=1)
+        mean_total = totals.mean()
+        return {
+            "frames": len(frames),
+            "fps": 1000 / mean_total if mean_total > 0 else 0.0,
+            "p50_ms": float(np.percentile(totals, 50)),
+            "p99_ms": float(np.percentile(totals, 99)),
+            "stages_ms": dict(zip(STAGES, frames.mean(axis=0).tolist())),
+        }
+
+    def export_csv(self, path):
+        frames = self.frames()
+        first = self.frame_count - len(frames)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *STAGES, "total"])
+            for i, row in enumerate(frames.tolist()):
+                writer.writerow([first + i, *(f"{ms:.3f}" for ms in row), f"{sum(row):.3f}"])
+
+    def export_json(self, path, pacing=None):
+        """Write the summary and frames as JSON, with a FrameScheduler summary if pacing is given."""
+        export = {
+            "stages": list(STAGES),
+            "summary": self.summary(),
+            "frames": self.frames().round(3).tolist(),
+        }
+        if pacing is not None:
+            export["pacing"] = pacing
+        with open(path, "w") as f:
+            json.dump(export, f, indent=2)
+
+    def export(self, directory=".", pacing=None):
+        """Write CSV and JSON exports named after the current time.
+
+        Returns:
+            Paths of the written files
+        """
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        paths = (f"{directory}/frame-profile-{stamp}.csv", f"{directory}/frame-profile-{stamp}.json")
+        self.export_csv(paths[0])
+        self.export_json(paths[1], pacing)
+        return paths
+
+
+class ProfilerOverlay:
+    """On-screen readout of a FrameProfiler summary, and of the time per FrameScheduler mode."""
+
+    def __init__(self, profiler, font_size=16, refresh_frames=15, scheduler=None):
+        self.profiler = profiler
+        self.scheduler = scheduler
+        self.refresh_frames = refresh_frames
+        self.font = get_font("Courier New", font_size)
+        self._surface = None
+        self._rendered_at = None
+
+    def draw(self, screen, pos=(10, 60)):
+        """Draw the overlay while the profiler is recording.
+
+        The text is refreshed every few frames so it stays readable.
+
+        Returns:
+            Rect covered by the overlay, or None when the profiler is disabled
+        """
+        if not self.profiler.enabled:
+            return None
+
+        frame_count = self.profiler.frame_count
+        if self._surface is None or frame_count - self._rendered_at >= self.refresh_frames:
+            self._surface = self._render(self.profiler.summary())
+            self._rendered_at = frame_count
+
+        return screen.blit(self._surface, pos)
+
+    def _render(self, summary):
+        if summary:
+            lines = [
+                f"{summary['fps']:5.1f} fps",
+                f"p50 {summary['p50_ms']:6.2f} ms",
+                f"p99 {summary['p99_ms']:6.2f} ms",
+                *(f"{stage:<8}{ms:6.2f} ms" for stage, ms in summary["stages_ms"].items()),
+            ]
+        else:
+            lines = ["profiling..."]
+        if self.scheduler is not None:
+            lines += [f"{mode:<10}{mode_time['share']:6.1%}" for mode, mode_time in self.scheduler.summary().items()]
+
+        line_height = self.font.get_linesize()
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 16
+        surface = pygame.Surface((width, line_height * len(lines) + 12))
+        surface.fill((40, 40, 40))
+        for i, text in enumerate(rendered):
+            surface.blit(text, (8, 6 + i * line_height))
+        return surface
@@ -1,4 +1,4 @@
-import pygame
+from kitdys_dawg_pound.ui.fonts import render_text
 
 
 def create_bin_texts(bin_texts, text_color, font_size, font_name="Gill Sans", bold=True):
@@ -15,10 +15,9 @@ def create_bin_texts(bin_texts, text_color, font_size, font_name="Gill Sans", bo
         List of rendered text surfaces
     """
     bin_text_surfaces = []
-    font = pygame.font.SysFont(font_name, font_size, bold)
 
     for text in bin_texts:
-        rendered_text = font.render(text, True, text_color)
+        rendered_text = render_text(font_name, font_size, text, tuple(text_color), bold)
         bin_text_surfaces.append(rendered_text)
 
     return bin_text_surfaces
@@ -1,17 +1,114 @@
+from abc import ABC, abstractmethod
+
 import pygame
 
+from kitdys_dawg_pound.ui.fonts import get_font, render_text
 
-class TextBox:
-    def __init__(self, x, y, width, height, text='', active_color=(0, 200, 255),
-                 inactive_color=(100, 100, 100), text_color=(255, 255, 255), font_size=24):
+
+class Widget(ABC):
+    """Node of the retained widget tree.
+
+    A widget keeps what it drew on the surface until its state changes. State
+    setters mark it dirty, and its owner only repaints dirty widgets.
+    Subclasses implement ``paint``.
+    """
+
+    # Takes the keyboard focus when clicked
+    focusable = False
+
+    def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
+        self.dirty = True
+        self._hovered = False
+        self._active = False
+
+    @property
+    def hovered(self):
+        return self._hovered
+
+    @hovered.setter
+    def hovered(self, hovered):
+        if hovered != self._hovered:
+            self._hovered = hovered
+            self.dirty = True
+
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, active):
+        if active != self._active:
+            self._active = active
+            self.dirty = True
+
+    def handle_event(self, event):
+        return False
+
+    def draw(self, screen):
+        """Paint the widget at its rect and mark it clean.
+
+        Returns:
+            The rect that was drawn over
+        """
+        self.paint(screen, self.rect)
+        self.dirty = False
+        return self.rect
+
+    @abstractmethod
+    def paint(self, surface, rect):
+        """Draw the widget onto surface at rect."""
+
+
+class Label(Widget):
+    def __init__(self, x, y, width, height, text='', text_color=(255, 255, 255), font_size=24, align="topleft"):
+        super().__init__(x, y, width, height)
+        self.text_color = text_color
+        self.font_size = font_size
+        self.align = align  # Rect attribute the text is anchored to
+        self._text = None
         self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text != self._text:
+            self._text = text
+            self.rendered_text = render_text("Arial", self.font_size, text, self.text_color)
+            self.dirty = True
+
+    def paint(self, surface, rect):
+        anchor = {self.align: getattr(rect, self.align)}
+        surface.blit(self.rendered_text, self.rendered_text.get_rect(**anchor))
+
+
+class TextBox(Widget):
+    focusable = True
+
+    def __init__(self, x, y, width, height, text='', active_color=(0, 200, 255),
+                 inactive_color=(100, 100, 100), text_color=(255, 255, 255), font_size=24):
+        super().__init__(x, y, width, height)
         self.active_color = active_color
         self.inactive_color = inactive_color
         self.text_color = text_color
-        self.font = pygame.font.SysFont("Arial", font_size)
-        self.active = False
-        self.rendered_text = self.font.render(self.text, True, self.text_color)
+        self.font_size = font_size
+        self.font = get_font("Arial", font_size)
+        self._text = None
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text != self._text:
+            self._text = text
+            self.rendered_text = render_text("Arial", self.font_size, text, self.text_color)
+            self.dirty = True
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -25,27 +122,26 @@ class TextBox:
                 self.text = self.text[:-1]
             else:
                 self.text += event.unicode
-
-            self.rendered_text = self.font.render(self.text, True, self.text_color)
         return False
 
-    def draw(self, screen):
+    def paint(self, surface, rect):
         color = self.active_color if self.active else self.inactive_color
-        pygame.draw.rect(screen, color, self.rect, 2)
+        pygame.draw.rect(surface, color, rect, 2)
 
-        text_rect = self.rendered_text.get_rect(center=self.rect.center)
-        screen.blit(self.rendered_text, text_rect)
+        text_rect = self.rendered_text.get_rect(center=rect.center)
+        surface.blit(self.rendered_text, text_rect)
 
-class Button:
+
+class Button(Widget):
     def __init__(self, x, y, width, height, text, color=(100, 100, 200),
                  hover_color=(150, 150, 255), text_color=(255, 255, 255), font_size=24):
-        self.rect = pygame.Rect(x, y, width, height)
+        super().__init__(x, y, width, height)
         self.text = text
         self.color = color
         self.hover_color = hover_color
         self.text_color = text_color
-        self.font = pygame.font.SysFont("Arial", font_size)
-        self.rendered_text = self.font.render(self.text, True, self.text_color)
+        self.font = get_font("Arial", font_size)
+        self.rendered_text = render_text("Arial", font_size, self.text, self.text_color)
 
     def check_hover(self, pos):
         return self.rect.collidepoint(pos)
@@ -56,9 +152,69 @@ class Button:
                 return True
         return False
 
-    def draw(self, screen):
-        color = self.hover_color if self.check_hover(pygame.mouse.get_pos()) else self.color
-        pygame.draw.rect(screen, color, self.rect)
+    def paint(self, surface, rect):
+        # Hover is set by the WidgetDispatcher from the pointer position
+        color = self.hover_color if self.hovered else self.color
+        pygame.draw.rect(surface, color, rect)
+
+        text_rect = self.rendered_text.get_rect(center=rect.center)
+        surface.blit(self.rendered_text, text_rect)
+
+
+class Panel(Widget):
+    """Widget that keeps its children painted on a cached surface.
+
+    Children are positioned in screen coordinates and must lie inside the
+    panel. ``update`` repaints only the children marked dirty, and ``blit``
+    copies the cached surface to the screen, so an unchanged panel costs
+    nothing to keep on screen.
+    """
+
+    def __init__(self, x, y, width, height, bg_color, children=()):
+        super().__init__(x, y, width, height)
+        self.bg_color = bg_color
+        self.children = list(children)
+        self.surface = pygame.Surface(self.rect.size)
+
+    def set_children(self, children):
+        self.children = list(children)
+        self.dirty = True
+
+    def update(self):
+        """Repaint what changed onto the cached surface.
+
+        Returns:
+            Screen rects that changed
+        """
+        if self.dirty:
+            self.surface.fill(self.bg_color)
+            for child in self.children:
+                self._paint_child(child)
+            self.dirty = False
+            return [self.rect.copy()]
+
+        changed = []
+        for child in self.children:
+            if child.dirty:
+                self.surface.fill(self.bg_color, child.rect.move(-self.rect.x, -self.rect.y))
+                self._paint_child(child)
+                changed.append(child.rect.copy())
+        return changed
+
+    def blit(self, screen, rects=None):
+        """Copy the cached surface onto screen, either fully or only inside rects."""
+        if rects is None:
+            screen.blit(self.surface, self.rect)
+            return
+
+        for rect in rects:
+            clipped = rect.clip(self.rect)
+            screen.blit(self.surface, clipped, clipped.move(-self.rect.x, -self.rect.y))
+
+    def paint(self, surface, rect):
+        self.update()
+        surface.blit(self.surface, rect)
 
-        text_rect = self.rendered_text.get_rect(center=self.rect.center)
-        screen.blit(self.rendered_text, text_rect)
+    def _paint_child(self, child):
+        child.paint(self.surface, child.rect.move(-self.rect.x, -self.rect.y))
+        child.dirty = False
@@ -0,0 +1,8 @@
+"""
+Entry point of the web build, packaged with ``pygbag src``.
+"""
+import asyncio
+
+from kitdys_dawg_pound.main import run_game_async
+
+asyncio.run(run_game_async())
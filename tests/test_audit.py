@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from kitdys_dawg_pound.services.audit import (
+    _chi2_sf, _kolmogorov_sf, audit_board, binomial_probabilities, chi_square_fit, chi_square_homogeneity, ks_fit,
+    ks_two_sample,
+)
+
+# Reference values from scipy.stats.chi2.sf and scipy.special.kolmogorov
+CHI2_SF = [
+    (1.0, 1, 0.3173105078629141),
+    (2.0, 2, 0.36787944117144233),
+    (3.841458820694124, 1, 0.05),
+    (18.307038053275146, 10, 0.05),
+    (20.0, 3, 0.00016974243555282632),
+    (100.0, 50, 3.4549313829848617e-05),
+    (0.5, 30, 1.0),
+]
+KOLMOGOROV_SF = [
+    (0.5, 0.9639452436648751),
+    (1.0, 0.26999967167735456),
+    (1.3580986393225505, 0.05),
+    (1.6276236115189478, 0.01),
+    (3.0, 3.045996e-08),
+]
+
+
+@pytest.mark.parametrize("statistic, dof, expected", CHI2_SF)
+def test_chi2_sf(statistic, dof, expected):
+    assert _chi2_sf(statistic, dof) == pytest.approx(expected, rel=1e-6, abs=1e-15)
+
+
+@pytest.mark.parametrize("x, expected", KOLMOGOROV_SF)
+def test_kolmogorov_sf(x, expected):
+    assert _kolmogorov_sf(x) == pytest.approx(expected, rel=1e-6)
+
+
+def test_chi_square_fit():
+    result = chi_square_fit([10, 20, 30, 40], [0.25] * 4)
+    assert (result.statistic, result.dof) == (20.0, 3)
+    assert result.p_value == pytest.approx(0.00016974243555282632, rel=1e-9)
+
+
+def test_chi_square_fit_pools_rare_bins():
+    # Expected 1, 4, 15, 60, 20 balls, the first two are pooled into one group expecting 5
+    result = chi_square_fit([2, 3, 15, 60, 20], [0.01, 0.04, 0.15, 0.6, 0.2])
+    assert (result.statistic, result.dof) == (0.0, 3)
+    assert result.p_value == 1.0
+
+
+def test_chi_square_homogeneity():
+    result = chi_square_homogeneity([10, 20], [20, 10])
+    assert result.statistic == pytest.approx(20 / 3)
+    assert result.p_value == pytest.approx(0.009823274507519247, rel=1e-9)
+
+
+def test_ks_fit():
+    result = ks_fit([30, 20, 25, 25], [0.25] * 4)
+    assert result.statistic == pytest.approx(0.05)
+    assert result.p_value == pytest.approx(0.9639452436648751, rel=1e-9)
+
+
+def test_ks_two_sample():
+    # D = 0.1 with an effective sample size of 100 * 100 / 200
+    result = ks_two_sample([30, 20, 50], [20, 30, 50])
+    assert result.statistic == pytest.approx(0.1)
+    assert result.p_value == pytest.approx(_kolmogorov_sf(0.1 * np.sqrt(50)))
+
+
+def test_audit_board_flags_lost_balls():
+    counts = np.round(binomial_probabilities(4) * 16_000).astype(int)
+    audit = audit_board(4, counts, lost=400, baseline=(counts, 0))
+    assert audit.binomial_chi2.statistic == 0
+    assert audit.lost_share == pytest.approx(400 / 16_400)
+    assert audit.losing()
+    assert audit.shifted()
+    assert not audit_board(4, counts, lost=0, baseline=(counts, 0)).shifted()
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from kitdys_dawg_pound.models.ball_batch import BallBatch
+from kitdys_dawg_pound.models.board_layout import board_width, default_max_frames, get_board_layout
+from kitdys_dawg_pound.models.plinko_ball import Ball
+
+# Seeded drops compared on each board
+SEEDS = 200
+
+
+def drop_ball(layout, seed, max_steps):
+    """Bin of a seeded drop simulated with Ball, -1 if it expired."""
+    ball = Ball(layout.width // 2, 20, seed=seed)
+    while ball.steps < max_steps:
+        bin_index = ball.update(layout)
+        if bin_index is not None:
+            return bin_index
+    return -1
+
+
+@pytest.mark.parametrize("pin_rows", [2, 8, 15, 30])
+def test_seeded_drops_agree_with_ball(pin_rows):
+    layout = get_board_layout(pin_rows, width=board_width(pin_rows))
+    max_steps = default_max_frames(pin_rows)
+    seeds = np.random.default_rng(pin_rows).integers(0, 2 ** 63, SEEDS, dtype=np.uint64)
+    batch_bins = BallBatch(SEEDS, layout, seeds=seeds, max_steps=max_steps).run()
+
+    # Chaotic bounces turn any difference in the arithmetic into a different bin
+    ball_bins = [drop_ball(layout, seed, max_steps) for seed in seeds.tolist()]
+    assert ball_bins == batch_bins.tolist()
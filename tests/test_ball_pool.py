@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from kitdys_dawg_pound.models.ball_pool import BallPool
+from kitdys_dawg_pound.models.board_layout import board_width, default_max_frames, get_board_layout
+
+# Balls dropped on each board, all in flight together like a burst of clicks
+DROPS = 200
+
+# Share of them the game may give up on before they reach a bin, besides the
+# ones that came to rest on a pin and would never get there
+MAX_LATE_SHARE = 0.01
+
+
+def drop_all(pin_rows, drops=DROPS, seed=0, max_frames=None):
+    """Drop balls on the game's board for pin_rows and return the bin of each drop, -1 if it expired."""
+    layout = get_board_layout(pin_rows, width=board_width(pin_rows))
+    if max_frames is None:
+        max_frames = default_max_frames(pin_rows)
+    pool = BallPool(drops, layout, rng=np.random.default_rng(seed), max_frames=max_frames)
+    slots = [pool.spawn(layout.width // 2, 20) for _ in range(drops)]
+
+    bins = np.empty(drops, dtype=np.int16)
+    while len(pool):
+        pool.update()
+        bins[pool.finished_slots] = pool.finished_bins
+    return bins[slots]
+
+
+@pytest.mark.parametrize("pin_rows", [*range(2, 21), 30, 50, 100, 200])
+def test_balls_land_within_frame_budget(pin_rows):
+    bins = drop_all(pin_rows, seed=pin_rows)
+    resting = drop_all(pin_rows, seed=pin_rows, max_frames=4 * default_max_frames(pin_rows)) < 0
+    assert bins.size == DROPS
+    assert ((bins < 0) & ~resting).mean() <= MAX_LATE_SHARE
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from kitdys_dawg_pound.models.ball_batch import simulate_drops
+from kitdys_dawg_pound.models.board_layout import get_board_layout
+
+
+def staggered_pins(pin_rows, pin_spacing, pins_start_y, width):
+    """The pin pattern the physics has always used, row by row from the top."""
+    pins = []
+    for row in range(1, pin_rows + 1):
+        row_offset = pin_spacing // 2 if row % 2 == 0 else 0
+        for col in range(-(row // 2) - 1, (row - 1) // 2 + 2):
+            pins.append((width // 2 + col * pin_spacing + row_offset, pins_start_y + row * pin_spacing))
+    return pins
+
+
+@pytest.mark.parametrize("pin_rows", [2, 3, 8, 15])
+@pytest.mark.parametrize("width", [800, 801])
+def test_pins_follow_the_staggered_pattern(pin_rows, width):
+    layout = get_board_layout(pin_rows, width=width)
+    assert layout.pins() == staggered_pins(pin_rows, layout.pin_spacing, layout.pins_start_y, width)
+    assert layout.row_pins.sum() == layout.pin_x.size
+
+
+@pytest.mark.parametrize("pin_rows", [2, 3, 8, 15])
+def test_bins_sit_between_the_bottom_row_pins(pin_rows):
+    layout = get_board_layout(pin_rows)
+    bottom = layout.pin_y == layout.pin_y.max()
+    assert np.array_equal(layout.pin_x[bottom], layout.bin_edges)
+
+
+@pytest.mark.parametrize("pin_rows", range(2, 6))
+def test_every_bin_reachable_on_small_boards(pin_rows):
+    bins = simulate_drops(pin_rows, 2000, seed=pin_rows)
+    assert (bins < 0).mean() <= 0.01
+    assert (np.bincount(bins[bins >= 0], minlength=pin_rows + 1) > 0).all()
@@ -0,0 +1,25 @@
+import pytest
+
+from kitdys_dawg_pound.app import create_app
+from kitdys_dawg_pound.routes.boards import MAX_ROWS, MIN_ROWS
+from kitdys_dawg_pound.services.drops import DropService
+
+
+@pytest.fixture
+def client():
+    return create_app(DropService(refill_size=200)).test_client()
+
+
+@pytest.mark.parametrize("pin_rows, status", [(MIN_ROWS - 1, 400), (MIN_ROWS, 200), (MAX_ROWS, 200), (MAX_ROWS + 1, 400)])
+def test_board_rows_bounds(client, pin_rows, status):
+    assert client.get(f"/boards/{pin_rows}").status_code == status
+
+
+@pytest.mark.parametrize("pin_rows, status", [(MIN_ROWS - 1, 400), (MIN_ROWS, 201), (MAX_ROWS, 201), (MAX_ROWS + 1, 400)])
+def test_drop_rows_bounds(client, pin_rows, status):
+    response = client.post(f"/boards/{pin_rows}/drops", json={"count": 3})
+    assert response.status_code == status
+    if status == 201:
+        body = response.get_json()
+        assert len(body["bins"]) == 3
+        assert sum(body["histogram"]) + body["lost"] == 3
@@ -0,0 +1,50 @@
+import pytest
+
+from kitdys_dawg_pound import __main__ as cli
+
+
+def simulate(*args):
+    return cli.main(["simulate", "--rows", "6", "--drops", "1000", "--shard-size", "100", "--seed", "7", *args])
+
+
+@pytest.mark.parametrize("records, fmt", [("drops", "csv"), ("drops", "jsonl"), ("histogram", "jsonl")])
+def test_resume_gives_identical_output(tmp_path, monkeypatch, records, fmt):
+    options = ["--records", records, "--format", fmt, "--snapshot-every", "200"]
+    expected = tmp_path / "expected.out"
+    assert simulate(*options, "--output", str(expected)) == 0
+
+    # Crash after the fourth shard was written but before its checkpoint was saved
+    output = tmp_path / "run.out"
+    checkpoint = str(tmp_path / "run.ckpt")
+    save_checkpoint = cli._save_checkpoint
+    saved = []
+
+    def crash(path, run, state):
+        if len(saved) == 3:
+            raise KeyboardInterrupt
+        saved.append(state)
+        save_checkpoint(path, run, state)
+
+    monkeypatch.setattr(cli, "_save_checkpoint", crash)
+    with pytest.raises(KeyboardInterrupt):
+        simulate(*options, "--output", str(output), "--checkpoint", checkpoint)
+    monkeypatch.setattr(cli, "_save_checkpoint", save_checkpoint)
+    assert output.stat().st_size > saved[-1]["output_bytes"]
+
+    assert simulate(*options, "--output", str(output), "--checkpoint", checkpoint, "--resume") == 0
+    assert output.read_bytes() == expected.read_bytes()
+
+
+def test_resume_refuses_another_run(tmp_path):
+    output = str(tmp_path / "run.out")
+    checkpoint = str(tmp_path / "run.ckpt")
+    assert simulate("--output", output, "--checkpoint", checkpoint) == 0
+    with pytest.raises(SystemExit):
+        simulate("--output", output, "--checkpoint", checkpoint, "--resume", "--substeps", "2")
+
+
+@pytest.mark.parametrize("option", ["--drops", "--shard-size", "--snapshot-every"])
+@pytest.mark.parametrize("value", ["0", "-1", "ten"])
+def test_counts_must_be_positive(tmp_path, option, value):
+    with pytest.raises(SystemExit):
+        simulate("--output", str(tmp_path / "run.out"), option, value)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from kitdys_dawg_pound.services.hit_stats import HitCounters
+
+# Noon UTC on two days in a row
+DAY = 20_000 * 86400 + 43200
+NEXT_DAY = DAY + 86400
+
+
+def test_create_and_reopen(tmp_path):
+    path = str(tmp_path / "stats" / "board.hits")
+    counters = HitCounters(path, num_bins=5)
+    counters.record(2, now=DAY)
+    counters.record_many(np.array([0, 2, 4]), now=NEXT_DAY)
+    counters.close()
+
+    counters = HitCounters(path)
+    assert counters.num_bins == 5
+    assert counters.totals.tolist() == [1, 0, 2, 0, 1]
+    assert counters.first_hit[2] == DAY
+    assert counters.last_hit[2] == NEXT_DAY
+    assert [(day.toordinal(), daily.tolist()) for day, daily in counters.daily_totals()] == [
+        (719163 + 20_000, [0, 0, 1, 0, 0]),
+        (719163 + 20_001, [1, 0, 1, 0, 1]),
+    ]
+
+    # Reopened counters carry on from the saved ones
+    counters.record(1, now=NEXT_DAY)
+    counters.close()
+    assert HitCounters(path).totals.tolist() == [1, 1, 2, 0, 1]
+
+
+def test_readonly_sees_the_writer(tmp_path):
+    path = str(tmp_path / "board.hits")
+    writer = HitCounters(path, num_bins=3)
+    reader = HitCounters(path, readonly=True)
+    writer.record(1, now=DAY)
+    writer.flush()
+
+    assert reader.totals.tolist() == [0, 1, 0]
+    with pytest.raises(ValueError):
+        reader.record(0, now=DAY)
+    reader.close()
+    writer.close()
+
+
+def test_readonly_does_not_create(tmp_path):
+    path = tmp_path / "board.hits"
+    with pytest.raises(FileNotFoundError):
+        HitCounters(str(path), num_bins=3, readonly=True)
+    assert not path.exists()
+
+
+def test_rejects_other_files(tmp_path):
+    path = str(tmp_path / "board.hits")
+    HitCounters(path, num_bins=3).close()
+    with pytest.raises(ValueError):
+        HitCounters(path, num_bins=4)
+
+    other = tmp_path / "other.hits"
+    other.write_bytes(b"not a counters file")
+    with pytest.raises(ValueError):
+        HitCounters(str(other))
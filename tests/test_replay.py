@@ -0,0 +1,48 @@
+import numpy as np
+
+from kitdys_dawg_pound.models.ball_pool import BallPool
+from kitdys_dawg_pound.services.replay import DropConfig, ReplayWriter, read_replay, resimulate
+
+
+def play(config, drops, seed=0):
+    """Drop balls on a BallPool like the game does and log them, returning (seed, steps, bin) of each."""
+    pool = BallPool(drops, config.layout(), config.physics, rng=np.random.default_rng(seed),
+                    dt=1 / config.substeps, max_frames=config.max_frames)
+    for _ in range(drops):
+        pool.spawn(config.drop_x, config.drop_y)
+
+    played = []
+    while len(pool):
+        pool.update()
+        slots = pool.finished_slots
+        played += zip(pool.seeds[slots].tolist(), (pool.steps - pool.launch_step[slots]).tolist(),
+                      pool.finished_bins.tolist())
+    return played
+
+
+def test_resimulate_matches_logged_drops(tmp_path):
+    path = tmp_path / "drops.replay"
+    configs = [DropConfig(8), DropConfig(12, substeps=2)]
+    played = []
+    with ReplayWriter(str(path)) as writer:
+        for config in configs:
+            writer.set_config(config)
+            for seed, steps, bin_index in play(config, 50):
+                writer.record(seed, 0.0, steps, bin_index)
+                played.append((config, seed, steps, bin_index))
+
+    records = list(read_replay(str(path)))
+    assert [(record.config, record.seed, record.steps, record.bin_index) for record in records] == played
+    for record in records:
+        assert resimulate(record) == (record.bin_index, record.steps)
+
+
+def test_read_replay_skips_a_cut_short_record(tmp_path):
+    path = tmp_path / "drops.replay"
+    with ReplayWriter(str(path)) as writer:
+        writer.set_config(DropConfig(8))
+        writer.record(1, 0.0, 100, 3)
+        writer.record(2, 0.0, 120, 4)
+    path.write_bytes(path.read_bytes()[:-5])
+
+    assert [record.seed for record in read_replay(str(path))] == [1]